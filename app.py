@@ -1,31 +1,66 @@
 # dash app
+import os
+
 import dash
 from dash import dcc
 from dash import html
-from dash.dependencies import Input, Output
+from dash.dependencies import ClientsideFunction, Input, Output
 import json  # Ajout de l'import json
+from flask import jsonify
+import plotly.io as pio
 
 import figures.figure_1 as figure_1
 import figures.figure_3 as figure_3
 import figures.figure_4 as figure_4
 import figures.figure_2 as figure_2
 
-from helper import DataLoader
-from layout import create_figure_section
-
-print('hello')
+from cache import CACHES, get_cache_stats, memoize
+from details import register_detail_routes
+from helper import DataLoader, generate_color_dict
+from layout import DEFAULT_GRANULARITY, create_figure_section
+from metrics import CallbackMetrics, RequestCounter, install_callback_metrics, install_request_counter
 
 FONT = 'Jost'
 
 hauteur_default_figure = 700
 
+# Jeu de données, résolu par rapport au dépôt pour que l'application puisse être lancée depuis n'importe où
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets',
+                         'The_Oscar_Award_Demographics_1928-2025 - The_Oscar_Award_Demographics_1928-2025_v3.csv')
+# Dossier colonnaire produit par scripts/convert_columnar.py : s'il est fourni, les données sont
+# projetées en mémoire et partagées entre les workers au lieu d'être lues depuis le CSV
+COLUMNAR_PATH = os.environ.get('OSCARS_COLUMNAR_PATH')
+# Lecture du CSV par blocs de N lignes (0 : fichier entier), pour borner la mémoire sur de gros fichiers
+CHUNK_SIZE = int(os.environ.get('OSCARS_CHUNK_SIZE', 0))
+
+# Configuration du cache des figures (taille et politique d'éviction 'lru' ou 'fifo')
+CACHE_SIZE = int(os.environ.get('OSCARS_CACHE_SIZE', 256))
+CACHE_POLICY = os.environ.get('OSCARS_CACHE_POLICY', 'lru')
+# Infobulles chargées à la demande (/api/details/*) plutôt qu'embarquées dans les figures
+LAZY_HOVER = os.environ.get('OSCARS_LAZY_HOVER', '0') == '1'
+# Rendu du stacked area chart dans le navigateur (assets/clientside.js) : le serveur n'envoie que les
+# comptes par année, une fois par onglet et filtre de gagnant
+CLIENTSIDE_AREA = os.environ.get('OSCARS_CLIENTSIDE_AREA', '0') == '1'
+# Idem pour le line chart : cumul, échelle et plage d'années calculés dans le navigateur
+CLIENTSIDE_LINE = os.environ.get('OSCARS_CLIENTSIDE_LINE', '0') == '1'
+# Surveillance du CSV (délai entre deux vérifications, en secondes ; 0 : désactivée) : les lignes
+# ajoutées ou modifiées sont prises en compte sans redémarrer l'application
+WATCH_INTERVAL = float(os.environ.get('OSCARS_WATCH_INTERVAL', 0))
+# Temps des callbacks par étape et taille des réponses, exportés sur /metrics (format Prometheus)
+METRICS = os.environ.get('OSCARS_METRICS', '0') == '1'
+# Nombre d'allers-retours serveur par callback, exposé sur /stats/requests
+REQUEST_STATS = os.environ.get('OSCARS_REQUEST_STATS', '0') == '1'
+
 app = dash.Dash(__name__, 
                 meta_tags=[
                     {"name": "viewport", "content": "width=device-width, initial-scale=1"},
                     {"name": "description", "content": "Analyse de la diversité aux Oscars"}
                 ],
                 # Ajout des balises pour configurer le favicon
-                update_title=None)
+                update_title=None,
+                # Script des infobulles chargées à la demande, servi par Flask depuis static/ (hors de
+                # assets/, que Dash inclut dans toutes les pages) et seulement si l'option est active
+                external_scripts=['/static/lazy_hover.js'] if LAZY_HOVER else [])
 
 # Modification du titre de l'onglet du navigateur
 app.title = "Oscars - Analyse de diversité"
@@ -64,322 +99,627 @@ logo_credit = html.A(
 
 intervalle_defaut = [1928, 2025]
 
-app.layout = \
-    html.Div([
-
-        html.Header(children=[
-            html.Div(children=[
-                        html.H2('Les'),
-                        html.H1('OSCARS'),
-                        html.H2('Font-ils de la discrimination?'),
-                        html.Hr(),
-                        html.P('Nous avons analysé les gagnants des dernières éditions pour le savoir'), 
-                    ],
-                    className="texte-entete"
-                    ),
-        ]),
+def serve_layout():
+    """
+    Layout de l'application. Les figures et les checklists sont initialisées avec la vue
+    par défaut pré-rendue au démarrage : un nouveau visiteur ne déclenche aucun callback.
+    """
+    # Vue et plage d'années lues une seule fois : un rafraîchissement des données peut les remplacer
+    view, year_range = DEFAULT_VIEW, intervalle_defaut
+    return \
+        html.Div([
+
+            html.Header(children=[
+                html.Div(children=[
+                            html.H2('Les'),
+                            html.H1('OSCARS'),
+                            html.H2('Font-ils de la discrimination?'),
+                            html.Hr(),
+                            html.P('Nous avons analysé les gagnants des dernières éditions pour le savoir'), 
+                        ],
+                        className="texte-entete"
+                        ),
+            ]),
         
-        html.Main(children=[
-
-            # Figure 1
-            create_figure_section(
-                figure_id=1,
-                title='Lors des 97 cérémonies des Oscars, il y a eu 416 gagnants. Voici leur distribution.',
-                graph_id='waffle-chart',
-                has_checklist=True,
-                intervalle=intervalle_defaut,
-                font=FONT
-            ),
+            html.Main(children=[
+
+                # Figure 1
+                create_figure_section(
+                    figure_id=1,
+                    title='Lors des 97 cérémonies des Oscars, il y a eu 416 gagnants. Voici leur distribution.',
+                    graph_id='waffle-chart',
+                    has_checklist=True,
+                    intervalle=year_range,
+                    font=FONT,
+                    **view[1]
+                ),
             
-            # Espace entre les figures
-            html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
+                # Espace entre les figures
+                html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
             
-            # Figure 2
-            html.Div(children=[
-                html.H3('Comparatif des profils démographiques des nominés et des gagnants', 
-                       className='figure-title'),
+                # Figure 2
+                html.Div(children=[
+                    html.H3('Comparatif des profils démographiques des nominés et des gagnants', 
+                           className='figure-title'),
 
-                html.Div([
-                    dcc.Tabs(
-                        id='tabs_fig_2',
-                        value='Race or Ethnicity',
-                        children=[
-                            dcc.Tab(label='Ethnie', value='Race or Ethnicity', className='dash-tab', selected_className='dash-tab--selected'),
-                            dcc.Tab(label='Genre', value='Gender', className='dash-tab', selected_className='dash-tab--selected'),
-                            dcc.Tab(label='Religion', value='Religion', className='dash-tab', selected_className='dash-tab--selected'),
-                            dcc.Tab(label='Âge', value='Age', className='dash-tab', selected_className='dash-tab--selected'),
-                            dcc.Tab(label='Orientation', value='Sexual orientation', className='dash-tab', selected_className='dash-tab--selected')
-                        ],
-                        className='dash-tabs'
-                    ),
-
-                    # Contrôles pour la figure 2
                     html.Div([
-                        dcc.RadioItems(
-                            id='winner-filter_fig_2',
-                            #options=[
-                           #     {'label': 'Gagnants seulement', 'value': 'winners'},
-                                #{'label': 'Gagnants et nominés', 'value': 'all'}
-                            #],
-                            value='winners',
-                            inline=True,
-                            className='radio-filter'
+                        dcc.Tabs(
+                            id='tabs_fig_2',
+                            value='Race or Ethnicity',
+                            children=[
+                                dcc.Tab(label='Ethnie', value='Race or Ethnicity', className='dash-tab', selected_className='dash-tab--selected'),
+                                dcc.Tab(label='Genre', value='Gender', className='dash-tab', selected_className='dash-tab--selected'),
+                                dcc.Tab(label='Religion', value='Religion', className='dash-tab', selected_className='dash-tab--selected'),
+                                dcc.Tab(label='Âge', value='Age', className='dash-tab', selected_className='dash-tab--selected'),
+                                dcc.Tab(label='Orientation', value='Sexual orientation', className='dash-tab', selected_className='dash-tab--selected')
+                            ],
+                            className='dash-tabs'
+                        ),
+
+                        # Contrôles pour la figure 2
+                        html.Div([
+                            dcc.RadioItems(
+                                id='winner-filter_fig_2',
+                                #options=[
+                               #     {'label': 'Gagnants seulement', 'value': 'winners'},
+                                    #{'label': 'Gagnants et nominés', 'value': 'all'}
+                                #],
+                                value='winners',
+                                inline=True,
+                                className='radio-filter'
+                            )
+                        ], style={'margin': '10px 0'}),
+
+                        # Placeholder pour la figure 2
+                        dcc.Graph(id='figure-2-graph', figure=view[2]['figure'], style={'width': '100%'}),
+
+                        # Slider pour la plage d'années
+                        dcc.RangeSlider(
+                            id='year-slider_fig_2',
+                            min=year_range[0],
+                            max=year_range[1],
+                            step=1,
+                            marks={i: '{}'.format(i) for i in range(year_range[0], year_range[1], 10)},
+                            value=year_range,
+                            allowCross=False
                         )
-                    ], style={'margin': '10px 0'}),
-
-                    # Placeholder pour la figure 2
-                    dcc.Graph(id='figure-2-graph', style={'width': '100%'}),
-
-                    # Slider pour la plage d'années
-                    dcc.RangeSlider(
-                        id='year-slider_fig_2',
-                        min=1928,
-                        max=2025,
-                        step=1,
-                        marks={i: '{}'.format(i) for i in range(1928, 2025, 10)},
-                        value=intervalle_defaut,
-                        allowCross=False
-                    )
-                ], style={'width': '100%', 'margin': '0 auto'}),
-            ],
-            style={'margin': '0 auto', 'width': '100%', 'fontFamily': FONT, 'display': 'block', 'textAlign': 'center'}
-            ),
+                    ], style={'width': '100%', 'margin': '0 auto'}),
+                ],
+                style={'margin': '0 auto', 'width': '100%', 'fontFamily': FONT, 'display': 'block', 'textAlign': 'center'}
+                ),
             
-            # Espace entre les figures
-            html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
-
-            # Figure 3
-            create_figure_section(
-                figure_id=3,
-                title='Évolution de la diversité au fil des ans',
-                graph_id='line-chart',
-                has_checklist=True,
-                intervalle=intervalle_defaut,
-                font=FONT
-            ),
+                # Espace entre les figures
+                html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
+
+                # Figure 3
+                create_figure_section(
+                    figure_id=3,
+                    title='Évolution de la diversité au fil des ans',
+                    graph_id='line-chart',
+                    has_checklist=True,
+                    intervalle=year_range,
+                    font=FONT,
+                    **view[3]
+                ),
             
-            # Espace entre les figures
-            html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
+                # Espace entre les figures
+                html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
             
-            # Figure 4
-            create_figure_section(
-                figure_id=4,
-                title='L\'évolution de la diversité aux Oscars à travers les décennies.',
-                graph_id='stacked-area-chart',
-                has_checklist=True,
-                intervalle=intervalle_defaut,
-                font=FONT
-            ),
+                # Figure 4
+                create_figure_section(
+                    figure_id=4,
+                    title='L\'évolution de la diversité aux Oscars à travers les décennies.',
+                    graph_id='stacked-area-chart',
+                    has_checklist=True,
+                    intervalle=year_range,
+                    font=FONT,
+                    **view[4]
+                ),
             
-            # Espace après la dernière figure
-            html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
-        ],
-        style={'width': '90%', 'margin': '0 auto', 'fontFamily': FONT, 'display': 'flex', 'flexDirection': 'column'}
-        ),
+                # Espace après la dernière figure
+                html.Div(style={'height': '150px', 'width': '100%', 'clear': 'both'}),
+            ],
+            style={'width': '90%', 'margin': '0 auto', 'fontFamily': FONT, 'display': 'flex', 'flexDirection': 'column'}
+            ),
         
-        # Ajout d'un footer pour les crédits du logo et des créateurs
-        html.Footer([
-            html.Div([
-                # Crédit du logo
+            # Ajout d'un footer pour les crédits du logo et des créateurs
+            html.Footer([
                 html.Div([
-                    html.P("Crédit logo: ", style={'fontWeight': 'bold', 'display': 'inline'}),
-                    logo_credit
-                ], style={'marginBottom': '10px'}),
+                    # Crédit du logo
+                    html.Div([
+                        html.P("Crédit logo: ", style={'fontWeight': 'bold', 'display': 'inline'}),
+                        logo_credit
+                    ], style={'marginBottom': '10px'}),
                 
-                # Crédit des créateurs
-                html.Div([
-                    html.P("Groupe 10 : ", style={'fontWeight': 'bold', 'display': 'inline'}),
-                    html.P("Carolina Espinosa - Léo Valette - Nino Montoya - Jean Vincent - Zhu David - Nkondog Yvan Aristide", style={'display': 'inline'})
-                ])
-            ], style={'textAlign': 'center', 'padding': '20px', 'borderTop': '1px solid #ccc', 'marginTop': '30px'})
-        ])
+                    # Crédit des créateurs
+                    html.Div([
+                        html.P("Groupe 10 : ", style={'fontWeight': 'bold', 'display': 'inline'}),
+                        html.P("Carolina Espinosa - Léo Valette - Nino Montoya - Jean Vincent - Zhu David - Nkondog Yvan Aristide", style={'display': 'inline'})
+                    ])
+                ], style={'textAlign': 'center', 'padding': '20px', 'borderTop': '1px solid #ccc', 'marginTop': '30px'})
+            ])
     
-    ],
-    style={'width': '80%', 'margin': 'auto', 'fontFamily': FONT})
+        ],
+        style={'width': '80%', 'margin': 'auto', 'fontFamily': FONT})
 
 dataloader = DataLoader()
-dataloader.load_data('assets/The_Oscar_Award_Demographics_1928-2025 - The_Oscar_Award_Demographics_1928-2025_v3.csv')
+if COLUMNAR_PATH:
+    dataloader.load_columnar(COLUMNAR_PATH)
+else:
+    dataloader.load_data(DATA_PATH, chunksize=CHUNK_SIZE or None)
 dataloader.preprocess_data()
 df = dataloader.filter_data(1928, 2025)
 distribution_dict, total = dataloader.get_unique_distribution(df)
 
+# Compteurs des caches, consultables par un opérateur
+@app.server.route('/stats/cache')
+def cache_stats():
+    return jsonify(get_cache_stats())
+
+
+# Nombre d'allers-retours serveur par callback
+request_counter = install_request_counter(app.server, RequestCounter(enabled=REQUEST_STATS), app.callback_map)
+
+# Temps de chaque callback par étape (filtrage, agrégation, figure, sérialisation) et taille des réponses
+callback_metrics = install_callback_metrics(app.server, CallbackMetrics(enabled=METRICS))
+stage = callback_metrics.stage
+
+# Détails des infobulles chargées à la demande
+register_detail_routes(app.server, dataloader)
+
 # Figure 1
 
 # Figure 1
 
 # Fonctions utilitaires pour les callbacks
+def normalize_year_range(year_range):
+    return tuple(int(year) for year in year_range)
+
+
+def normalize_categories(selected_categories, keep_order=True):
+    """
+    Normalise la liste cochée pour la clé de cache. L'ordre est conservé pour les figures
+    dont les couleurs dépendent de l'ordre des catégories.
+    """
+    categories = tuple(selected_categories or ())
+    return categories if keep_order else tuple(sorted(categories, key=str))
+
+
 def get_filtered_distribution(year_range, category, winner_filter, include_other=False):
-    """Fonction utilitaire pour obtenir la distribution filtrée des données"""
+    """Fonction utilitaire pour obtenir la distribution filtrée des données (colonne `category` uniquement)"""
     is_winner = None if winner_filter == 'all' else True
-    df = dataloader.filter_data(year_range[0], year_range[1], is_winner=is_winner)
-    distribution_dict, _ = dataloader.get_unique_distribution(df)
+    with stage('filter'):
+        df = dataloader.filter_data(year_range[0], year_range[1], is_winner=is_winner)
+    # Seule la colonne affichée est calculée
+    with stage('aggregate'):
+        distribution = dataloader.get_column_distribution(df, category)
     
     # Préparation des options pour la checklist
-    options = [{'label': key, 'value': key} for key in distribution_dict[category].keys()]
+    options = [{'label': key, 'value': key} for key in distribution.keys()]
     if include_other:
         options.append({'label': 'Other', 'value': 'Other'})
     
     # Sélection des 5 premières catégories par défaut
-    selected_categories = list(distribution_dict[category].keys())[:5]
-    if include_other and len(distribution_dict[category]) > 5:
+    selected_categories = list(distribution.keys())[:5]
+    if include_other and len(distribution) > 5:
         selected_categories.append('Other')
     
-    return df, distribution_dict, options, selected_categories
+    return df, distribution, options, selected_categories
 
 
-# Callback pour figure 1
-@app.callback(
-    Output('category-checklist_fig_1', 'options'),
-    Output('category-checklist_fig_1', 'value'),
-    Input('year-slider_fig_1', 'value'),
-    Input('tabs_fig_1', 'value'),
-    Input('winner-filter_fig_1', 'value'),
-)
-def update_category_dropdown_fig_1(year_range, category, winner_filter):
+def reset_selection(*component_ids):
+    """
+    Indique si l'interaction courante provient d'un des composants donnés (années, onglet, filtre),
+    auquel cas la sélection de la checklist est réinitialisée aux catégories par défaut.
+    """
+    triggered = {trigger['prop_id'].split('.')[0] for trigger in dash.callback_context.triggered}
+    return any(component_id in triggered for component_id in component_ids)
+
+
+# Figure 1
+
+@memoize('waffle-chart', maxsize=CACHE_SIZE, policy=CACHE_POLICY,
+         key=lambda year_range, category, selected_categories, winner_filter: (
+             normalize_year_range(year_range), category,
+             None if selected_categories is None else normalize_categories(selected_categories, keep_order=False),
+             winner_filter))
+def compute_waffle_chart(year_range, category, selected_categories, winner_filter):
+    """
+    Calcule en un seul filtrage + agrégation les options de la checklist, sa valeur et le waffle chart.
+    Si selected_categories vaut None, les catégories par défaut sont sélectionnées.
+    """
     # Filtrer par gagnants uniquement ou tous les nominés selon la valeur du bouton radio
-    # TODO : Trier les catégories par nombre de représentants
-    df, distribution_dict, options, selected = get_filtered_distribution(
+    df, _, options, default_selected = get_filtered_distribution(
         year_range, category, winner_filter, include_other=False
     )
-    return options, selected
+    if selected_categories is None:
+        selected_categories = default_selected
 
-# Callback pour changer le waffle-chart 
+    wchart = figure_1.WaffleChart()
+    # Ordre canonique des catégories cochées (la clé de cache ne dépend pas de l'ordre des clics)
+    with stage('aggregate'):
+        yearly_counts = dataloader.get_yearly_counts(df[['Year_Ceremony', category]],
+                                                     sorted(selected_categories, key=str))
+    with stage('figure'):
+        fig = wchart.plot_scatter_waffle_chart(yearly_counts, df, category, height=hauteur_default_figure,
+                                               lazy_hover=LAZY_HOVER, year_range=normalize_year_range(year_range),
+                                               is_winner=None if winner_filter == 'all' else True)
+    return options, selected_categories, fig
+
+
+# Callback unique pour la figure 1 : checklist et waffle-chart
 @app.callback(
+    Output('category-checklist_fig_1', 'options'),
+    Output('category-checklist_fig_1', 'value'),
     Output('waffle-chart', 'figure'),
     Input('year-slider_fig_1', 'value'),
     Input('tabs_fig_1', 'value'),
     Input('category-checklist_fig_1', 'value'),
     Input('winner-filter_fig_1', 'value'),
-    allow_duplicate=True
+    prevent_initial_call=True
 )
+@callback_metrics.instrument
 def update_waffle_chart(year_range, category, selected_categories, winner_filter):
-    is_winner = None if winner_filter == 'all' else True
-    df = dataloader.filter_data(year_range[0], year_range[1], is_winner=is_winner)
-    distribution_dict, _ = dataloader.get_unique_distribution(df)
-    wchart = figure_1.WaffleChart()
-    class_num_dict = {key: distribution_dict[category][key] for key in selected_categories}
-    # sort the dictionary by value
-    sorted_dict = dict(sorted(class_num_dict.items(), key=lambda item: item[1], reverse=True))
-    return wchart.plot_scatter_waffle_chart(sorted_dict, df, category, height=hauteur_default_figure)
-    # raise ValueError({key: distribution_dict[category][key] for key in selected_categories})
-    # return wchart.plot_scatter_waffle_chart({key: distribution_dict[category][key] for key in selected_categories}, df, category)
+    if reset_selection('year-slider_fig_1', 'tabs_fig_1', 'winner-filter_fig_1'):
+        return compute_waffle_chart(year_range, category, None, winner_filter)
+    _, _, fig = compute_waffle_chart(year_range, category, selected_categories, winner_filter)
+    return dash.no_update, dash.no_update, fig
 
 # Figure 3
 
-@app.callback(
-    Output('category-checklist_fig_3', 'options'),
-    Output('category-checklist_fig_3', 'value'),
-    Input('year-slider_fig_3', 'value'),
-    Input('tabs_fig_3', 'value'),
-    Input('winner-filter_fig_3', 'value'),
-)
-def update_category_dropdown_fig_3(year_range, category, winner_filter):
-    df, distribution_dict, options, selected = get_filtered_distribution(
+@memoize('line-chart', maxsize=CACHE_SIZE, policy=CACHE_POLICY,
+         key=lambda year_range, category, selected_categories, winner_filter, scale_type: (
+             normalize_year_range(year_range), category,
+             None if selected_categories is None else normalize_categories(selected_categories),
+             winner_filter, scale_type))
+def compute_line_chart(year_range, category, selected_categories, winner_filter, scale_type):
+    """Options et valeur de la checklist et line chart, en un seul filtrage + agrégation."""
+    df, _, options, default_selected = get_filtered_distribution(
         year_range, category, winner_filter, include_other=True
     )
-    return options, selected
-
-@app.callback(
-    Output('line-chart', 'figure'),
-    Input('year-slider_fig_3', 'value'),
-    Input('tabs_fig_3', 'value'),
-    Input('category-checklist_fig_3', 'value'),
-    Input('winner-filter_fig_3', 'value'),
-    Input('scale-selector_fig_3', 'value'),  # Nouvel input pour l'échelle
-    allow_duplicate=True
-)
-def update_line_chart(year_range, category, selected_categories, winner_filter, scale_type):
-    is_winner = None if winner_filter == 'all' else True
-    df = dataloader.filter_data(year_range[0], year_range[1], is_winner=is_winner)
+    if selected_categories is None:
+        selected_categories = default_selected
+    # La courbe 'Other' n'est pas tracée sur le line chart
+    plotted_categories = [key for key in selected_categories if key != 'Other']
+
+    # Comptes cumulés (YearlyCounts), consommés directement par le line chart
+    with stage('aggregate'):
+        distribution = dataloader.get_cumulative_yearly_counts(
+            df[['Year_Ceremony', category]], 
+            plotted_categories,
+            time_granularity=1
+        )
     
-    # Pour les données détaillées que nous allons afficher dans le hover
-    hover_df = df.copy()
+    with stage('figure'):
+        # Initialize the line chart object
+        line_chart = figure_3.LineChart()
     
-    # Utiliser get_cumulative_yearly_distribution pour obtenir les données cumulatives
-    distribution_dict = dataloader.get_cumulative_yearly_distribution(
-        df[['Year_Ceremony', category]], 
-        selected_categories,
-        time_granularity=1
+        # Render the line chart with cumulative data and selected scale type
+        fig = line_chart.plot_line_chart(
+            distribution, 
+            category, 
+            plotted_categories, 
+            # Données détaillées du hover : la vue filtrée est lue sans être modifiée, pas de copie
+            df, 
+            cumulative=True, 
+            scale_type=scale_type,
+            height=hauteur_default_figure,  # Ajout du paramètre de hauteur
+            lazy_hover=LAZY_HOVER,
+            is_winner=None if winner_filter == 'all' else True
+        )
+    return options, selected_categories, fig
+
+
+@memoize('line-counts', maxsize=CACHE_SIZE, policy=CACHE_POLICY,
+         key=lambda category, winner_filter: (category, winner_filter))
+def compute_line_counts(category, winner_filter):
+    """
+    Données du line chart rendu dans le navigateur : comptes par année et par catégorie sur toutes
+    les années, exemples du hover de chaque (année, catégorie) ou, si les infobulles sont chargées
+    à la demande, les paramètres de /api/details/cell, palettes de couleurs et mise en page.
+    """
+    is_winner = None if winner_filter == 'all' else True
+    with stage('filter'):
+        df = dataloader.filter_data(intervalle_defaut[0], intervalle_defaut[1], is_winner=is_winner)
+    with stage('aggregate'):
+        yearly_counts = dataloader.get_yearly_counts(df[['Year_Ceremony', category]])
+    years, labels = yearly_counts.periods.tolist(), yearly_counts.labels
+
+    # La mise en page ne dépend que de l'échelle et des années affichées (ligne de 2015), ajustées par le navigateur
+    _, _, fig = compute_line_chart(intervalle_defaut, category, None, winner_filter, 'linear')
+    with stage('figure'):
+        layout = json.loads(pio.to_json(fig))['layout']
+
+    data = {
+        'years': years,
+        'labels': labels,
+        'counts': yearly_counts.counts.tolist(),
+        'palettes': [list(generate_color_dict(identifiers=list(range(n)), colorscale_name='Oranges').values())
+                     for n in range(1, len(labels) + 1)],
+        'layout': layout,
+        'lazy_hover': LAZY_HOVER,
+        'column': category,
+        'is_winner': is_winner,
+    }
+    if not LAZY_HOVER:
+        # Texte des 3 premiers exemples de chaque (année, catégorie), '' s'il n'y en a pas
+        with stage('figure'):
+            _, examples = figure_3.LineChart._group_examples(df, category, labels)
+            data['examples'] = [[examples.get((label, year), '') for label in labels] for year in years]
+    return data
+
+
+if CLIENTSIDE_LINE:
+    # Les comptes ne sont demandés au serveur qu'au changement d'onglet ou de filtre de gagnant
+    @app.callback(
+        Output('counts-store_fig_3', 'data'),
+        Input('tabs_fig_3', 'value'),
+        Input('winner-filter_fig_3', 'value'),
+        prevent_initial_call=True
     )
-    
-    # Initialize the line chart object
-    line_chart = figure_3.LineChart()
-    
-    # Render the line chart with cumulative data and selected scale type
-    return line_chart.plot_line_chart(
-        distribution_dict, 
-        category, 
-        selected_categories, 
-        hover_df, 
-        cumulative=True, 
-        scale_type=scale_type,
-        height=hauteur_default_figure  # Ajout du paramètre de hauteur
+    @callback_metrics.instrument
+    def update_line_counts(category, winner_filter):
+        return compute_line_counts(category, winner_filter)
+
+    # Plage d'années, sélection et échelle sont traitées dans le navigateur
+    app.clientside_callback(
+        ClientsideFunction(namespace='oscars', function_name='lineChart'),
+        Output('category-checklist_fig_3', 'options'),
+        Output('category-checklist_fig_3', 'value'),
+        Output('line-chart', 'figure'),
+        Input('counts-store_fig_3', 'data'),
+        Input('year-slider_fig_3', 'value'),
+        Input('category-checklist_fig_3', 'value'),
+        Input('scale-selector_fig_3', 'value'),
+        prevent_initial_call=True
     )
+else:
+    @app.callback(
+        Output('category-checklist_fig_3', 'options'),
+        Output('category-checklist_fig_3', 'value'),
+        Output('line-chart', 'figure'),
+        Input('year-slider_fig_3', 'value'),
+        Input('tabs_fig_3', 'value'),
+        Input('category-checklist_fig_3', 'value'),
+        Input('winner-filter_fig_3', 'value'),
+        Input('scale-selector_fig_3', 'value'),  # Nouvel input pour l'échelle
+        prevent_initial_call=True
+    )
+    @callback_metrics.instrument
+    def update_line_chart(year_range, category, selected_categories, winner_filter, scale_type):
+        if reset_selection('year-slider_fig_3', 'tabs_fig_3', 'winner-filter_fig_3'):
+            return compute_line_chart(year_range, category, None, winner_filter, scale_type)
+        _, _, fig = compute_line_chart(year_range, category, selected_categories, winner_filter, scale_type)
+        return dash.no_update, dash.no_update, fig
 
 # Figure 4 
 
-# Callback pour figure 4
-@app.callback(
-    Output('category-checklist_fig_4', 'options'),
-    Output('category-checklist_fig_4', 'value'),
-    Input('year-slider_fig_4', 'value'),
-    Input('tabs_fig_4', 'value'),
-    Input('winner-filter_fig_4', 'value'),
-)
-def update_category_dropdown_fig_4(year_range, category, winner_filter):
-    df, distribution_dict, options, selected = get_filtered_distribution(
+@memoize('stacked-area-chart', maxsize=CACHE_SIZE, policy=CACHE_POLICY,
+         key=lambda year_range, category, selected_categories, winner_filter, time_granularity: (
+             normalize_year_range(year_range), category,
+             None if selected_categories is None else normalize_categories(selected_categories),
+             winner_filter, time_granularity))
+def compute_stacked_area_chart(year_range, category, selected_categories, winner_filter, time_granularity):
+    """Options et valeur de la checklist et stacked area chart, en un seul filtrage + agrégation."""
+    df, _, options, default_selected = get_filtered_distribution(
         year_range, category, winner_filter, include_other=True
     )
-    return options, selected
+    if selected_categories is None:
+        selected_categories = default_selected
 
-# Callback pour le stacked area chart
-@app.callback(
-    Output('stacked-area-chart', 'figure'),
-    Input('year-slider_fig_4', 'value'),
-    Input('tabs_fig_4', 'value'),
-    Input('category-checklist_fig_4', 'value'),
-    Input('winner-filter_fig_4', 'value'),
-    Input('granularity-selector_fig_4', 'value'),  # Nouveau input pour la granularité
-    allow_duplicate=True
-)
-def update_stacked_area_chart(year_range, category, selected_categories, winner_filter, time_granularity):
-    is_winner = None if winner_filter == 'all' else True
-    df = dataloader.filter_data(year_range[0], year_range[1], is_winner=is_winner)
     # On ne garde que l'année et la colonne de la catégorie
-    distribution_dict = dataloader.get_yearly_distribution(
-        df[['Year_Ceremony', category]], 
-        selected_categories,
-        time_granularity=time_granularity
-    )
+    with stage('aggregate'):
+        yearly_counts = dataloader.get_yearly_counts(
+            df[['Year_Ceremony', category]], 
+            selected_categories,
+            time_granularity=time_granularity
+        )
     
-    stacked_chart = figure_4.StackedAreaChart()
-    # Spécifier la hauteur souhaitée
-    fig = stacked_chart.plot_stacked_area_chart(
-        distribution_dict,
-        height=hauteur_default_figure  # Hauteur en pixels
-    )
+    with stage('figure'):
+        stacked_chart = figure_4.StackedAreaChart()
+        # Spécifier la hauteur souhaitée
+        fig = stacked_chart.plot_stacked_area_chart(
+            yearly_counts,
+            height=hauteur_default_figure  # Hauteur en pixels
+        )
+        fig = style_stacked_area_chart(fig)
     
+    return options, selected_categories, fig
+
+
+def style_stacked_area_chart(fig):
+    """Mise en page du stacked area chart propre à l'application (commune aux rendus serveur et navigateur)."""
     # Ajuster la mise en page selon la taille de l'écran
-    fig.update_layout(
+    return fig.update_layout(
         autosize=True,
         margin=dict(l=30, r=30, t=30, b=50)  # Marges réduites pour les petits écrans
     )
-    
-    return fig
+
+
+@memoize('stacked-area-counts', maxsize=CACHE_SIZE, policy=CACHE_POLICY,
+         key=lambda category, winner_filter: (category, winner_filter))
+def compute_stacked_area_counts(category, winner_filter):
+    """
+    Données du stacked area chart rendu dans le navigateur : comptes par année et par catégorie
+    sur toutes les années, palettes de couleurs selon le nombre de catégories affichées et mise
+    en page de la figure. Le navigateur en déduit la checklist et la figure pour toute plage
+    d'années, granularité et sélection.
+    """
+    is_winner = None if winner_filter == 'all' else True
+    with stage('filter'):
+        df = dataloader.filter_data(intervalle_defaut[0], intervalle_defaut[1], is_winner=is_winner)
+    with stage('aggregate'):
+        yearly_counts = dataloader.get_yearly_counts(df[['Year_Ceremony', category]])
+
+    # La mise en page ne dépend pas des données : celle de la figure rendue côté serveur sur toutes les années
+    _, _, fig = compute_stacked_area_chart(intervalle_defaut, category, None, winner_filter, DEFAULT_GRANULARITY)
+    with stage('figure'):
+        layout = json.loads(pio.to_json(fig))['layout']
+        # Les couleurs ne dépendent que du nombre n de catégories affichées (« Other » compris) : palettes[n - 1]
+        palettes = [list(generate_color_dict(identifiers=list(range(n)), colorscale_name='Oranges').values())
+                    for n in range(1, len(yearly_counts.labels) + 2)]
+    return {
+        'years': yearly_counts.periods.tolist(),
+        'labels': yearly_counts.labels,
+        'counts': yearly_counts.counts.tolist(),
+        'palettes': palettes,
+        'layout': layout,
+    }
+
+
+if CLIENTSIDE_AREA:
+    # Les comptes ne sont demandés au serveur qu'au changement d'onglet ou de filtre de gagnant
+    @app.callback(
+        Output('counts-store_fig_4', 'data'),
+        Input('tabs_fig_4', 'value'),
+        Input('winner-filter_fig_4', 'value'),
+        prevent_initial_call=True
+    )
+    @callback_metrics.instrument
+    def update_stacked_area_counts(category, winner_filter):
+        return compute_stacked_area_counts(category, winner_filter)
+
+    # Plage d'années, granularité et sélection sont traitées dans le navigateur
+    app.clientside_callback(
+        ClientsideFunction(namespace='oscars', function_name='stackedAreaChart'),
+        Output('category-checklist_fig_4', 'options'),
+        Output('category-checklist_fig_4', 'value'),
+        Output('stacked-area-chart', 'figure'),
+        Input('counts-store_fig_4', 'data'),
+        Input('year-slider_fig_4', 'value'),
+        Input('category-checklist_fig_4', 'value'),
+        Input('granularity-selector_fig_4', 'value'),
+        prevent_initial_call=True
+    )
+else:
+    # Callback unique pour la figure 4 : checklist et stacked area chart
+    @app.callback(
+        Output('category-checklist_fig_4', 'options'),
+        Output('category-checklist_fig_4', 'value'),
+        Output('stacked-area-chart', 'figure'),
+        Input('year-slider_fig_4', 'value'),
+        Input('tabs_fig_4', 'value'),
+        Input('category-checklist_fig_4', 'value'),
+        Input('winner-filter_fig_4', 'value'),
+        Input('granularity-selector_fig_4', 'value'),  # Nouveau input pour la granularité
+        prevent_initial_call=True
+    )
+    @callback_metrics.instrument
+    def update_stacked_area_chart(year_range, category, selected_categories, winner_filter, time_granularity):
+        if reset_selection('year-slider_fig_4', 'tabs_fig_4', 'winner-filter_fig_4'):
+            return compute_stacked_area_chart(year_range, category, None, winner_filter, time_granularity)
+        _, _, fig = compute_stacked_area_chart(year_range, category, selected_categories, winner_filter, time_granularity)
+        return dash.no_update, dash.no_update, fig
+
+@memoize('sankey-chart', maxsize=CACHE_SIZE, policy=CACHE_POLICY,
+         key=lambda year_range, demographic_column: (normalize_year_range(year_range), demographic_column))
+def compute_sankey_chart(year_range, demographic_column):
+    """
+    Sankey pour une plage d'années et une colonne, à partir des comptes cumulés du cube.
+    Le Sankey compare toujours gagnants et nominés : le filtre de gagnant n'entre pas dans la clé de cache.
+    """
+    with stage('aggregate'):
+        counts = dataloader.get_winner_counts(year_range[0], year_range[1], demographic_column)
+    with stage('figure'):
+        sankey = figure_2.SankeyDemographicChart()
+        return sankey.plot_sankey_counts(*counts)
+
 
 @app.callback(
     Output('figure-2-graph', 'figure'),
     Input('tabs_fig_2', 'value'),
     Input('winner-filter_fig_2', 'value'),
     Input('year-slider_fig_2', 'value'),
+    prevent_initial_call=True
 )
+@callback_metrics.instrument
 def update_sankey_chart(demographic_column, winner_filter, year_range):
-    is_winner = None if winner_filter == 'all' else True
-    df = dataloader.filter_data(year_range[0], year_range[1], is_winner=None)  # on prend tout pour comparer
-
-    sankey = figure_2.SankeyDemographicChart()
-    return sankey.plot_sankey_chart(df, demographic_column)
+    return compute_sankey_chart(year_range, demographic_column)
+
+
+# Vue par défaut
+def render_default_view():
+    """
+    Calcule une seule fois, au démarrage, la vue par défaut de chaque figure (options et valeur
+    des checklists, figure). Les figures sont converties en structures JSON natives pour que
+    leur sérialisation à chaque chargement de page soit triviale.
+    """
+    category = 'Race or Ethnicity'
+    winner_filter = 'winners'
+
+    def to_json_native(fig):
+        return json.loads(pio.to_json(fig))
+
+    view = {}
+    for figure_id, (options, selected, fig) in [
+        (1, compute_waffle_chart(intervalle_defaut, category, None, winner_filter)),
+        (3, compute_line_chart(intervalle_defaut, category, None, winner_filter, 'linear')),
+        (4, compute_stacked_area_chart(intervalle_defaut, category, None, winner_filter, DEFAULT_GRANULARITY)),
+    ]:
+        view[figure_id] = {'checklist_options': options, 'checklist_value': selected, 'figure': to_json_native(fig)}
+    if CLIENTSIDE_LINE:
+        view[3]['counts_data'] = compute_line_counts(category, winner_filter)
+    if CLIENTSIDE_AREA:
+        view[4]['counts_data'] = compute_stacked_area_counts(category, winner_filter)
+    view[2] = {'figure': to_json_native(compute_sankey_chart(intervalle_defaut, category))}
+    return view
+
+
+DEFAULT_VIEW = render_default_view()
+app.layout = serve_layout
+
+
+# Rafraîchissement des données
+# Plage d'années (début, fin) couverte par une entrée de chaque cache, d'après sa clé. Les caches
+# absents de la table dépendent de toutes les années
+CACHE_YEAR_RANGES = {
+    'waffle-chart': lambda key: key[0],
+    'line-chart': lambda key: key[0],
+    'stacked-area-chart': lambda key: key[0],
+    'sankey-chart': lambda key: key[0],
+    'details-cell': lambda key: (key[0], key[0]),
+    'details-members': lambda key: (key[0], key[1]),
+    'details-waffle': lambda key: (key[0], key[1]),
+}
+
+
+def invalidate_caches(years):
+    """Retire des caches les entrées dont la plage d'années contient une des années modifiées."""
+    def touches(year_range):
+        return year_range is None or any(year_range[0] <= year <= year_range[1] for year in years)
+
+    for name, cache in CACHES.items():
+        key_year_range = CACHE_YEAR_RANGES.get(name, lambda key: None)
+        cache.invalidate(lambda key: touches(key_year_range(key)))
+
+
+def on_data_change(years):
+    """
+    Appelée après une mise à jour des données (DataLoader.refresh) : le nouvel état est déjà en place,
+    les figures qui dépendent des années modifiées sont invalidées et la vue par défaut est recalculée.
+    """
+    global intervalle_defaut, DEFAULT_VIEW
+    intervalle_defaut = dataloader.get_year_range()
+    invalidate_caches(years)
+    DEFAULT_VIEW = render_default_view()
+
+
+if WATCH_INTERVAL and not COLUMNAR_PATH:
+    # Empreinte de référence du CSV, calculée une seule fois avant le fork des workers
+    dataloader.track_source()
+
+
+def start_data_watcher():
+    """Démarre la surveillance du CSV dans ce processus (voir post_fork dans gunicorn.conf.py)."""
+    if WATCH_INTERVAL and not COLUMNAR_PATH:
+        dataloader.watch(WATCH_INTERVAL, on_change=on_data_change)
 
 
 if __name__ == '__main__':
-    app.run(port=8070, debug=True)
\ No newline at end of file
+    # Serveur de développement ; en production : gunicorn -c gunicorn.conf.py wsgi:server
+    debug = True
+    # Avec le rechargement automatique, le processus parent ne fait que relancer le serveur :
+    # seul le processus qui sert les requêtes (WERKZEUG_RUN_MAIN) surveille le CSV
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_data_watcher()
+    app.run(port=8070, debug=debug)
\ No newline at end of file
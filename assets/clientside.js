@@ -0,0 +1,256 @@
+/*
+ * Rendu des figures dans le navigateur (OSCARS_CLIENTSIDE_LINE=1, OSCARS_CLIENTSIDE_AREA=1).
+ *
+ * Le serveur envoie une fois par onglet et filtre de gagnant les comptes par année et par
+ * catégorie (counts-store_fig_N) ; les changements de plage d'années, de sélection, d'échelle
+ * et de granularité sont calculés ici, sans aller-retour serveur. Les figures produites sont
+ * identiques à celles construites côté serveur (figures/figure_3.py, figures/figure_4.py).
+ */
+(function () {
+    // Même format que Python f"{x:.1f}" : arrondi au pair pour les valeurs exactement à mi-chemin
+    function formatPercentage(value) {
+        if (isNaN(value)) {
+            return 'nan';
+        }
+        if (Number.isInteger(value * 4) && !Number.isInteger(value * 2)) {
+            var tenths = Math.floor(value * 10);
+            return ((tenths % 2 ? tenths + 1 : tenths) / 10).toFixed(1);
+        }
+        return value.toFixed(1);
+    }
+
+    function triggeredIds() {
+        var context = window.dash_clientside.callback_context;
+        return (context ? context.triggered : []).map(function (trigger) {
+            return trigger.prop_id.split('.')[0];
+        });
+    }
+
+    // Totaux de chaque catégorie et lignes (années) comprises dans la plage
+    function selectYears(store, yearRange) {
+        var rows = [];
+        var totals = store.labels.map(function () { return 0; });
+        store.years.forEach(function (year, row) {
+            if (year >= yearRange[0] && year <= yearRange[1]) {
+                rows.push(row);
+                store.counts[row].forEach(function (count, i) { totals[i] += count; });
+            }
+        });
+        return {rows: rows, totals: totals};
+    }
+
+    // Catégories présentes, de la plus à la moins fréquente (comme DataLoader.get_column_distribution)
+    function distributionOrder(totals) {
+        var order = [];
+        totals.forEach(function (total, i) {
+            if (total > 0) {
+                order.push(i);
+            }
+        });
+        return order.sort(function (a, b) { return totals[b] - totals[a]; });
+    }
+
+    // Options de la checklist et sélection par défaut (5 premières catégories, puis « Other »)
+    function checklist(store, order) {
+        var options = order.map(function (i) {
+            return {label: store.labels[i], value: store.labels[i]};
+        });
+        options.push({label: 'Other', value: 'Other'});
+        var selected = order.slice(0, 5).map(function (i) { return store.labels[i]; });
+        if (order.length > 5) {
+            selected.push('Other');
+        }
+        return {options: options, selected: selected};
+    }
+
+    // Un changement d'onglet, de filtre (nouveaux comptes) ou d'années réinitialise la sélection
+    function resetSelection(figureId) {
+        var triggered = triggeredIds();
+        return triggered.indexOf('counts-store_fig_' + figureId) !== -1 ||
+            triggered.indexOf('year-slider_fig_' + figureId) !== -1;
+    }
+
+    // Comptes par période (début de la tranche d'années), périodes sans aucun compte exclues
+    function periodCounts(store, rows, granularity) {
+        var periods = [];
+        var counts = [];
+        rows.forEach(function (row) {
+            var period = Math.floor(store.years[row] / granularity) * granularity;
+            if (!periods.length || periods[periods.length - 1] !== period) {
+                periods.push(period);
+                counts.push(store.labels.map(function () { return 0; }));
+            }
+            var periodRow = counts[counts.length - 1];
+            store.counts[row].forEach(function (count, i) { periodRow[i] += count; });
+        });
+        var kept = periods.map(function (period, i) {
+            return counts[i].some(function (count) { return count > 0; });
+        });
+        return {
+            periods: periods.filter(function (period, i) { return kept[i]; }),
+            counts: counts.filter(function (row, i) { return kept[i]; })
+        };
+    }
+
+    function lineChartFigure(store, rows, plotted, scaleType) {
+        var years = rows.map(function (row) { return store.years[row]; });
+        var positions = new Map(store.labels.map(function (label, i) { return [label, i]; }));
+        var colors = plotted.length ? store.palettes[plotted.length - 1] : [];
+
+        var data = plotted.map(function (label, i) {
+            // Comptes de chaque année et comptes cumulés (zéros pour une catégorie absente)
+            var column = positions.get(label);
+            var annualCounts = rows.map(function (row) {
+                return column === undefined ? 0 : store.counts[row][column];
+            });
+            var total = 0;
+            var cumulative = annualCounts.map(function (count) { return total += count; });
+
+            var trace = {
+                line: {color: colors[i], width: 3},
+                marker: {color: colors[i], size: 8},
+                mode: 'lines+markers',
+                name: String(label),
+                x: years,
+                y: cumulative,
+                type: 'scatter'
+            };
+            if (store.lazy_hover) {
+                // Seuls les comptes de l'année sont envoyés, les exemples sont chargés au survol
+                trace.customdata = annualCounts;
+                trace.hoverinfo = 'none';
+                trace.meta = {lazy_hover: 'cell', column: store.column, value: label,
+                              is_winner: store.is_winner, cumulative: true};
+            } else {
+                trace.hoverinfo = 'text';
+                trace.hovertext = rows.map(function (row, k) {
+                    var text = '<b>' + label + '</b><br>Année: ' + years[k] + '<br>' +
+                        'Total cumulé: ' + cumulative[k] + '<br>Nouveaux cette année: ' + annualCounts[k] + '<br>';
+                    if (annualCounts[k] > 0) {
+                        text += '<br>Exemples:<br>' + store.examples[row][column];
+                        if (annualCounts[k] > 3) {
+                            text += '...et ' + (annualCounts[k] - 3) + ' autres';
+                        }
+                    }
+                    return text;
+                });
+            }
+            return trace;
+        });
+
+        // Ligne verticale à 2015 si l'année fait partie de la plage affichée
+        var shapes = [];
+        if (years.length && years[0] <= 2015 && 2015 <= years[years.length - 1]) {
+            shapes.push({type: 'line', x0: 2015, x1: 2015, y0: 0, y1: 1, xref: 'x', yref: 'paper',
+                         line: {color: 'grey', width: 2, dash: 'dashdot'}});
+        }
+        var layout = Object.assign({}, store.layout, {
+            yaxis: Object.assign({}, store.layout.yaxis, {type: scaleType})
+        });
+        delete layout.shapes;
+        if (shapes.length) {
+            layout.shapes = shapes;
+        }
+        return {data: data, layout: layout};
+    }
+
+    function stackedAreaFigure(store, totals, periodData, selected) {
+        // Catégories sélectionnées présentes dans la plage, dans l'ordre de la sélection, puis « Other »
+        var positions = new Map();
+        store.labels.forEach(function (label, i) {
+            if (totals[i] > 0) {
+                positions.set(label, i);
+            }
+        });
+        var labels = selected.filter(function (key) { return key !== 'Other' && positions.has(key); });
+        var columns = labels.map(function (key) { return positions.get(key); });
+        var withOther = selected.indexOf('Other') !== -1;
+        if (withOther) {
+            labels.push('Other');
+        }
+
+        var periods = periodData.periods.map(String);
+        var counts = periodData.counts.map(function (row) {
+            var values = columns.map(function (i) { return row[i]; });
+            if (withOther) {
+                var total = 0;
+                positions.forEach(function (i) { total += row[i]; });
+                values.push(values.reduce(function (other, value) { return other - value; }, total));
+            }
+            return values;
+        });
+        var percentages = counts.map(function (values) {
+            var total = values.reduce(function (sum, value) { return sum + value; }, 0);
+            return values.map(function (value) { return value / total * 100; });
+        });
+
+        var colors = labels.length ? store.palettes[labels.length - 1] : [];
+        var data = labels.map(function (label, i) {
+            return {
+                fillcolor: colors[i],
+                hoverinfo: 'skip',
+                line: {width: 0},
+                mode: 'lines',
+                name: String(label),
+                stackgroup: 'one',
+                x: periods,
+                y: percentages.map(function (values) { return isNaN(values[i]) ? null : values[i]; }),
+                type: 'scatter'
+            };
+        });
+
+        var hoverTexts = periods.map(function (period, row) {
+            var text = 'Année : ' + period + '<br>';
+            labels.forEach(function (label, i) {
+                text += label + ' : ' + formatPercentage(percentages[row][i]) + '% (' + counts[row][i] + ')<br>';
+            });
+            return text;
+        });
+        data.push({
+            hoverinfo: 'text',
+            hovertext: hoverTexts,
+            marker: {opacity: 0},
+            mode: 'markers',
+            showlegend: false,
+            x: periods,
+            y: periods.map(function () { return 50; }),
+            type: 'scatter'
+        });
+
+        return {data: data, layout: store.layout};
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        oscars: Object.assign({}, (window.dash_clientside || {}).oscars, {
+            // Figure 3 : options et valeur de la checklist, line chart (la courbe « Other » n'est pas tracée)
+            lineChart: function (store, yearRange, selected, scaleType) {
+                var selection = selectYears(store, yearRange);
+                var lists = checklist(store, distributionOrder(selection.totals));
+                var reset = resetSelection(3);
+                if (reset) {
+                    selected = lists.selected;
+                }
+
+                var plotted = (selected || []).filter(function (key) { return key !== 'Other'; });
+                var figure = lineChartFigure(store, selection.rows, plotted, scaleType);
+                var noUpdate = window.dash_clientside.no_update;
+                return reset ? [lists.options, selected, figure] : [noUpdate, noUpdate, figure];
+            },
+
+            // Figure 4 : options et valeur de la checklist, stacked area chart
+            stackedAreaChart: function (store, yearRange, selected, granularity) {
+                var selection = selectYears(store, yearRange);
+                var lists = checklist(store, distributionOrder(selection.totals));
+                var reset = resetSelection(4);
+                if (reset) {
+                    selected = lists.selected;
+                }
+
+                var figure = stackedAreaFigure(store, selection.totals,
+                    periodCounts(store, selection.rows, granularity), selected || []);
+                var noUpdate = window.dash_clientside.no_update;
+                return reset ? [lists.options, selected, figure] : [noUpdate, noUpdate, figure];
+            }
+        })
+    });
+})();
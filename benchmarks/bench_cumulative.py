@@ -0,0 +1,64 @@
+"""
+Temps de calcul de la distribution cumulative du line chart (figure 3) : ancienne version
+(remplissage cellule par cellule, cumsum sur un DataFrame objet, iterrows), version vectorisée
+retournant le dictionnaire, et variante retournant directement les tableaux.
+
+    python -m benchmarks.bench_cumulative [--repeat 5]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader
+
+CATEGORY = 'Race or Ethnicity'
+
+
+def legacy_cumulative(dataloader, data, selected_categories=None, time_granularity=1):
+    """Ancienne version de get_cumulative_yearly_distribution, conservée comme référence."""
+    yearly_distribution = dataloader.get_yearly_distribution(data, selected_categories, time_granularity)
+    years = sorted(yearly_distribution.keys())
+    categories = list(set().union(*[d.keys() for d in yearly_distribution.values()]))
+    cumulative_df = pd.DataFrame(index=years, columns=categories).fillna(0)
+    for year, dist in yearly_distribution.items():
+        for category, count in dist.items():
+            cumulative_df.loc[year, category] = count
+    cumulative_df = cumulative_df.cumsum()
+    return {year: row.to_dict() for year, row in cumulative_df.iterrows()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    raw = load_raw()
+
+    print(f"{'lignes':>8} {'ancien':>10} {'dictionnaire':>13} {'tableaux':>10} {'gain':>8}")
+    for n_rows in [len(raw), 23_310, 233_100]:
+        dataloader = DataLoader()
+        dataloader.data = scale_dataset(raw, n_rows)
+        dataloader.preprocess_data()
+        df = dataloader.filter_data(1928, 2025)
+        data = df[['Year_Ceremony', CATEGORY]]
+        distribution_dict, _ = dataloader.get_unique_distribution(df)
+        selected = list(distribution_dict[CATEGORY])[:5] + ['Other']
+
+        expected = legacy_cumulative(dataloader, data, list(selected))
+        assert expected == dataloader.get_cumulative_yearly_distribution(data, list(selected))
+        cumulative = dataloader.get_cumulative_yearly_counts(data, selected)
+        assert np.array_equal(cumulative.counts, [[expected[year][label] for label in cumulative.labels]
+                                                  for year in cumulative.periods.tolist()])
+
+        legacy_time = best_time(lambda: legacy_cumulative(dataloader, data, list(selected)), repeat=args.repeat)
+        dict_time = best_time(lambda: dataloader.get_cumulative_yearly_distribution(data, list(selected)),
+                              repeat=args.repeat)
+        array_time = best_time(lambda: dataloader.get_cumulative_yearly_counts(data, selected), repeat=args.repeat)
+        print(f'{n_rows:>8} {format_time(legacy_time):>10} {format_time(dict_time):>13} '
+              f'{format_time(array_time):>10} {legacy_time / array_time:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
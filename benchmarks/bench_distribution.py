@@ -0,0 +1,56 @@
+"""
+Temps de get_unique_distribution sur un DataFrame que le cube ne peut pas servir (copie sans
+requête de filtrage) : ancienne version (copie, suppression de colonnes, un groupby par colonne),
+nouvelle version sur les codes pour toutes les colonnes, et get_column_distribution pour une seule.
+
+    python -m benchmarks.bench_distribution [--repeat 5]
+"""
+import argparse
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader
+
+COLUMN = 'Race or Ethnicity'
+
+
+def legacy_unique_distribution(data):
+    """Ancienne version (hors cube), conservée comme référence."""
+    df = data.copy()
+    df.drop(columns=['Category', 'Name', 'Film', 'Year_Ceremony', 'Win_Oscar?'], inplace=True)
+    df = df.reindex(sorted(df.columns), axis=1)
+    result_dict = {}
+    for col in df.columns:
+        result_dict[col] = df.groupby(col, observed=True).size().sort_index().to_dict()
+        result_dict[col] = dict(sorted(result_dict[col].items(), key=lambda item: item[1], reverse=True))
+    return result_dict, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    raw = load_raw()
+
+    print(f"{'lignes':>9} {'ancien':>10} {'toutes':>10} {'une colonne':>12} {'cube':>10}")
+    for n_rows in [len(raw), 233_100, 2_331_000]:
+        dataloader = DataLoader()
+        dataloader.data = scale_dataset(raw, n_rows)
+        dataloader.preprocess_data()
+        filtered = dataloader.filter_data(1950, 2000)
+        # Sans la requête de filtrage mémorisée, le cube n'est pas utilisé
+        data = filtered.copy()
+        data.attrs = {}
+
+        assert legacy_unique_distribution(data) == dataloader.get_unique_distribution(data)
+
+        legacy_time = best_time(lambda: legacy_unique_distribution(data), repeat=args.repeat)
+        all_time = best_time(lambda: dataloader.get_unique_distribution(data), repeat=args.repeat)
+        column_time = best_time(lambda: dataloader.get_column_distribution(data, COLUMN), repeat=args.repeat)
+        cube_time = best_time(lambda: dataloader.get_column_distribution(filtered, COLUMN), repeat=args.repeat)
+        print(f'{n_rows:>9} {format_time(legacy_time):>10} {format_time(all_time):>10} '
+              f'{format_time(column_time):>12} {format_time(cube_time):>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Temps de DataLoader.filter_data : masques booléens sur toute la table (ancienne version)
+et découpage par l'index des années (YearIndex).
+
+    python -m benchmarks.bench_filter [--repeat 5]
+"""
+import argparse
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader
+
+QUERIES = [((1928, 2025), None), ((1950, 2000), True), ((1990, 2010), False)]
+
+
+def legacy_filter(data, start_year, end_year, is_winner=None):
+    """Ancienne version de filter_data, conservée comme référence."""
+    filtered_df = data[(data['Year_Ceremony'] >= start_year) & (data['Year_Ceremony'] <= end_year)]
+    if is_winner is not None:
+        filtered_df = filtered_df[filtered_df['Win_Oscar?'] == is_winner]
+    return filtered_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    raw = load_raw()
+
+    print(f"{'lignes':>9} {'requête':<22} {'masques':>10} {'index':>10} {'gain':>9}")
+    for n_rows in [len(raw), 233_100, 2_331_000]:
+        dataloader = DataLoader()
+        dataloader.data = scale_dataset(raw, n_rows).sort_values('Year_Ceremony', kind='stable')
+        dataloader.preprocess_data()
+        # Données dans leur ordre d'origine (dataloader.data est rangé par (gagnant, année))
+        data = dataloader.filter_data(*dataloader.get_year_range())
+
+        for (start_year, end_year), is_winner in QUERIES:
+            assert legacy_filter(data, start_year, end_year, is_winner).equals(
+                dataloader.filter_data(start_year, end_year, is_winner))
+            legacy_time = best_time(lambda: legacy_filter(data, start_year, end_year, is_winner), repeat=args.repeat)
+            index_time = best_time(lambda: dataloader.filter_data(start_year, end_year, is_winner), repeat=args.repeat)
+            query = f'{start_year}-{end_year} {is_winner}'
+            print(f'{n_rows:>9} {query:<22} {format_time(legacy_time):>10} {format_time(index_time):>10} '
+                  f'{legacy_time / index_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
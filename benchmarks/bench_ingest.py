@@ -0,0 +1,75 @@
+"""
+Ingestion d'un grand CSV : lecture complète (load_data puis preprocess_data) comparée à la lecture
+par blocs (load_data(..., chunksize=N)). Chaque mode est mesuré dans un processus séparé :
+    pic RSS   : mémoire résidente maximale du processus (ru_maxrss)
+    données   : taille des données prétraitées (DataFrame, memory_usage(deep=True))
+    débit     : lignes ingérées par seconde, index (cube, années) compris
+
+Le CSV est produit par scripts/generate_dataset.py.
+
+    python -m benchmarks.bench_ingest [--rows 2000000 5000000] [--chunksize 100000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.common import CSV_PATH, ROOT
+from helper import DataLoader
+from scripts.generate_dataset import DatasetGenerator
+
+
+def worker(path, chunksize):
+    """Processus mesuré : ingère le CSV et affiche ses mesures en JSON."""
+    started = time.perf_counter()
+    dataloader = DataLoader()
+    dataloader.load_data(path, use_cache=False, chunksize=chunksize or None)
+    dataloader.preprocess_data()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'rows': len(dataloader.data),
+        'seconds': elapsed,
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'data_bytes': int(dataloader.data.memory_usage(deep=True).sum()),
+    }))
+
+
+def measure(path, chunksize):
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_ingest', '--worker', path, str(chunksize)],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[2_000_000, 5_000_000])
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--worker', nargs=2, metavar=('PATH', 'CHUNKSIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker[0], int(args.worker[1]))
+        return
+
+    source = pd.read_csv(CSV_PATH)
+    print(f"{'lignes':>10} {'CSV (Mo)':>9} {'mode':<16} {'pic RSS (Mo)':>13} {'données (Mo)':>13} {'lignes/s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = os.path.join(tmp, f'oscars_{n_rows}.csv')
+            DatasetGenerator(source, n_rows, 1928, 2025).write(path)
+            csv_size = os.path.getsize(path) / 1e6
+            for mode, chunksize in [('complet', 0), (f'blocs {args.chunksize:,}', args.chunksize)]:
+                result = measure(path, chunksize)
+                print(f"{n_rows:>10,} {csv_size:>9.1f} {mode:<16} {result['peak_rss'] / 1e6:>13.1f} "
+                      f"{result['data_bytes'] / 1e6:>13.1f} {result['rows'] / result['seconds']:>11,.0f}")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
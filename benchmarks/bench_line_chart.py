@@ -0,0 +1,81 @@
+"""
+Temps de construction du line chart (figure 3) en granularité annuelle avec « Gagnants et nominés »,
+comparé à l'ancienne construction du hover (filtrage par année, x_years.index et iterrows).
+
+    python -m benchmarks.bench_line_chart [--repeat 3]
+"""
+import argparse
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader
+import figures.figure_3 as figure_3
+
+CATEGORY = 'Race or Ethnicity'
+
+
+def legacy_hover_texts(distribution_dict, category, selected_categories, df, cumulative=True):
+    """Ancienne construction du hover, conservée comme référence."""
+    hover_texts_by_category = {}
+    for category_name in selected_categories:
+        x_years = sorted(distribution_dict.keys())
+        filtered_df = df[df[category] == category_name]
+        hover_texts = []
+        for year in x_years:
+            year_count = distribution_dict[year].get(category_name, 0)
+            annual_count = year_count
+            if cumulative and year > min(x_years):
+                previous_year = x_years[x_years.index(year) - 1]
+                annual_count = year_count - distribution_dict[previous_year].get(category_name, 0)
+            year_data = filtered_df[filtered_df['Year_Ceremony'] == year]
+            text = f"<b>{category_name}</b><br>"
+            text += f"Année: {year}<br>"
+            if cumulative:
+                text += f"Total cumulé: {year_count}<br>"
+                text += f"Nouveaux cette année: {annual_count}<br>"
+            else:
+                text += f"Nombre cette année: {annual_count}<br>"
+            if not year_data.empty and annual_count > 0:
+                text += "<br>Exemples:<br>"
+                for _, entry in year_data.head(3).iterrows():
+                    text += f"• {entry['Name']} ({entry['Film']})<br>"
+                if len(year_data) > 3:
+                    text += f"...et {len(year_data) - 3} autres"
+            hover_texts.append(text)
+        hover_texts_by_category[category_name] = hover_texts
+    return hover_texts_by_category
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    raw = load_raw()
+    line_chart = figure_3.LineChart()
+
+    print(f"{'lignes':>8} {'hover ancien':>13} {'hover groupé':>13} {'gain':>8} {'figure complète':>16}")
+    for n_rows in [len(raw), 23_310, 233_100]:
+        dataloader = DataLoader()
+        dataloader.data = scale_dataset(raw, n_rows)
+        dataloader.preprocess_data()
+        # Gagnants et nominés, toutes les années
+        df = dataloader.filter_data(1928, 2025)
+        distribution_dict, _ = dataloader.get_unique_distribution(df)
+        selected = list(distribution_dict[CATEGORY])[:6]
+        cumulative = dataloader.get_cumulative_yearly_distribution(df[['Year_Ceremony', CATEGORY]], list(selected))
+        x_years, series = line_chart._get_series(cumulative, selected)
+
+        assert legacy_hover_texts(cumulative, CATEGORY, selected, df) == \
+            line_chart._build_hover_texts(series, x_years, CATEGORY, selected, df)
+
+        legacy_time = best_time(lambda: legacy_hover_texts(cumulative, CATEGORY, selected, df), repeat=args.repeat)
+        grouped_time = best_time(lambda: line_chart._build_hover_texts(series, x_years, CATEGORY, selected, df),
+                                 repeat=args.repeat)
+        figure_time = best_time(lambda: line_chart.plot_line_chart(cumulative, CATEGORY, selected, df),
+                                repeat=args.repeat)
+        print(f'{n_rows:>8} {format_time(legacy_time):>13} {format_time(grouped_time):>13} '
+              f'{legacy_time / grouped_time:7.1f}x {format_time(figure_time):>16}')
+
+
+if __name__ == '__main__':
+    main()
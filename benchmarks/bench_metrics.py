@@ -0,0 +1,63 @@
+"""
+Temps des callbacks par étape, relevés par l'instrumentation de metrics.CallbackMetrics en rejouant
+les interactions de bench_round_trips contre le serveur Flask (sans navigateur), caches vidés à
+chaque passe. Mesure aussi le coût de l'instrumentation par étape, activée et désactivée.
+
+    python -m benchmarks.bench_metrics [--repeat 5]
+    OSCARS_CLIENTSIDE_LINE=1 OSCARS_CLIENTSIDE_AREA=1 python -m benchmarks.bench_metrics
+"""
+import argparse
+import os
+
+os.environ['OSCARS_METRICS'] = '1'
+
+from benchmarks.common import best_time, format_time  # noqa: E402
+from benchmarks.bench_round_trips import INTERACTIONS, RendererSimulation  # noqa: E402
+from cache import CACHES  # noqa: E402
+from metrics import STAGES, CallbackMetrics  # noqa: E402
+import app as dash_app  # noqa: E402
+
+N_CALLS = 100_000
+
+
+def stage_overhead(enabled):
+    """Coût d'une étape vide (entrée et sortie du gestionnaire de contexte) pendant un callback."""
+    metrics = CallbackMetrics(enabled=enabled)
+    if enabled:
+        metrics.begin()
+
+    def run():
+        for _ in range(N_CALLS):
+            with metrics.stage('filter'):
+                pass
+    return best_time(run, repeat=3) / N_CALLS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Coût d'une étape : désactivée {format_time(stage_overhead(False))}, "
+          f"activée {format_time(stage_overhead(True))}\n")
+
+    client = dash_app.app.server.test_client()
+    simulation = RendererSimulation(client)
+    dash_app.callback_metrics.reset()
+    for _ in range(args.repeat):
+        for cache in CACHES.values():
+            cache.clear()
+        for _, prop, value in INTERACTIONS:
+            simulation.interact(prop, value)
+
+    print(f"{'callback':<28} {'requêtes':>9} {'total':>12} " + ' '.join(f'{stage:>13}' for stage in STAGES) +
+          f" {'réponse (Ko)':>13}")
+    for callback, stats in sorted(dash_app.callback_metrics.snapshot().items()):
+        stages = ' '.join(f"{format_time(stats['stages'][stage]) if stage in stats['stages'] else '-':>13}"
+                          for stage in STAGES)
+        print(f"{callback:<28} {stats['count']:>9} {format_time(stats['seconds']):>12} {stages} "
+              f"{stats['response_bytes'] / 1e3:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
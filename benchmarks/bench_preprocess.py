@@ -0,0 +1,74 @@
+"""
+Compare l'ancien prétraitement (apply ligne par ligne) et le calcul vectorisé des tranches d'âge
+(DataLoader._preprocess_rows) sur le CSV fourni et sur une version agrandie à 1M de lignes.
+La suite de preprocess_data (types compacts, tri, cube de comptes et index des années) n'a pas
+d'équivalent dans l'ancien prétraitement : son temps est affiché à part.
+
+    python -m benchmarks.bench_preprocess [--rows 1000000] [--repeat 3]
+"""
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader
+
+
+def legacy_preprocess(data):
+    """Prétraitement d'origine, conservé comme référence."""
+    data = data.copy()
+    data['Birth_Date'] = pd.to_datetime(data['Birth_Date'], format='%Y-%m-%d', errors='coerce')
+    data['Ceremony_Date'] = pd.to_datetime(data['Year_Ceremony'], format='%Y').apply(lambda x: x.replace(month=3, day=1))
+    data['Age'] = ((data['Ceremony_Date'] - data['Birth_Date']).dt.days / 365.25).apply(math.floor, 0)
+    data['Age'] = (data['Age'] // 10) * 10
+    return data.drop(columns=['Birth_Date', 'Birth_Place', 'Ceremony_Date', 'Link', 'Ceremony_Date'])
+
+
+def vectorized_preprocess(data):
+    """Tranches d'âge vectorisées, même travail que legacy_preprocess."""
+    return DataLoader()._preprocess_rows(data.copy())
+
+
+def build_indexes(rows):
+    """Fin de preprocess_data sur des lignes déjà prétraitées : types compacts, tri, cube et index."""
+    dataloader = DataLoader()
+    dataloader.data = rows.copy()
+    dataloader._compact_dtypes()
+    dataloader._sort_by_year()
+    dataloader._build_indexes()
+    return dataloader
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Taille du jeu de données agrandi')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    raw = load_raw()
+    datasets = [('CSV fourni', raw), (f'{args.rows:,} lignes', scale_dataset(raw, args.rows))]
+
+    print(f"{'Jeu de données':<20} {'ancien':>12} {'vectorisé':>12} {'gain':>8} {'cube et index':>14}")
+    for name, data in datasets:
+        legacy = legacy_preprocess(data)
+        dataloader = DataLoader()
+        dataloader.data = data.copy()
+        dataloader.preprocess_data()
+        # Les âges doivent être identiques à ceux du prétraitement d'origine. Les données prétraitées
+        # sont rangées par (gagnant, année) : elles sont comparées dans l'ordre des données (par année)
+        vectorized = dataloader.data.iloc[dataloader.year_index.year_positions]
+        legacy = legacy.sort_values('Year_Ceremony', kind='stable')
+        assert np.array_equal(legacy['Age'].to_numpy(dtype=np.int64), vectorized['Age'].to_numpy(dtype=np.int64))
+
+        rows = vectorized_preprocess(data)
+        legacy_time = best_time(lambda: legacy_preprocess(data), repeat=args.repeat)
+        vectorized_time = best_time(lambda: vectorized_preprocess(data), repeat=args.repeat)
+        index_time = best_time(lambda: build_indexes(rows), repeat=args.repeat)
+        print(f'{name:<20} {format_time(legacy_time):>12} {format_time(vectorized_time):>12} '
+              f'{legacy_time / vectorized_time:7.1f}x {format_time(index_time):>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Prise en compte d'une nouvelle cérémonie : rechargement complet (load_data puis preprocess_data,
+comme au redémarrage de l'application) comparé à DataLoader.refresh, qui ne retraite que les
+années modifiées. Deux modifications du CSV sont mesurées :
+    ajout      : les lignes d'une nouvelle année sont ajoutées à la fin du fichier
+    réécriture : le fichier est réécrit avec une année modifiée (lecture complète du fichier)
+
+Le CSV est produit par scripts/generate_dataset.py.
+
+    python -m benchmarks.bench_refresh [--rows 100000 1000000] [--new-rows 2000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.common import CSV_PATH, format_time
+from helper import DataLoader
+from scripts.generate_dataset import DatasetGenerator
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def full_reload(path):
+    dataloader = DataLoader()
+    dataloader.load_data(path, use_cache=False)
+    dataloader.preprocess_data()
+    return dataloader
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--new-rows', type=int, default=2_000, help='lignes de la nouvelle cérémonie')
+    args = parser.parse_args()
+
+    source = pd.read_csv(CSV_PATH)
+    print(f"{'lignes':>10} {'modification':<12} {'rechargement':>14} {'refresh':>12} {'années modifiées'}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            base = os.path.join(tmp, f'oscars_{n_rows}.csv')
+            generator = DatasetGenerator(source, n_rows, 1928, 2025)
+            generator.write(base)
+            new_rows = generator.chunk(0, args.new_rows).assign(Year_Ceremony=2026)
+            path = os.path.join(tmp, 'oscars.csv')
+
+            # Ajout des lignes d'une nouvelle année en fin de fichier
+            shutil.copy(base, path)
+            dataloader = full_reload(path)
+            dataloader.track_source()
+            with open(path, 'a') as f:
+                new_rows.to_csv(f, header=False, index=False)
+            reload_time, _ = timed(lambda: full_reload(path))
+            refresh_time, changed = timed(dataloader.refresh)
+            print(f'{n_rows:>10,} {"ajout":<12} {format_time(reload_time):>14} {format_time(refresh_time):>12} {changed}')
+
+            # Réécriture du fichier : une année existante modifiée
+            data = pd.read_csv(path)
+            data.loc[data['Year_Ceremony'] == 2000, 'Gender'] = 'Female'
+            data.to_csv(path, index=False)
+            reload_time, _ = timed(lambda: full_reload(path))
+            refresh_time, changed = timed(dataloader.refresh)
+            print(f'{n_rows:>10,} {"réécriture":<12} {format_time(reload_time):>14} {format_time(refresh_time):>12} {changed}')
+
+
+if __name__ == '__main__':
+    main()
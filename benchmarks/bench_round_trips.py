@@ -0,0 +1,133 @@
+"""
+Compte les allers-retours serveur déclenchés par une interaction (déplacement d'un slider,
+changement d'onglet...) en rejouant la logique du renderer Dash contre le serveur Flask de l'application :
+un callback dont une entrée est la sortie d'un autre callback en attente attend que celui-ci réponde,
+puis n'est exécuté qu'une fois. Les callbacks exécutés dans le navigateur (clientside) ne comptent pas.
+
+    python -m benchmarks.bench_round_trips
+    OSCARS_CLIENTSIDE_LINE=1 OSCARS_CLIENTSIDE_AREA=1 python -m benchmarks.bench_round_trips
+"""
+import copy
+import json
+import os
+
+# Les requêtes sont comptées par /stats/requests, désactivé par défaut
+os.environ['OSCARS_REQUEST_STATS'] = '1'
+
+from benchmarks.common import ROOT  # noqa: F401,E402 (ajoute la racine du dépôt au chemin)
+import app as dash_app  # noqa: E402
+
+# Interactions simulées : (description, propriété modifiée, nouvelle valeur)
+INTERACTIONS = [
+    ('Slider figure 1', 'year-slider_fig_1.value', [1950, 2000]),
+    ('Slider figure 2', 'year-slider_fig_2.value', [1950, 2000]),
+    ('Slider figure 3', 'year-slider_fig_3.value', [1950, 2000]),
+    ('Slider figure 4', 'year-slider_fig_4.value', [1950, 2000]),
+    ('Onglet figure 1', 'tabs_fig_1.value', 'Gender'),
+    ('Onglet figure 3', 'tabs_fig_3.value', 'Gender'),
+    ('Onglet figure 4', 'tabs_fig_4.value', 'Gender'),
+    ('Échelle fig. 3', 'scale-selector_fig_3.value', 'log'),
+    ('Granularité fig. 4', 'granularity-selector_fig_4.value', 10),
+    ('Sélection fig. 4', 'category-checklist_fig_4.value', ['White', 'Black']),
+]
+
+
+def parse_outputs(output):
+    """'..a.value...b.figure..' -> ['a.value', 'b.figure'] ; 'a.value' -> ['a.value']"""
+    if output.startswith('..'):
+        return output[2:-2].split('...')
+    return [output]
+
+
+def collect_props(node, state):
+    """Parcourt le layout sérialisé et relève les propriétés de chaque composant ayant un id."""
+    if isinstance(node, list):
+        for child in node:
+            collect_props(child, state)
+    elif isinstance(node, dict) and 'props' in node:
+        props = node['props']
+        if 'id' in props:
+            for prop, value in props.items():
+                state[f"{props['id']}.{prop}"] = value
+        collect_props(props.get('children'), state)
+
+
+class RendererSimulation():
+
+    def __init__(self, client):
+        self.client = client
+        self.callbacks = client.get('/_dash-dependencies').get_json()
+        self.layout_state = {}
+        collect_props(client.get('/_dash-layout').get_json(), self.layout_state)
+
+    def _request(self, callback, state, changed):
+        outputs = parse_outputs(callback['output'])
+        as_dicts = [dict(zip(('id', 'property'), out.rsplit('.', 1))) for out in outputs]
+        payload = {
+            'output': callback['output'],
+            'outputs': as_dicts if len(as_dicts) > 1 else as_dicts[0],
+            'inputs': [dict(inp, value=state.get(f"{inp['id']}.{inp['property']}")) for inp in callback['inputs']],
+            'state': [dict(st, value=state.get(f"{st['id']}.{st['property']}")) for st in callback['state']],
+            'changedPropIds': sorted(changed),
+        }
+        response = self.client.post('/_dash-update-component', data=json.dumps(payload),
+                                    content_type='application/json')
+        if response.status_code == 204:
+            return {}
+        updated = {}
+        for component_id, props in response.get_json()['response'].items():
+            for prop, value in props.items():
+                updated[f'{component_id}.{prop}'] = value
+        return updated
+
+    def interact(self, prop, value):
+        """Applique une interaction et retourne le nombre de requêtes de callback envoyées."""
+        state = copy.deepcopy(self.layout_state)
+        state[prop] = value
+        changed = {prop}
+        pending = {}  # index du callback -> propriétés ayant changé
+        self._trigger(changed, pending, source=None)
+        n_requests = 0
+
+        while pending:
+            pending_outputs = {out: index for index in pending for out in parse_outputs(self.callbacks[index]['output'])}
+            # Un callback attend tant qu'une de ses entrées est la sortie d'un autre callback en attente
+            ready = [index for index in pending
+                     if not any(pending_outputs.get(f"{inp['id']}.{inp['property']}", index) != index
+                                for inp in self.callbacks[index]['inputs'])]
+            index = ready[0] if ready else next(iter(pending))
+            changed_inputs = pending.pop(index)
+            if self.callbacks[index].get('clientside_function'):
+                # Exécuté dans le navigateur : ses sorties n'alimentent pas d'autre callback serveur
+                continue
+            updated = self._request(self.callbacks[index], state, changed_inputs)
+            n_requests += 1
+            state.update(updated)
+            self._trigger(set(updated), pending, source=index)
+
+        return n_requests
+
+    def _trigger(self, changed, pending, source):
+        for index, callback in enumerate(self.callbacks):
+            # Un callback ne se redéclenche pas sur ses propres sorties
+            if index == source:
+                continue
+            inputs = {f"{inp['id']}.{inp['property']}" for inp in callback['inputs']}
+            if inputs & changed:
+                pending.setdefault(index, set()).update(inputs & changed)
+
+
+def main():
+    client = dash_app.app.server.test_client()
+    simulation = RendererSimulation(client)
+
+    print(f"{'Interaction':<20} {'requêtes':>9} {'compteur serveur':>17}")
+    for name, prop, value in INTERACTIONS:
+        before = client.get('/stats/requests').get_json()['total']
+        n_requests = simulation.interact(prop, value)
+        after = client.get('/stats/requests').get_json()['total']
+        print(f'{name:<20} {n_requests:>9} {after - before:>17}')
+
+
+if __name__ == '__main__':
+    main()
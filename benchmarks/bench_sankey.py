@@ -0,0 +1,89 @@
+"""
+Temps de construction du Sankey (figure 2) : ancienne version (trois copies du DataFrame,
+value_counts sur les valeurs et boucle Python sur les catégories), version sur les codes du
+DataFrame filtré, et version à partir des comptes cumulés du cube (sans filtrage).
+
+    python -m benchmarks.bench_sankey [--repeat 3]
+"""
+import argparse
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader, generate_color_dict
+import figures.figure_2 as figure_2
+
+COLUMN = 'Race or Ethnicity'
+
+
+def legacy_sankey(df, demographic_column):
+    """Ancienne version de plot_sankey_chart, conservée comme référence."""
+    nominees_df = df.copy()
+    winners_df = df[df["Win_Oscar?"] == True].copy()  # noqa: E712
+    losers_df = df[df["Win_Oscar?"] == False].copy()  # noqa: E712
+    categories = nominees_df[demographic_column].unique()
+    nominee_counts = nominees_df[demographic_column].value_counts()
+    winner_counts = winners_df[demographic_column].value_counts()
+    loser_counts = losers_df[demographic_column].value_counts()
+    winner_percentages = {}
+    for cat in categories:
+        total = nominee_counts.get(cat, 0)
+        winner_percentages[cat] = (winner_counts.get(cat, 0) / total) * 100 if total > 0 else 0
+    labels = ([f"{cat}" for cat in categories] +
+              [f"Gagnants {cat} ({winner_percentages[cat]:.1f}%)" for cat in categories] + ["Perdants"])
+    label_indices = {label: i for i, label in enumerate(labels)}
+    color_dict = generate_color_dict(categories, colorscale_name='Oranges')
+    winner_links, loser_links = [], []
+    for cat in categories:
+        if cat in nominee_counts:
+            if cat in winner_counts and winner_counts[cat] > 0:
+                winner_links.append((label_indices[f"{cat}"],
+                                     label_indices[f"Gagnants {cat} ({winner_percentages[cat]:.1f}%)"],
+                                     winner_counts[cat], color_dict[cat]))
+            if cat in loser_counts and loser_counts[cat] > 0:
+                loser_links.append((label_indices[f"{cat}"], label_indices["Perdants"], loser_counts[cat], "lightgray"))
+    source, target, value, link_colors = map(list, zip(*(loser_links + winner_links))) if loser_links + winner_links \
+        else ([], [], [], [])
+    fig = go.Figure(data=[go.Sankey(
+        node=dict(pad=20, thickness=20, label=labels, color=["#d9d9d9"] * len(labels),
+                  hovertemplate="%{label} : %{value}<extra></extra>"),
+        link=dict(source=source, target=target, value=value, color=link_colors,
+                  hovertemplate="%{source.label} → %{target.label}: %{value}<extra></extra>"))])
+    fig.update_layout(font=dict(family="Jost", size=14), plot_bgcolor='rgba(0,0,0,0)',
+                      paper_bgcolor='rgba(0,0,0,0)', margin=dict(l=30, r=30, t=30, b=30))
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    raw = load_raw()
+    sankey = figure_2.SankeyDemographicChart()
+
+    print(f"{'lignes':>9} {'ancien':>10} {'codes':>10} {'cube':>10} {'gain':>8}")
+    for n_rows in [len(raw), 233_100, 2_331_000]:
+        dataloader = DataLoader()
+        dataloader.data = scale_dataset(raw, n_rows)
+        dataloader.preprocess_data()
+        df = dataloader.filter_data(1950, 2000)
+
+        def from_cube():
+            return sankey.plot_sankey_counts(*dataloader.get_winner_counts(1950, 2000, COLUMN))
+
+        expected = pio.to_json(legacy_sankey(df, COLUMN))
+        assert expected == pio.to_json(sankey.plot_sankey_chart(df, COLUMN)) == pio.to_json(from_cube())
+
+        # Le filtrage fait partie du coût des versions sur le DataFrame
+        legacy_time = best_time(lambda: legacy_sankey(dataloader.filter_data(1950, 2000), COLUMN), repeat=args.repeat)
+        codes_time = best_time(lambda: sankey.plot_sankey_chart(dataloader.filter_data(1950, 2000), COLUMN),
+                               repeat=args.repeat)
+        cube_time = best_time(from_cube, repeat=args.repeat)
+        print(f'{n_rows:>9} {format_time(legacy_time):>10} {format_time(codes_time):>10} {format_time(cube_time):>10} '
+              f'{legacy_time / cube_time:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
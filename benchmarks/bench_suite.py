@@ -0,0 +1,231 @@
+"""
+Suite de benchmarks des figures et de DataLoader, avec sortie JSON pour comparer les versions.
+
+Pour chaque taille de jeu de données (CSV livré, puis agrandi 10x, 100x, 1000x), chaque onglet
+démographique, chaque filtre de gagnant et plusieurs plages d'années, mesure séparément les étapes
+de construction de chaque figure, comme dans les callbacks de app.py :
+    filter     : DataLoader.filter_data
+    aggregate  : comptes de la figure (distribution de la colonne, comptes par année...)
+    figure     : construction de la figure Plotly
+    to_json    : sérialisation de la figure
+Le stacked area chart est mesuré pour chaque granularité (1, 5, 10). Les temps de chargement
+(load_data, preprocess_data) et de chaque méthode de DataLoader sont relevés par taille.
+
+    python -m benchmarks.bench_suite [--scales 1 10 100 1000] [--repeat 3] [--output resultats.json]
+
+Le JSON est écrit sur la sortie standard (ou dans --output) ; la progression est affichée sur
+la sortie d'erreur. Deux résultats se comparent case par case (mêmes clés hors mesures).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from benchmarks.common import ROOT, best_time, load_raw, scale_dataset
+from helper import DEMOGRAPHIC_COLUMNS, DataLoader
+import figures.figure_1 as figure_1
+import figures.figure_2 as figure_2
+import figures.figure_3 as figure_3
+import figures.figure_4 as figure_4
+
+SCALES = [1, 10, 100, 1000]
+WINNER_FILTERS = {'winners': True, 'all': None}
+YEAR_RANGES = [(1928, 2025), (1950, 2000), (2000, 2025), (2015, 2015)]
+GRANULARITIES = [1, 5, 10]
+FIGURES = ['waffle', 'sankey', 'line', 'stacked_area']
+HEIGHT = 700
+
+
+def default_selection(distribution, include_other):
+    """Sélection par défaut de la checklist : les 5 premières catégories (et « Other »)."""
+    selected = list(distribution.keys())[:5]
+    if include_other and len(distribution) > 5:
+        selected.append('Other')
+    return selected
+
+
+def figure_stages(dataloader, figure, column, is_winner, year_range, granularity):
+    """
+    Étapes de construction d'une figure, dans l'ordre : {étape: fonction sans argument}.
+    Chaque étape utilise le résultat de la précédente, calculé une fois avant d'être chronométrée.
+    """
+    start, end = year_range
+    stages = {'filter': lambda: dataloader.filter_data(start, end, is_winner=is_winner)}
+    df = stages['filter']()
+
+    if figure == 'waffle':
+        def aggregate():
+            selected = default_selection(dataloader.get_column_distribution(df, column), include_other=False)
+            return dataloader.get_yearly_counts(df[['Year_Ceremony', column]], sorted(selected, key=str))
+        stages['aggregate'] = aggregate
+        counts = aggregate()
+        stages['figure'] = lambda: figure_1.WaffleChart().plot_scatter_waffle_chart(counts, df, column, height=HEIGHT)
+    elif figure == 'sankey':
+        # Le Sankey compare toujours gagnants et nominés : les comptes viennent directement du cube
+        del stages['filter']
+        stages['aggregate'] = lambda: dataloader.get_winner_counts(start, end, column)
+        counts = stages['aggregate']()
+        stages['figure'] = lambda: figure_2.SankeyDemographicChart().plot_sankey_counts(*counts)
+    elif figure == 'line':
+        selected = default_selection(dataloader.get_column_distribution(df, column), include_other=True)
+        plotted = [key for key in selected if key != 'Other']
+
+        def aggregate():
+            dataloader.get_column_distribution(df, column)
+            return dataloader.get_cumulative_yearly_counts(df[['Year_Ceremony', column]], plotted)
+        stages['aggregate'] = aggregate
+        counts = aggregate()
+        stages['figure'] = lambda: figure_3.LineChart().plot_line_chart(counts, column, plotted, df, height=HEIGHT)
+    else:
+        def aggregate():
+            selected = default_selection(dataloader.get_column_distribution(df, column), include_other=True)
+            return dataloader.get_yearly_counts(df[['Year_Ceremony', column]], selected,
+                                                time_granularity=granularity)
+        stages['aggregate'] = aggregate
+        counts = aggregate()
+        stages['figure'] = lambda: figure_4.StackedAreaChart().plot_stacked_area_chart(counts, height=HEIGHT)
+
+    fig = stages['figure']()
+    stages['to_json'] = fig.to_json
+    return stages
+
+
+def bench_figures(dataloader, scale, args):
+    """Mesures de chaque figure pour toutes les combinaisons de paramètres."""
+    results = []
+    for figure in args.figures:
+        for column in args.columns:
+            for winner_filter, is_winner in WINNER_FILTERS.items():
+                # Le Sankey ne dépend pas du filtre de gagnant
+                if figure == 'sankey' and is_winner is None:
+                    continue
+                for year_range in YEAR_RANGES:
+                    for granularity in (GRANULARITIES if figure == 'stacked_area' else [None]):
+                        stages = figure_stages(dataloader, figure, column, is_winner, year_range, granularity)
+                        timings = {name: best_time(func, repeat=args.repeat) for name, func in stages.items()}
+                        results.append({
+                            'scale': scale,
+                            'figure': figure,
+                            'column': column,
+                            'winner_filter': None if figure == 'sankey' else winner_filter,
+                            'year_range': list(year_range),
+                            'granularity': granularity,
+                            'seconds': timings,
+                            'payload_bytes': len(stages['to_json']()),
+                        })
+            print(f'  {figure:<13} {column}', file=sys.stderr)
+    return results
+
+
+def bench_methods(dataloader, scale, args):
+    """Mesures des méthodes d'agrégation de DataLoader, sur toutes les années et tous les nominés."""
+    start, end = YEAR_RANGES[0]
+    df = dataloader.filter_data(start, end)
+    # Méthodes qui ne dépendent pas de la colonne
+    methods = {
+        'filter_data': lambda: dataloader.filter_data(start, end),
+        'get_unique_distribution': lambda: dataloader.get_unique_distribution(df),
+    }
+    results = [{'scale': scale, 'method': name, 'column': None, 'seconds': best_time(func, repeat=args.repeat)}
+               for name, func in methods.items()]
+    for column in args.columns:
+        data = df[['Year_Ceremony', column]]
+        methods = {
+            'get_column_distribution': lambda: dataloader.get_column_distribution(df, column),
+            'get_winner_counts': lambda: dataloader.get_winner_counts(start, end, column),
+            'get_yearly_counts': lambda: dataloader.get_yearly_counts(data),
+            'get_cumulative_yearly_counts': lambda: dataloader.get_cumulative_yearly_counts(data),
+            'get_yearly_distribution': lambda: dataloader.get_yearly_distribution(data),
+            'get_cumulative_yearly_distribution': lambda: dataloader.get_cumulative_yearly_distribution(data),
+        }
+        for name, func in methods.items():
+            results.append({'scale': scale, 'method': name, 'column': column,
+                            'seconds': best_time(func, repeat=args.repeat)})
+    return results
+
+
+def bench_loading(raw, scale, tmp):
+    """Chargement du CSV agrandi : lecture et prétraitement, puis rechargement depuis le cache binaire."""
+    path = os.path.join(tmp, f'oscars_x{scale}.csv')
+    scale_dataset(raw, len(raw) * scale).to_csv(path, index=False)
+    dataloader = DataLoader()
+    timings = {}
+    timings['load_data'] = best_time(lambda: dataloader.load_data(path), repeat=1)
+    timings['preprocess_data'] = best_time(dataloader.preprocess_data, repeat=1)
+
+    def load_cached():
+        dataloader.load_data(path)
+        dataloader.preprocess_data()
+    timings['load_data_cached'] = best_time(load_cached, repeat=1)
+    csv_bytes = os.path.getsize(path)
+    os.remove(path)
+    return {'scale': scale, 'csv_bytes': csv_bytes, 'seconds': timings}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--figures', nargs='+', choices=FIGURES, default=FIGURES)
+    parser.add_argument('--columns', nargs='+', choices=DEMOGRAPHIC_COLUMNS, default=DEMOGRAPHIC_COLUMNS)
+    parser.add_argument('--no-loading', dest='loading', action='store_false',
+                        help="ne pas mesurer l'écriture et la relecture des CSV agrandis")
+    parser.add_argument('--output', help='fichier JSON de sortie (par défaut : sortie standard)')
+    args = parser.parse_args()
+
+    raw = load_raw()
+    report = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plotly': plotly.__version__,
+            'repeat': args.repeat,
+            'base_rows': len(raw),
+        },
+        'datasets': [],
+        'loading': [],
+        'methods': [],
+        'figures': [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            print(f'x{scale} ({len(raw) * scale:,} lignes)', file=sys.stderr)
+            dataloader = DataLoader()
+            dataloader.data = scale_dataset(raw, len(raw) * scale)
+            dataloader.preprocess_data()
+            report['datasets'].append({'scale': scale, 'n_rows': len(dataloader.data)})
+            if args.loading:
+                report['loading'].append(bench_loading(raw, scale, tmp))
+            report['methods'].extend(bench_methods(dataloader, scale, args))
+            report['figures'].extend(bench_figures(dataloader, scale, args))
+
+    output = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
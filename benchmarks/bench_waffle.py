@@ -0,0 +1,66 @@
+"""
+Temps de construction du waffle chart selon le nombre de catégories et de lignes, comparé à
+l'ancienne implémentation (un filtrage et trois .assign par catégorie, mises à jour des axes dans la boucle).
+
+    python -m benchmarks.bench_waffle [--repeat 3]
+"""
+import argparse
+import math
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from benchmarks.common import best_time, format_time, load_raw, scale_dataset
+from helper import DataLoader
+import figures.figure_1 as figure_1
+
+CATEGORY = 'Religion'
+
+
+def legacy_plot(distribution, df, category):
+    """Ancienne boucle par catégorie, conservée comme référence (rendu SVG, sans agrégation)."""
+    fig = make_subplots(rows=1, cols=len(distribution), horizontal_spacing=0.01, vertical_spacing=0.01)
+    y_max = math.ceil(max(distribution.values()) // 10) + 1
+    for i, key in enumerate(distribution):
+        sub_df = (df[df[category] == key]
+                  .assign(index=lambda x: range(len(x)))
+                  .assign(x=lambda x: x['index'] % 10)
+                  .assign(y=lambda x: x['index'] // 10))
+        fig.add_trace(go.Scatter(x=sub_df['x'], y=sub_df['y'], mode='markers',
+                                 marker=dict(size=min(400/y_max, 20), color=['#000000'] * len(sub_df)),
+                                 customdata=sub_df[['Name', 'Category', 'Film', 'Year_Ceremony']]),
+                      row=1, col=i+1)
+        fig.add_annotation(x=4.5, y=-1.5, xref=f'x{i+1}', yref=f'y{i+1}', text=key, showarrow=False)
+        fig.update_xaxes(range=[-1, 10], visible=False, row=1, col=i+1)
+        fig.update_yaxes(range=[-3, y_max+0.5], visible=False, row=1, col=i+1)
+        fig.update_layout(showlegend=False)
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    raw = load_raw()
+    # Sans agrégation, pour comparer le même nombre de points
+    wchart = figure_1.WaffleChart(max_rows=10**9)
+
+    print(f"{'lignes':>8} {'catégories':>11} {'ancien':>12} {'vectorisé':>12} {'gain':>8}")
+    for n_rows in [len(raw), 10_000, 50_000]:
+        dataloader = DataLoader()
+        dataloader.data = scale_dataset(raw, n_rows)
+        dataloader.preprocess_data()
+        df = dataloader.filter_data(1928, 2025)
+        distribution_dict, _ = dataloader.get_unique_distribution(df)
+        for n_categories in [2, 5, 10, 20]:
+            distribution = dict(list(distribution_dict[CATEGORY].items())[:n_categories])
+            legacy_time = best_time(lambda: legacy_plot(distribution, df, CATEGORY), repeat=args.repeat)
+            new_time = best_time(lambda: wchart.plot_scatter_waffle_chart(distribution, df, CATEGORY, render_mode='svg'),
+                                 repeat=args.repeat)
+            print(f'{n_rows:>8} {n_categories:>11} {format_time(legacy_time):>12} {format_time(new_time):>12} '
+                  f'{legacy_time / new_time:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
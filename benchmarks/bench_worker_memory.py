@@ -0,0 +1,116 @@
+"""
+Mémoire par worker selon la façon dont les données sont chargées : cache pickle (DataFrame avec
+colonnes texte de type objet, copié dans chaque processus) ou dossier colonnaire projeté en mémoire
+(DataLoader.load_columnar, pages partagées entre les processus).
+
+Lance N processus indépendants qui chargent le même jeu de données agrandi (noms et films
+distincts d'une copie à l'autre), puis relève dans /proc/<pid>/smaps_rollup (Linux) :
+    RSS : mémoire résidente, pages partagées comprises
+    PSS : pages partagées réparties entre les processus qui les utilisent
+    USS : pages privées du processus
+
+    python -m benchmarks.bench_worker_memory [--workers 4] [--rows 1000000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import ROOT, load_raw, scale_dataset
+from helper import DataLoader
+
+
+def distinct_dataset(raw, n_rows):
+    """Jeu agrandi dont les noms et films sont distincts d'une copie à l'autre, comme de vraies nouvelles lignes."""
+    df = scale_dataset(raw, n_rows)
+    copy_index = pd.Series(np.arange(n_rows) // len(raw)).astype(str)
+    df['Name'] = df['Name'] + ' #' + copy_index
+    df['Film'] = df['Film'] + ' #' + copy_index
+    return df
+
+
+def touch_columns(data):
+    """Lit toutes les pages de toutes les colonnes, comme le ferait un parcours complet."""
+    total = 0
+    for _, series in data.items():
+        values = series.cat.codes if isinstance(series.dtype, pd.CategoricalDtype) else series
+        total += int(np.asarray(values, dtype=np.int64).sum()) if values.dtype != object else len(values)
+    return total
+
+
+def worker(mode, path):
+    """Processus mesuré : charge les données, les parcourt, puis attend d'être arrêté."""
+    dataloader = DataLoader()
+    if mode == 'columnar':
+        dataloader.load_columnar(path)
+    elif mode == 'pickle':
+        dataloader.data = pd.read_pickle(path)
+        dataloader._preprocessed = True
+    if dataloader.data is not None:
+        dataloader.preprocess_data()
+        touch_columns(dataloader.data)
+    print('ready', flush=True)
+    sys.stdin.read()
+
+
+def memory(pid):
+    """(RSS, PSS, USS) en octets."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    return fields['Rss'], fields['Pss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def measure(mode, path, n_workers):
+    """Lance n_workers processus et retourne leurs mesures mémoire."""
+    processes = [subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_worker_memory', '--worker', mode, path],
+                                  cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(n_workers)]
+    try:
+        for process in processes:
+            assert process.stdout.readline().strip() == 'ready'
+        return [memory(process.pid) for process in processes]
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataloader = DataLoader()
+        dataloader.data = distinct_dataset(load_raw(), args.rows)
+        dataloader.preprocess_data()
+        pickle_path = os.path.join(tmp, 'data.pkl')
+        columnar_path = os.path.join(tmp, 'data.columns')
+        dataloader.data.to_pickle(pickle_path)
+        dataloader.write_columnar(columnar_path)
+
+        print(f'{args.rows:,} lignes, {args.workers} workers (Mo par worker, moyenne)')
+        print(f"{'chargement':<12} {'RSS':>8} {'PSS':>8} {'USS':>8} {'PSS total':>10}")
+        # 'vide' : interpréteur et bibliothèques seuls, sans données
+        for mode, path in [('vide', '-'), ('pickle', pickle_path), ('columnar', columnar_path)]:
+            results = np.array(measure(mode, path, args.workers)) / 1e6
+            rss, pss, uss = results.mean(axis=0)
+            print(f'{mode:<12} {rss:8.1f} {pss:8.1f} {uss:8.1f} {results[:, 1].sum():10.1f}')
+
+
+if __name__ == '__main__':
+    main()
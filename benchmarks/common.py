@@ -0,0 +1,41 @@
+"""
+Utilitaires partagés par les benchmarks.
+
+Les benchmarks se lancent depuis la racine du dépôt, par exemple :
+    python -m benchmarks.bench_preprocess
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+CSV_PATH = os.path.join(ROOT, 'assets', 'The_Oscar_Award_Demographics_1928-2025 - The_Oscar_Award_Demographics_1928-2025_v3.csv')
+
+
+def load_raw(path=CSV_PATH):
+    """Charge le CSV brut, sans prétraitement."""
+    return pd.read_csv(path)
+
+
+def scale_dataset(df, n_rows):
+    """Agrandit (ou réduit) un DataFrame à n_rows lignes en répétant ses lignes."""
+    return df.iloc[np.arange(n_rows) % len(df)].reset_index(drop=True)
+
+
+def best_time(func, repeat=5, number=1):
+    """Meilleur temps (en secondes) d'un appel de func parmi `repeat` mesures."""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:8.1f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:8.2f} ms'
+    return f'{seconds:8.2f} s '
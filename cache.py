@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+
+# Politiques d'éviction supportées :
+# - 'lru' : on retire l'entrée utilisée le moins récemment
+# - 'fifo' : on retire l'entrée insérée le plus anciennement
+EVICTION_POLICIES = ('lru', 'fifo')
+
+# Registre des caches nommés, pour exposer leurs compteurs
+CACHES = {}
+
+
+class BoundedCache():
+    """
+    Cache borné et thread-safe avec compteurs de succès (hits) et d'échecs (misses).
+
+    Args:
+        maxsize (int): Nombre maximal d'entrées conservées
+        policy (str): Politique d'éviction, 'lru' ou 'fifo'
+    """
+
+    def __init__(self, maxsize=128, policy='lru'):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Politique d'éviction inconnue : {policy} (attendu : {EVICTION_POLICIES})")
+        if maxsize < 1:
+            raise ValueError("La taille du cache doit être d'au moins 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Incrémentée à chaque invalidation : un résultat calculé avant ne doit plus être mémorisé
+        self.generation = 0
+
+    def get(self, key):
+        """Retourne (trouvé, valeur) pour la clé donnée."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._entries.move_to_end(key)
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, generation=None):
+        """
+        Mémorise une valeur. Si `generation` est fourni et qu'une invalidation a eu lieu depuis
+        (valeur calculée sur des données remplacées entre-temps), la valeur est ignorée.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._entries[key] = value
+                if self.policy == 'lru':
+                    self._entries.move_to_end(key)
+                return
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def invalidate(self, predicate):
+        """Retire les entrées dont la clé vérifie `predicate(clé)` et retourne leur nombre."""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self.generation += 1
+            return len(stale)
+
+    def stats(self):
+        """Compteurs du cache, lisibles par un opérateur."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'policy': self.policy,
+                'maxsize': self.maxsize,
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
+
+
+def memoize(name, key, maxsize=128, policy='lru'):
+    """
+    Décorateur qui mémorise le résultat d'une fonction dans un cache nommé.
+
+    Args:
+        name (str): Nom du cache dans le registre CACHES
+        key (callable): Fonction recevant les mêmes arguments que la fonction décorée
+                        et retournant une clé normalisée et hashable
+        maxsize (int): Nombre maximal d'entrées
+        policy (str): Politique d'éviction ('lru' ou 'fifo')
+    """
+    cache = BoundedCache(maxsize=maxsize, policy=policy)
+    CACHES[name] = cache
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            found, value = cache.get(cache_key)
+            if found:
+                return value
+            generation = cache.generation
+            value = func(*args, **kwargs)
+            cache.put(cache_key, value, generation=generation)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats():
+    """Retourne les compteurs de tous les caches enregistrés."""
+    return {name: cache.stats() for name, cache in CACHES.items()}
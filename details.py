@@ -0,0 +1,107 @@
+import numpy as np
+from flask import abort, jsonify, request
+
+from cache import memoize
+from figures.figure_1 import MAX_PEOPLE
+from helper import DEMOGRAPHIC_COLUMNS, get_codes
+
+# Durée pendant laquelle le navigateur peut réutiliser une réponse sans revalidation (en secondes)
+DETAILS_MAX_AGE = 600
+DETAILS_CACHE_SIZE = 1024
+# Positions des membres de chaque sous-graphique du waffle chart (un tableau par figure et catégorie)
+MEMBERS_CACHE_SIZE = 64
+
+
+def cached_response(payload):
+    """Réponse JSON réutilisable par le navigateur, avec ETag pour les requêtes conditionnelles."""
+    response = jsonify(payload)
+    response.cache_control.public = True
+    response.cache_control.max_age = DETAILS_MAX_AGE
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def matching_positions(rows, column, value):
+    """
+    Positions (dans l'ordre du DataFrame) des lignes dont la colonne vaut `value`. La comparaison se
+    fait sur les codes : la valeur reçue (texte) est cherchée dans la table des étiquettes.
+    """
+    codes, labels = get_codes(rows[column])
+    matches = [code for code, label in enumerate(labels) if str(label) == value]
+    return np.flatnonzero(np.isin(codes, matches))
+
+
+def parse_is_winner(value):
+    """Filtre de gagnant d'une requête : 'true', 'false' ou '' (tous), 'invalide' sinon."""
+    return {'true': True, 'false': False, '': None}.get(value, 'invalide')
+
+
+def register_detail_routes(server, dataloader):
+    """
+    Enregistre les routes JSON qui fournissent le détail des infobulles chargées à la demande :
+        /api/details/waffle?start=1928&end=2025&column=Gender&value=Female&is_winner=&cell=3&cell_size=250
+        /api/details/cell?year=1990&column=Gender&value=Female&is_winner=true
+
+    Un point du waffle chart est désigné par la requête de sa figure (années, filtre de gagnant),
+    son sous-graphique (colonne et valeur) et l'indice de sa cellule : les membres sont retrouvés
+    sur le serveur, la figure n'a pas à porter les identifiants des personnes.
+    """
+
+    @memoize('details-members', maxsize=MEMBERS_CACHE_SIZE,
+             key=lambda start, end, column, value, is_winner: (start, end, column, value, is_winner))
+    def get_members(start, end, column, value, is_winner):
+        # Seules les positions sont gardées : sans filtre de gagnant, les lignes filtrées sont une copie
+        rows = dataloader.filter_data(start, end, is_winner=is_winner)
+        return matching_positions(rows, column, value)
+
+    @memoize('details-waffle', maxsize=DETAILS_CACHE_SIZE,
+             key=lambda start, end, column, value, is_winner, cell, cell_size: (
+                 start, end, column, value, is_winner, cell, cell_size))
+    def get_waffle_cell(start, end, column, value, is_winner, cell, cell_size):
+        # Même répartition que WaffleChart._grid_positions : les membres du sous-graphique, dans
+        # l'ordre des données filtrées, par groupes de cell_size
+        members = get_members(start, end, column, value, is_winner)
+        cell_members = members[cell * cell_size:(cell + 1) * cell_size]
+        sample = dataloader.filter_data(start, end, is_winner=is_winner).iloc[cell_members[:MAX_PEOPLE]]
+        people = [{'name': str(name), 'category': str(category), 'film': str(film), 'year': int(year)}
+                  for name, category, film, year in zip(sample['Name'], sample['Category'],
+                                                        sample['Film'], sample['Year_Ceremony'])]
+        return {'count': len(cell_members), 'people': people}
+
+    @memoize('details-cell', maxsize=DETAILS_CACHE_SIZE,
+             key=lambda year, column, value, is_winner: (year, column, value, is_winner))
+    def get_cell(year, column, value, is_winner):
+        rows = dataloader.filter_data(year, year, is_winner=is_winner)
+        rows = rows.iloc[matching_positions(rows, column, value)]
+        # Les 3 premiers exemples, dans l'ordre des données
+        examples = [{'name': str(name), 'film': str(film)}
+                    for name, film in zip(rows['Name'].head(3), rows['Film'].head(3))]
+        return {'count': len(rows), 'examples': examples}
+
+    @server.route('/api/details/waffle')
+    def waffle_details():
+        column = request.args.get('column')
+        value = request.args.get('value')
+        is_winner = parse_is_winner(request.args.get('is_winner', ''))
+        try:
+            start, end, cell, cell_size = (int(request.args.get(name, ''))
+                                           for name in ('start', 'end', 'cell', 'cell_size'))
+        except ValueError:
+            abort(400)
+        if column not in DEMOGRAPHIC_COLUMNS or value is None or is_winner == 'invalide' \
+                or start > end or cell < 0 or cell_size < 1:
+            abort(400)
+        return cached_response(get_waffle_cell(start, end, column, value, is_winner, cell, cell_size))
+
+    @server.route('/api/details/cell')
+    def cell_details():
+        column = request.args.get('column')
+        value = request.args.get('value')
+        is_winner = parse_is_winner(request.args.get('is_winner', ''))
+        try:
+            year = int(request.args.get('year', ''))
+        except ValueError:
+            abort(400)
+        if column not in DEMOGRAPHIC_COLUMNS or value is None or is_winner == 'invalide':
+            abort(400)
+        return cached_response(get_cell(year, column, value, is_winner))
@@ -1,15 +1,31 @@
 import math 
 
 import numpy as np
-from plotly.subplots import make_subplots
+import pandas as pd
 import plotly.graph_objects as go
 
-from helper import TRANSPARENT, generate_color_dict
+from helper import TRANSPARENT, YearlyCounts, generate_color_dict
+
+# Au-delà de ce nombre de points, le rendu passe en WebGL (Scattergl) plutôt qu'en SVG
+WEBGL_THRESHOLD = 1000
+# Au-delà de ce nombre de lignes de 10 points dans une colonne, les points deviennent trop petits :
+# chaque point représente alors plusieurs personnes (cellules agrégées)
+MAX_ROWS = 50
+
+RENDER_MODES = ('auto', 'svg', 'webgl')
+
+# Espacement horizontal entre les colonnes du waffle chart (fraction de la largeur)
+HORIZONTAL_SPACING = 0.01
+
+# Nombre maximal de personnes listées dans l'infobulle d'une cellule agrégée (le nombre total de
+# personnes de la cellule est toujours affiché)
+MAX_PEOPLE = 20
 
 class WaffleChart():
 
-    def __init__(self):
-        pass
+    def __init__(self, webgl_threshold=WEBGL_THRESHOLD, max_rows=MAX_ROWS):
+        self.webgl_threshold = webgl_threshold
+        self.max_rows = max_rows
 
     def _get_z_matrix(self, total, values, n_cols=10):
         n_rows = math.ceil(total / n_cols)
@@ -65,73 +81,201 @@ class WaffleChart():
     #     return fig 
     
     
-    def plot_scatter_waffle_chart(self, distribution, df, category, font_size=16, font_family='Jost', height=700):
+    def plot_scatter_waffle_chart(self, distribution, df, category, font_size=16, font_family='Jost', height=700,
+                                  render_mode='auto', lazy_hover=False, year_range=None, is_winner=None):
+        """
+        Waffle chart en nuage de points : une colonne de 10 points de large par catégorie.
 
-        # distribution = distribution_dict[category]
-        fig = make_subplots(rows=1, cols=len(distribution),
-                            shared_yaxes=True, shared_xaxes=True,
-                            horizontal_spacing=0.01, vertical_spacing=0.01)
+        Args:
+            distribution: YearlyCounts des catégories affichées, dont les totaux sont triés par effectif
+                          décroissant, ou dictionnaire {catégorie: effectif} déjà trié
+            render_mode: 'svg' (go.Scatter), 'webgl' (go.Scattergl) ou 'auto' (WebGL au-delà de
+                         webgl_threshold points)
+            lazy_hover: Si True, les points ne portent que l'indice de leur cellule ; le détail est
+                        chargé au survol depuis /api/details/waffle
+            year_range, is_winner: Filtres appliqués à df, transmis au hover chargé à la demande
 
-        color_scale_dict = generate_color_dict(distribution.keys(), colorscale_name='Oranges')
+        Si la plus grande catégorie dépasse max_rows lignes, chaque point représente plusieurs
+        personnes et l'infobulle liste les personnes de la cellule.
+        """
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Mode de rendu inconnu : {render_mode} (attendu : {RENDER_MODES})")
+        if isinstance(distribution, YearlyCounts):
+            # sort the dictionary by value
+            distribution = dict(sorted(distribution.totals().items(), key=lambda item: item[1], reverse=True))
 
-        # scatter plot disque
-        fig = make_subplots(rows=1, cols=len(distribution), 
-                            horizontal_spacing=0.01, vertical_spacing=0.01)
+        # Nombre de personnes par point
+        max_count = max(distribution.values()) if distribution else 0
+        cell_size = max(1, math.ceil(max_count / (10 * self.max_rows)))
+        n_markers = sum(math.ceil(count / cell_size) for count in distribution.values())
+        use_webgl = render_mode == 'webgl' or (render_mode == 'auto' and n_markers > self.webgl_threshold)
+        scatter = go.Scattergl if use_webgl else go.Scatter
 
-        y_max = math.ceil(max(distribution.values()) // 10) + 1
+        color_scale_dict = generate_color_dict(distribution.keys(), colorscale_name='Oranges')
 
-        for i, (key, _) in enumerate(distribution.items()):
-            
-            sub_df = (df[df[category] == key]
-                .assign(index=lambda x: range(len(x)))
-                .assign(x=lambda x: x['index'] % 10)
-                .assign(y=lambda x: x['index'] // 10))
-        
-            fig.add_trace(go.Scatter(
-                x=sub_df['x'], y=sub_df['y'],
-                mode='markers',
-                marker=dict(
-                    size=min(400/y_max, 20),
-                    color=[color_scale_dict[key]] * len(sub_df),  # Assign unique color to each marker
-                    symbol='circle'  # Change to 'circle' if you want filled markers
-                ),
-                customdata=sub_df[['Name', 'Category', 'Film', 'Year_Ceremony']],
-                hovertemplate='Name: %{customdata[0]}<br>Category: %{customdata[1]}<br>Film: %{customdata[2]}<br>Year: %{customdata[3]} <extra></extra>'
-            ), row=1, col=i+1)
-
-            fig.add_annotation(x=4.5, y=-1.5, xref=f'x{i+1}', yref=f'y{i+1}',
-                            text=key, showarrow=False, 
-                                font_size=font_size, font_family=font_family)
-
-            # xlim et ylim 
-            fig.update_xaxes(range=[-1, 10], row=1, col=i+1)
-            fig.update_yaxes(range=[-3, y_max+0.5], row=1, col=i+1)
-
-            # remove axis
-            fig.update_xaxes(visible=False, row=1, col=i+1)
-            fig.update_yaxes(visible=False, row=1, col=i+1)
+        y_max = math.ceil(math.ceil(max_count / cell_size) // 10) + 1
+        marker_style = dict(size=min(400/y_max, 20), symbol='circle')
 
-            # remove legend
-            fig.update_layout(showlegend=False)
+        # Positions de toutes les personnes calculées en une seule passe
+        rows, subplot, cell = self._grid_positions(df, category, list(distribution), cell_size)
+        x, y = cell % 10, cell // 10
 
-            fig.update_layout(
-                hoverlabel=dict(
-                    bgcolor="white",
-                    font_size=font_size,
-                    font_family=font_family
-                )
-            )
+        traces = []
+        if lazy_hover:
+            traces = self._lazy_hover_traces(scatter, distribution, category, subplot, cell, x, y, marker_style,
+                                             color_scale_dict, cell_size, year_range, is_winner)
+        elif cell_size > 1:
+            # Une trace par sous-graphique, un point par cellule
+            groups = self._split_groups(subplot * (cell.max(initial=0) + 1) + cell)
+            group_subplots = np.array([subplot[group[0]] for group in groups], dtype=np.intp)
+            # Seules les MAX_PEOPLE premières personnes de chaque cellule sont listées : la taille de
+            # l'infobulle ne dépend pas du nombre de lignes
+            listed = [group[:MAX_PEOPLE] for group in groups]
+            shown = rows.iloc[np.concatenate(listed)] if listed else rows.iloc[:0]
+            people = ('• ' + shown['Name'].astype(str) + ' (' + shown['Category'].astype(str) + ', '
+                      + shown['Film'].astype(str) + ', ' + shown['Year_Ceremony'].astype(str) + ')').to_numpy()
+            starts = np.cumsum([0] + [len(group) for group in listed])
+            hovertexts = [self._cell_hovertext(len(group), people[start:end])
+                          for group, start, end in zip(groups, starts[:-1], starts[1:])]
+            for i, key in enumerate(distribution):
+                cells = np.flatnonzero(group_subplots == i)
+                first = np.array([groups[g][0] for g in cells], dtype=np.intp)
+                traces.append(scatter(
+                    x=x[first], y=y[first],
+                    mode='markers',
+                    marker=dict(marker_style, color=color_scale_dict[key]),
+                    hovertext=[hovertexts[g] for g in cells],
+                    hoverinfo='text',
+                    **self._axes(i)
+                ))
+        else:
+            # Une trace par (sous-graphique, catégorie de prix) : la catégorie passe dans le modèle
+            # d'infobulle au lieu d'être répétée pour chaque personne
+            award_codes, awards = pd.factorize(rows['Category'])
+            customdata = rows[['Name', 'Film', 'Year_Ceremony']].to_numpy(dtype=object)
+            keys = list(distribution)
+            for group in self._split_groups(subplot * len(awards) + award_codes):
+                i, award = subplot[group[0]], awards[award_codes[group[0]]]
+                traces.append(scatter(
+                    x=x[group], y=y[group],
+                    mode='markers',
+                    marker=dict(marker_style, color=color_scale_dict[keys[i]]),
+                    customdata=customdata[group],
+                    hovertemplate=f'Name: %{{customdata[0]}}<br>Category: {award}<br>Film: %{{customdata[1]}}<br>Year: %{{customdata[2]}} <extra></extra>',
+                    **self._axes(i)
+                ))
+        # Axes des sous-graphiques (une colonne par catégorie, comme make_subplots) et annotations,
+        # appliqués en un seul appel plutôt qu'à chaque itération
+        axes_layout = {}
+        n_cols = len(distribution)
+        width = (1 - HORIZONTAL_SPACING * (n_cols - 1)) / n_cols if n_cols else 1
+        for i in range(n_cols):
+            axes = self._axes(i)
+            start = i * (width + HORIZONTAL_SPACING)
+            axes_layout[self._axes(i, prefix='axis')['xaxis']] = dict(
+                anchor=axes['yaxis'], domain=[start, min(start + width, 1.0)], range=[-1, 10], visible=False)
+            axes_layout[self._axes(i, prefix='axis')['yaxis']] = dict(
+                anchor=axes['xaxis'], domain=[0.0, 1.0], range=[-3, y_max+0.5], visible=False)
+        annotations = [dict(x=4.5, y=-1.5, xref=f'x{i+1}', yref=f'y{i+1}',
+                            text=key, showarrow=False,
+                            font_size=font_size, font_family=font_family)
+                       for i, key in enumerate(distribution)]
+        if cell_size > 1:
+            annotations.append(dict(x=1, y=1, xref='paper', yref='paper', xanchor='right', yanchor='top',
+                                    text=f'1 point = {cell_size} personnes', showarrow=False,
+                                    font_size=font_size, font_family=font_family))
 
-        fig.update_layout(
+        # scatter plot disque
+        fig = go.Figure(data=traces, layout=dict(
+            annotations=annotations,
+            # remove legend
+            showlegend=False,
+            hoverlabel=dict(
+                bgcolor="white",
+                font_size=font_size,
+                font_family=font_family
+            ),
             height=height,  # Utiliser la hauteur passée en paramètre
             autosize=False,  # Désactiver l'autosize pour appliquer la hauteur fixe
             plot_bgcolor=TRANSPARENT, 
             paper_bgcolor=TRANSPARENT,
-            margin=dict(l=0, r=0, t=0, b=10)
-        )
+            margin=dict(l=0, r=0, t=0, b=10),
+            **axes_layout
+        ))
 
         return fig 
     
+    def _lazy_hover_traces(self, scatter, distribution, category, subplot, cell, x, y, marker_style,
+                           color_scale_dict, cell_size, year_range, is_winner):
+        """
+        Traces sans texte d'infobulle : customdata contient l'indice de la cellule de chaque point et
+        meta la requête de la figure (années, filtre de gagnant, sous-graphique, taille des cellules).
+        static/lazy_hover.js affiche les détails de la cellule récupérés auprès du serveur, qui
+        retrouve lui-même ses membres : la taille de la figure ne dépend pas du nombre de personnes.
+        """
+        start, end = year_range if year_range is not None else (None, None)
+        traces = []
+        for i, key in enumerate(distribution):
+            members = np.flatnonzero(subplot == i)
+            # Premier membre de chaque cellule (les cellules se suivent dans l'ordre des membres)
+            points = members[np.flatnonzero(np.diff(cell[members], prepend=-1))]
+            traces.append(scatter(
+                x=x[points], y=y[points],
+                mode='markers',
+                marker=dict(marker_style, color=color_scale_dict[key]),
+                customdata=cell[points],
+                hoverinfo='none',
+                meta={'lazy_hover': 'waffle', 'column': category, 'value': key, 'start': start, 'end': end,
+                      'is_winner': is_winner, 'cell_size': cell_size},
+                **self._axes(i)
+            ))
+        return traces
+
+    @staticmethod
+    def _cell_hovertext(count, people):
+        """Infobulle d'une cellule agrégée : nombre de personnes, puis les personnes listées."""
+        text = f'{count} personnes<br>' + '<br>'.join(people)
+        if count > len(people):
+            text += f'<br>...et {count - len(people)} autres'
+        return text
+
+    @staticmethod
+    def _axes(i, prefix=''):
+        """Noms des axes du sous-graphique i ('x', 'y' pour le premier, puis 'x2', 'y2'...)."""
+        suffix = str(i + 1) if i else ''
+        return {'xaxis': f'x{prefix}{suffix}', 'yaxis': f'y{prefix}{suffix}'}
+
+    @staticmethod
+    def _grid_positions(df, category, keys, cell_size):
+        """
+        Pour chaque personne appartenant à une des catégories affichées, retourne en une passe :
+        les lignes correspondantes, l'indice du sous-graphique et l'indice de la cellule dans la grille.
+        Les personnes gardent leur ordre dans le DataFrame à l'intérieur de chaque sous-graphique.
+        """
+        column = df[category]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Correspondance code de catégorie -> sous-graphique, sans comparer de chaînes
+            lookup = np.append(pd.Index(keys).get_indexer(column.cat.categories), -1)
+            subplot = lookup[column.cat.codes.to_numpy()]
+        else:
+            subplot = pd.Index(keys).get_indexer(column.to_numpy())
+
+        selected = np.flatnonzero(subplot >= 0)
+        subplot = subplot[selected]
+        # Rang de chaque personne dans son sous-graphique (équivalent vectorisé de groupby().cumcount())
+        order = np.argsort(subplot, kind='stable')
+        sorted_subplot = subplot[order]
+        rank = np.empty(len(subplot), dtype=np.intp)
+        rank[order] = np.arange(len(subplot)) - np.searchsorted(sorted_subplot, sorted_subplot, side='left')
+        return df.iloc[selected], subplot, rank // cell_size
+
+    @staticmethod
+    def _split_groups(keys):
+        """Indices des lignes regroupés par valeur de clé (groupes triés par clé, ordre stable)."""
+        order = np.argsort(keys, kind='stable')
+        boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+        return np.split(order, boundaries) if len(order) else []
+
     def _get_hovertemplate(self, distribution):
         hovertemplate = []
         for id in distribution:
@@ -6,7 +6,7 @@ import numpy as np
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 
-from helper import TRANSPARENT, generate_color_dict
+from helper import TRANSPARENT, count_winners, generate_color_dict
 
 # Sankey Chart pour comparer les profils démographiques des nominés vs gagnants,
 # avec l'affichage des pourcentages des gagnants pour chaque catégorie.
@@ -20,67 +20,56 @@ class SankeyDemographicChart:
         Les nœuds « Gagnants <catégorie> » affichent le pourcentage de gagnants par rapport aux nominés.
         Les infobulles des nœuds et des liens sont personnalisées pour n'afficher que les informations désirées.
         """
-        # Filtrer les données
-        nominees_df = df.copy()
-        winners_df = df[df["Win_Oscar?"] == True].copy()
-        losers_df = df[df["Win_Oscar?"] == False].copy()
-        
-        # Récupérer les catégories démographiques
-        categories = nominees_df[demographic_column].unique()
-        
-        # Comptages par catégorie
-        nominee_counts = nominees_df[demographic_column].value_counts()
-        winner_counts = winners_df[demographic_column].value_counts()
-        loser_counts = losers_df[demographic_column].value_counts()
-        
+        # Comptages par code de catégorie, sans copier ni comparer de chaînes
+        return self.plot_sankey_counts(*count_winners(df, demographic_column))
+
+    def plot_sankey_counts(self, category_codes, code_labels, nominee_counts, winner_counts):
+        """
+        Construit le Sankey à partir des effectifs par code de catégorie (voir helper.count_winners
+        et DataLoader.get_winner_counts) : les nœuds et les liens sont calculés sur des tableaux.
+        """
+        loser_counts = nominee_counts - winner_counts
+
+        # Catégories démographiques dans leur ordre d'apparition (code -1 : valeur manquante)
+        category_codes = np.asarray(category_codes)
+        # Les étiquettes ne sont décodées qu'ici, pour les nœuds de la figure
+        categories = [code_labels[code] if code >= 0 else np.nan for code in category_codes.tolist()]
+        n_categories = len(categories)
+
+        # Effectifs dans l'ordre des nœuds : un 0 ajouté en fin de tableau sert au code -1 (valeurs manquantes)
+        node_nominees = np.append(nominee_counts, 0)[category_codes]
+        node_winners = np.append(winner_counts, 0)[category_codes]
+        node_losers = np.append(loser_counts, 0)[category_codes]
+
         # Calculer les pourcentages de gagnants pour chaque catégorie
-        winner_percentages = {}
-        for cat in categories:
-            total = nominee_counts.get(cat, 0)
-            if total > 0:
-                winner_percentages[cat] = (winner_counts.get(cat, 0) / total) * 100
-            else:
-                winner_percentages[cat] = 0
-        
+        winner_percentages = node_winners / np.maximum(node_nominees, 1) * 100
+
         labels = (
             [f"{cat}" for cat in categories] +
-            [f"Gagnants {cat} ({winner_percentages[cat]:.1f}%)" for cat in categories] +
+            [f"Gagnants {cat} ({percentage:.1f}%)" for cat, percentage in zip(categories, winner_percentages)] +
             ["Perdants"]
         )
-        # Mapping label -> index
-        label_indices = {label: i for i, label in enumerate(labels)}
-        
-        winner_source = []
-        winner_target = []
-        winner_value = []
-        winner_link_colors = []
-        
-        loser_source = []
-        loser_target = []
-        loser_value = []
-        loser_link_colors = []
-        
         color_dict = generate_color_dict(categories, colorscale_name='Oranges')
-        
-        for cat in categories:
-            if cat in nominee_counts:
-                # Lien pour les gagnants : de la catégorie vers le noeud du gagnant
-                if cat in winner_counts and winner_counts[cat] > 0:
-                    winner_source.append(label_indices[f"{cat}"])
-                    winner_target.append(label_indices[f"Gagnants {cat} ({winner_percentages[cat]:.1f}%)"])
-                    winner_value.append(winner_counts[cat])
-                    winner_link_colors.append(color_dict[cat])
-                
-                # Lien pour les perdants : de la catégorie vers le noeud global "Perdants"
-                if cat in loser_counts and loser_counts[cat] > 0:
-                    loser_source.append(label_indices[f"{cat}"])
-                    loser_target.append(label_indices["Perdants"])
-                    loser_value.append(loser_counts[cat])
-                    loser_link_colors.append("lightgray")
+
+        # Lien pour les gagnants : de la catégorie vers le noeud du gagnant
+        # Lien pour les perdants : de la catégorie vers le noeud global "Perdants"
+        positions = np.arange(n_categories)
+        has_winners = node_winners > 0
+        has_losers = node_losers > 0
+
+        winner_source = positions[has_winners].tolist()
+        winner_target = (positions[has_winners] + n_categories).tolist()
+        winner_value = node_winners[has_winners]
+        winner_link_colors = [color_dict[categories[i]] for i in winner_source]
+
+        loser_source = positions[has_losers].tolist()
+        loser_target = [2 * n_categories] * len(loser_source)
+        loser_value = node_losers[has_losers]
+        loser_link_colors = ["lightgray"] * len(loser_source)
         
         source = loser_source + winner_source
         target = loser_target + winner_target
-        value = loser_value + winner_value
+        value = np.concatenate([loser_value, winner_value])
         link_colors = loser_link_colors + winner_link_colors
         
         # Couleur par défaut pour les nœuds
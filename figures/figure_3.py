@@ -9,18 +9,23 @@ class LineChart():
     def __init__(self):
         pass
 
-    def plot_line_chart(self, distribution_dict, category, selected_categories, df, cumulative=True, scale_type='linear', height=700):
+    def plot_line_chart(self, distribution_dict, category, selected_categories, df, cumulative=True, scale_type='linear', height=700,
+                        lazy_hover=False, is_winner=None):
         """
         Cette fonction génère un graphique en lignes montrant l'évolution d'une catégorie au fil du temps.
         
         Paramètres :
-        - distribution_dict : dictionnaire des distributions par année
+        - distribution_dict : YearlyCounts retourné par DataLoader (ou ancien dictionnaire des distributions
+          par année)
         - category : la colonne de regroupement (ex. 'Ethnicity', 'Gender', etc.)
         - selected_categories : liste des catégories sélectionnées à afficher
         - df : DataFrame contenant les colonnes 'Year_Ceremony', category, 'Name', 'Film'
         - cumulative : booléen indiquant si les données doivent être affichées de manière cumulative
         - scale_type : type d'échelle pour l'axe Y ('linear' ou 'log')
         - height : hauteur du graphique en pixels (par défaut: 700)
+        - lazy_hover : si True, la figure ne contient pas les exemples du hover ; ils sont chargés au
+          survol depuis /api/details/cell (static/lazy_hover.js)
+        - is_winner : filtre de gagnant appliqué à df, transmis au hover chargé à la demande
 
         Retourne : 
         - figure Plotly de type line chart
@@ -31,52 +36,24 @@ class LineChart():
         # Générer un dictionnaire de couleurs pour les catégories
         color_dict = generate_color_dict(selected_categories, colorscale_name='Oranges')
         
+        # Pour les données agrégées par année : une série de valeurs par catégorie sélectionnée
+        x_years, series = self._get_series(distribution_dict, selected_categories)
+        # Textes du hover de toutes les catégories, construits en une seule passe groupée
+        if not lazy_hover:
+            hover_texts_by_category = self._build_hover_texts(series, x_years, category, selected_categories,
+                                                              df, cumulative)
+
         # Pour chaque catégorie sélectionnée, tracer la courbe
         for i, category_name in enumerate(selected_categories):
-            # Pour les données agrégées par année
-            x_years = sorted(distribution_dict.keys())
-            y_values = [distribution_dict[year].get(category_name, 0) for year in x_years]
-            
-            # Filtrer le DataFrame pour la catégorie spécifique
-            filtered_df = df[df[category] == category_name]
-            
-            # Créer les textes personnalisés pour le hover
-            hover_texts = []
-            for year in x_years:
-                # Compter le nombre d'occurrences pour cette catégorie et cette année
-                year_count = distribution_dict[year].get(category_name, 0)
-                
-                # Si nous utilisons des données cumulatives, nous ne voulons montrer que les nouvelles entrées
-                annual_count = year_count
-                if cumulative and year > min(x_years):
-                    previous_year_index = x_years.index(year) - 1
-                    previous_year = x_years[previous_year_index]
-                    annual_count = year_count - distribution_dict[previous_year].get(category_name, 0)
-                
-                # Pour cette année et cette catégorie, trouver les noms et films
-                year_data = filtered_df[filtered_df['Year_Ceremony'] == year]
-                
-                # Créer le texte du hover
-                text = f"<b>{category_name}</b><br>"
-                text += f"Année: {year}<br>"
-                
-                if cumulative:
-                    text += f"Total cumulé: {year_count}<br>"
-                    text += f"Nouveaux cette année: {annual_count}<br>"
-                else:
-                    text += f"Nombre cette année: {annual_count}<br>"
-                
-                # Si nous avons des données détaillées pour cette année
-                if not year_data.empty and annual_count > 0:
-                    text += "<br>Exemples:<br>"
-                    # Limiter à 3 exemples maximum
-                    for _, entry in year_data.head(3).iterrows():
-                        text += f"• {entry['Name']} ({entry['Film']})<br>"
-                    
-                    if len(year_data) > 3:
-                        text += f"...et {len(year_data) - 3} autres"
-                
-                hover_texts.append(text)
+            y_values = series[category_name]
+            if lazy_hover:
+                # Seuls les comptes de l'année sont envoyés, les exemples sont chargés au survol
+                annual_counts = np.diff(y_values, prepend=0) if cumulative else y_values
+                hover = dict(hoverinfo='none', customdata=annual_counts,
+                             meta={'lazy_hover': 'cell', 'column': category, 'value': category_name,
+                                   'is_winner': is_winner, 'cumulative': cumulative})
+            else:
+                hover = dict(hoverinfo='text', hovertext=hover_texts_by_category[category_name])
 
             # Ajouter la trace à la figure avec la couleur correspondante
             fig.add_trace(go.Scatter(
@@ -86,8 +63,7 @@ class LineChart():
                 name=category_name,
                 line=dict(color=color_dict[category_name], width=3),
                 marker=dict(size=8, color=color_dict[category_name]),
-                hoverinfo='text',
-                hovertext=hover_texts
+                **hover
             ))
 
         # Déterminer si la ligne verticale à 2015 doit être affichée
@@ -149,4 +125,87 @@ class LineChart():
             ),
         )
         
-        return fig
\ No newline at end of file
+        return fig
+
+    @staticmethod
+    def _get_series(distribution, selected_categories):
+        """
+        Retourne les années triées et, pour chaque catégorie sélectionnée, la liste de ses valeurs
+        (0 pour une catégorie absente des données).
+        """
+        if isinstance(distribution, dict):
+            x_years = sorted(distribution.keys())
+            return x_years, {category_name: [distribution[year].get(category_name, 0) for year in x_years]
+                             for category_name in selected_categories}
+
+        return distribution.periods.tolist(), {category_name: distribution.column(category_name)
+                                               for category_name in selected_categories}
+
+    @staticmethod
+    def _build_hover_texts(series, x_years, category, selected_categories, df, cumulative=True):
+        """
+        Construit les textes du hover pour chaque catégorie et chaque année.
+
+        Les exemples (3 premiers noms et films) et le nombre de lignes par (catégorie, année) sont
+        calculés par un seul groupby sur le DataFrame, au lieu d'un filtrage par année et par catégorie.
+
+        Retourne : dictionnaire {catégorie: [texte pour chaque année de x_years]}
+        """
+        group_sizes, examples = LineChart._group_examples(df, category, selected_categories)
+
+        hover_texts = {}
+        for category_name in selected_categories:
+            texts = []
+            previous_count = None
+            for year_index, year in enumerate(x_years):
+                # Compter le nombre d'occurrences pour cette catégorie et cette année
+                year_count = series[category_name][year_index]
+
+                # Si nous utilisons des données cumulatives, nous ne voulons montrer que les nouvelles entrées
+                annual_count = year_count
+                if cumulative and previous_count is not None:
+                    annual_count = year_count - previous_count
+                previous_count = year_count
+
+                # Créer le texte du hover
+                text = f"<b>{category_name}</b><br>"
+                text += f"Année: {year}<br>"
+
+                if cumulative:
+                    text += f"Total cumulé: {year_count}<br>"
+                    text += f"Nouveaux cette année: {annual_count}<br>"
+                else:
+                    text += f"Nombre cette année: {annual_count}<br>"
+
+                # Si nous avons des données détaillées pour cette année
+                n_entries = group_sizes.get((category_name, year), 0)
+                if n_entries and annual_count > 0:
+                    text += "<br>Exemples:<br>"
+                    # Limiter à 3 exemples maximum
+                    text += examples[(category_name, year)]
+
+                    if n_entries > 3:
+                        text += f"...et {n_entries - 3} autres"
+
+                texts.append(text)
+            hover_texts[category_name] = texts
+        return hover_texts
+
+    @staticmethod
+    def _group_examples(df, category, selected_categories):
+        """
+        Nombre de lignes et exemples du hover (3 premiers noms et films, dans l'ordre du DataFrame)
+        pour chaque (catégorie, année), calculés par un seul groupby.
+
+        Retourne : (dictionnaire {(catégorie, année): nombre}, dictionnaire {(catégorie, année): texte})
+        """
+        rows = df[df[category].isin(selected_categories)]
+        keys = [rows[category], rows['Year_Ceremony']]
+        group_sizes = rows.groupby(keys, observed=True).size().to_dict()
+
+        # Les 3 premières lignes de chaque (catégorie, année), dans l'ordre du DataFrame
+        first_rows = rows[rows.groupby(keys, observed=True).cumcount() < 3]
+        example_lines = '• ' + first_rows['Name'].astype(str) + ' (' + first_rows['Film'].astype(str) + ')<br>'
+        examples = example_lines.groupby([first_rows[category], first_rows['Year_Ceremony']],
+                                         observed=True).agg(''.join).to_dict()
+        return group_sizes, examples
@@ -6,7 +6,7 @@ import numpy as np
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 
-from helper import TRANSPARENT, generate_color_dict
+from helper import TRANSPARENT, YearlyCounts, generate_color_dict
 
 # Stacked Area Chart with Normalized Values
 
@@ -23,34 +23,34 @@ class StackedAreaChart():
         1930: {'White': 17, 'Black': 0, 'Hispanic': 0, 'Asian': 0, 'Multiracial': 0, 'Other': 0}}
 
 Args:
-            data: Dictionnaire de données par année et catégorie
+            data: YearlyCounts retourné par DataLoader.get_yearly_counts, ou ancien dictionnaire
+                  de données par année et catégorie
             height: Hauteur du graphique (défaut: 700px)
 
         Retourne la figure
         """
+        if isinstance(data, dict):
+            data = self._from_dict(data)
+        periods = data.periods.astype(str).tolist()
+        labels = data.labels
+        counts = data.counts
 
-        # Convertir les données en DataFrame
-        df = pd.DataFrame(data).T.fillna(0)
-        df.index = df.index.astype(str)
-
-        # Normaliser les valeurs
-        df_normalized = df.div(df.sum(axis=1), axis=0)
-        
-        # Convertir en pourcentage (multiplier par 100)
-        df_percentage = df_normalized * 100
+        # Normaliser les valeurs et convertir en pourcentage (multiplier par 100)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentages = counts / counts.sum(axis=1, keepdims=True) * 100
         
         # Obtenir les couleurs pour chaque catégorie
-        color_dict = generate_color_dict(identifiers=df_normalized.columns, colorscale_name='Oranges')
-        color_sequence = [color_dict[cat] for cat in df_normalized.columns]
+        color_dict = generate_color_dict(identifiers=labels, colorscale_name='Oranges')
+        color_sequence = [color_dict[cat] for cat in labels]
 
         # Créer une figure
         fig = go.Figure()
         
         # Ajouter chaque catégorie comme une série d'aires empilées
-        for i, col in enumerate(df_percentage.columns):
+        for i, col in enumerate(labels):
             fig.add_trace(go.Scatter(
-                x=df_percentage.index,
-                y=df_percentage[col],
+                x=periods,
+                y=percentages[:, i],
                 mode='lines',
                 stackgroup='one',
                 name=col,
@@ -61,18 +61,16 @@ Args:
         
         # Créer textes personnalisés pour le hover
         hover_texts = []
-        for year in df_percentage.index:
+        for year, year_percentages, year_counts in zip(periods, percentages.tolist(), counts.tolist()):
             text = f"Année : {year}<br>"
-            for col in df_percentage.columns:
-                percentage = df_percentage.loc[year, col]
-                absolute = df.loc[year, col]  # Valeur absolue
+            for col, percentage, absolute in zip(labels, year_percentages, year_counts):
                 text += f"{col} : {percentage:.1f}% ({int(absolute)})<br>"
             hover_texts.append(text)
         
         # Ajouter une trace invisible avec le hover personnalisé
         fig.add_trace(go.Scatter(
-            x=df_percentage.index,
-            y=[50] * len(df_percentage),  # Au milieu du graphique
+            x=periods,
+            y=[50] * len(periods),  # Au milieu du graphique
             mode='markers',
             marker=dict(opacity=0),  # Invisible
             hoverinfo='text',
@@ -124,4 +122,10 @@ Args:
             margin=dict(l=50, r=50, t=30, b=50)  # Ajuster les marges pour maximiser l'espace
         )
         
-        return fig
\ No newline at end of file
+        return fig
+
+    @staticmethod
+    def _from_dict(data):
+        """Convertit l'ancien format {année: {catégorie: valeur}} en YearlyCounts."""
+        df = pd.DataFrame(data).T.fillna(0)
+        return YearlyCounts(df.index.to_numpy(), df.columns.tolist(), df.to_numpy(dtype=np.int64))
\ No newline at end of file
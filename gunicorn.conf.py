@@ -0,0 +1,30 @@
+"""
+Configuration gunicorn du serveur de production (voir wsgi.py).
+
+Variables d'environnement :
+    OSCARS_BIND     adresse d'écoute (défaut : 0.0.0.0:8070)
+    OSCARS_WORKERS  nombre de processus (défaut : 2 x CPU + 1)
+    OSCARS_THREADS  nombre de threads par processus (défaut : 4)
+    OSCARS_TIMEOUT  délai maximal d'une requête en secondes (défaut : 30)
+    OSCARS_WATCH_INTERVAL  délai entre deux vérifications du CSV en secondes (défaut : 0, pas de surveillance)
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('OSCARS_BIND', '0.0.0.0:8070')
+workers = int(os.environ.get('OSCARS_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('OSCARS_THREADS', 4))
+# Les callbacks Dash sont surtout du calcul numpy/pandas : des threads suffisent pour les requêtes concurrentes
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('OSCARS_TIMEOUT', 30))
+
+# Charger l'application (données, cube, vue par défaut) une seule fois dans le maître avant le fork
+preload_app = True
+
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    # Les threads du maître ne survivent pas au fork : chaque worker surveille lui-même le CSV
+    from app import start_data_watcher
+    start_data_watcher()
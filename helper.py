@@ -1,5 +1,15 @@
+import glob
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import time
+import traceback
+from collections import namedtuple
+
 import pandas as pd 
-import math
 import plotly.colors as pc
 import plotly.express as px
 import numpy as np
@@ -17,22 +27,1049 @@ CUSTOM_COLORS = [
 
 TRANSPARENT = 'rgba(0,0,0,0)'
 
+# Colonnes démographiques étudiées par les figures (ordre alphabétique)
+DEMOGRAPHIC_COLUMNS = ['Age', 'Gender', 'Race or Ethnicity', 'Religion', 'Sexual orientation']
+
+# Colonnes stockées en catégories après le prétraitement (textes et tranches d'âge) : les
+# agrégations et comparaisons se font sur les codes entiers, les étiquettes ne sont décodées
+# qu'au moment de construire les figures
+CATEGORICAL_COLUMNS = ['Category', 'Age', 'Gender', 'Race or Ethnicity', 'Religion', 'Sexual orientation']
+
+# À incrémenter lorsque le prétraitement change, pour invalider les caches binaires existants
+CACHE_FORMAT_VERSION = 3
+
+# Version du format de fichier colonnaire (DataLoader.write_columnar / load_columnar)
+COLUMNAR_FORMAT_VERSION = 2
+
+# Taille des blocs lus par DataLoader.refresh lorsque load_data n'a pas reçu de chunksize
+REFRESH_CHUNK_SIZE = 100_000
+
+
+def get_codes(column):
+    """
+    Retourne (codes, étiquettes) d'une colonne : les codes entiers de chaque ligne (-1 pour une valeur
+    manquante) et la table des étiquettes triées, en types Python natifs (sérialisables en JSON).
+    Pour une colonne catégorielle, les codes sont lus directement, sans hachage des valeurs.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories.tolist()
+    codes, uniques = pd.factorize(column, sort=True)
+    return codes, [label.item() if isinstance(label, np.generic) else label for label in uniques]
+
+
+def count_winners(data, column):
+    """
+    Effectifs des nominés et des gagnants par catégorie d'un DataFrame, calculés sur les codes.
+
+    Retourne (codes des catégories dans leur ordre d'apparition (-1 : valeur manquante),
+              étiquettes, nominés par code, gagnants par code)
+    """
+    codes, labels = get_codes(data[column])
+    is_winner = data['Win_Oscar?'].to_numpy(dtype=bool)
+    valid = codes >= 0
+    nominee_counts = np.bincount(codes[valid], minlength=len(labels))
+    winner_counts = np.bincount(codes[valid & is_winner], minlength=len(labels))
+    return pd.unique(codes), labels, nominee_counts, winner_counts
+
+
+class CountCube():
+    """
+    Cube de comptes dense indexé par (année, gagnant, colonne démographique, code de catégorie).
+
+    Les comptes sont stockés sous forme de sommes cumulatives sur l'axe des années, ce qui
+    permet de répondre à n'importe quelle plage d'années et filtre de gagnant en O(catégories)
+    sans parcourir le DataFrame. La construction est en O(lignes).
+    """
+
+    def __init__(self, data, columns=DEMOGRAPHIC_COLUMNS, order=None):
+        """
+        Args:
+            data (pandas.DataFrame): Données prétraitées
+            columns (list): Colonnes démographiques du cube
+            order (np.ndarray, optional): Positions des lignes de data dans l'ordre des données, si data
+                est rangé autrement (YearIndex.year_positions) ; sert à l'ordre d'apparition des catégories
+        """
+        def in_order(values):
+            return values if order is None else values[order]
+
+        years = in_order(data['Year_Ceremony'].to_numpy()).astype(np.int64)
+        self.min_year = int(years.min())
+        self.max_year = int(years.max())
+        n_years = self.max_year - self.min_year + 1
+
+        year_idx = years - self.min_year
+        winner = in_order(data['Win_Oscar?'].to_numpy()).astype(np.intp)
+
+        # Nombre de lignes par (année, gagnant)
+        self.row_prefix = self._prefix(
+            np.bincount(year_idx * 2 + winner, minlength=n_years * 2).reshape(n_years, 2)
+        )
+
+        self.n_rows_total = len(years)
+        self.labels = {}
+        self.prefix = {}
+        self.first_rows = {}
+        for col in columns:
+            codes, labels = get_codes(data[col])
+            codes = in_order(codes)
+            n_cats = len(labels)
+            # Les valeurs manquantes (code -1) sont ignorées, comme dans un groupby
+            valid = codes >= 0
+            flat = (year_idx[valid] * 2 + winner[valid]) * n_cats + codes[valid]
+            counts = np.bincount(flat, minlength=n_years * 2 * n_cats).reshape(n_years, 2, n_cats)
+            self.labels[col] = labels
+            self.prefix[col] = self._prefix(counts)
+
+            # Position de la première ligne de chaque (année, code), pour retrouver l'ordre d'apparition
+            # des catégories dans une plage ; la dernière colonne correspond aux valeurs manquantes
+            keys = year_idx * (n_cats + 1) + np.where(valid, codes, n_cats)
+            unique_keys, first_positions = np.unique(keys, return_index=True)
+            first_rows = np.full(n_years * (n_cats + 1), self.n_rows_total, dtype=np.int64)
+            first_rows[unique_keys] = first_positions
+            self.first_rows[col] = first_rows.reshape(n_years, n_cats + 1)
+
+    @classmethod
+    def from_counts(cls, min_year, row_counts, labels, counts, first_rows):
+        """
+        Cube construit à partir de comptes déjà agrégés (voir ChunkAccumulator), sans DataFrame.
+
+        Args:
+            min_year (int): Première année
+            row_counts (np.ndarray): Nombre de lignes par (année, gagnant)
+            labels (dict): Étiquettes triées de chaque colonne
+            counts (dict): Comptes (année, gagnant, code) de chaque colonne
+            first_rows (dict): Position de la première ligne de chaque (année, code) de chaque colonne
+        """
+        cube = cls.__new__(cls)
+        cube.min_year = int(min_year)
+        cube.max_year = cube.min_year + row_counts.shape[0] - 1
+        cube.row_prefix = cls._prefix(row_counts)
+        cube.n_rows_total = int(row_counts.sum())
+        cube.labels = labels
+        cube.prefix = {col: cls._prefix(col_counts) for col, col_counts in counts.items()}
+        cube.first_rows = first_rows
+        return cube
+
+    @staticmethod
+    def _prefix(counts):
+        prefix = np.zeros((counts.shape[0] + 1,) + counts.shape[1:], dtype=np.int64)
+        np.cumsum(counts, axis=0, out=prefix[1:])
+        return prefix
+
+    def _bounds(self, start_year, end_year):
+        n_years = self.max_year - self.min_year + 1
+        start = min(max(int(start_year) - self.min_year, 0), n_years)
+        end = min(max(int(end_year) - self.min_year + 1, 0), n_years)
+        return start, max(start, end)
+
+    @staticmethod
+    def _select_winner(counts, is_winner):
+        if is_winner is None:
+            return counts.sum(axis=-2)
+        return counts[..., int(bool(is_winner)), :]
+
+    def n_rows(self, start_year, end_year, is_winner=None):
+        """Nombre de lignes correspondant à la requête."""
+        start, end = self._bounds(start_year, end_year)
+        counts = self.row_prefix[end] - self.row_prefix[start]
+        return int(counts.sum() if is_winner is None else counts[int(bool(is_winner))])
+
+    def counts(self, column, start_year, end_year, is_winner=None):
+        """Comptes par code de catégorie sur la plage d'années, par différence de sommes cumulatives."""
+        start, end = self._bounds(start_year, end_year)
+        prefix = self.prefix[column]
+        return self._select_winner(prefix[end] - prefix[start], is_winner)
+
+    def first_appearance(self, column, start_year, end_year):
+        """
+        Codes présents dans la plage d'années (gagnants et nominés), dans l'ordre de leur première
+        ligne dans les données, comme Series.unique(). Le code -1 représente les valeurs manquantes.
+        """
+        start, end = self._bounds(start_year, end_year)
+        first_rows = self.first_rows[column][start:end].min(axis=0, initial=self.n_rows_total)
+        present = np.flatnonzero(first_rows < self.n_rows_total)
+        codes = present[np.argsort(first_rows[present], kind='stable')]
+        return np.where(codes == len(self.labels[column]), -1, codes)
+
+    def yearly_counts(self, column, start_year, end_year, is_winner=None):
+        """
+        Retourne (années, matrice de comptes [année, code]) pour chaque année de la plage,
+        y compris les années sans cérémonie.
+        """
+        start, end = self._bounds(start_year, end_year)
+        counts = np.diff(self.prefix[column][start:end + 1], axis=0)
+        years = np.arange(start, end) + self.min_year
+        return years, self._select_winner(counts, is_winner)
+
+    def updated(self, data, years):
+        """
+        Cube de `data`, qui ne diffère des données de ce cube que par les lignes des années `years`
+        (ajoutées, modifiées ou supprimées). Seuls les comptes de ces années sont recalculés à partir
+        des lignes ; ceux des autres années sont repris de ce cube, avec les codes renumérotés si de
+        nouvelles catégories sont apparues et les positions décalées des lignes insérées avant.
+
+        Args:
+            data (pandas.DataFrame): Nouvelles données, triées par année. Les étiquettes de chaque
+                colonne doivent contenir celles de ce cube
+            years (iterable): Années dont les lignes ont changé
+        """
+        all_years = data['Year_Ceremony'].to_numpy()
+        min_year = int(all_years[0])
+        n_years = int(all_years[-1]) - min_year + 1
+        changed = sorted(set(int(year) for year in years))
+
+        # Années reprises de ce cube : positions dans l'ancien et dans le nouveau cube
+        old_years = np.arange(self.min_year, self.max_year + 1)
+        kept = ~np.isin(old_years, changed) & (old_years >= min_year) & (old_years < min_year + n_years)
+        kept_old = np.flatnonzero(kept)
+        kept_new = old_years[kept] - min_year
+
+        # Lignes des années modifiées, dans l'ordre des données
+        bounds = np.searchsorted(all_years, [[year, year + 1] for year in changed]).reshape(-1, 2)
+        positions = np.concatenate([np.arange(start, end) for start, end in bounds] + [np.zeros(0, dtype=np.int64)])
+        year_idx = all_years[positions].astype(np.int64) - min_year
+        winner = data['Win_Oscar?'].to_numpy()[positions].astype(np.intp)
+
+        old_row_counts = np.diff(self.row_prefix, axis=0)
+        row_counts = np.zeros((n_years, 2), dtype=np.int64)
+        row_counts[kept_new] = old_row_counts[kept_old]
+        row_counts += np.bincount(year_idx * 2 + winner, minlength=n_years * 2).reshape(n_years, 2)
+        n_rows_total = int(row_counts.sum())
+        # Position de la première ligne de chaque année, avant et après la mise à jour
+        old_offsets = np.concatenate([[0], np.cumsum(old_row_counts.sum(axis=1))[:-1]])
+        offsets = np.concatenate([[0], np.cumsum(row_counts.sum(axis=1))[:-1]])
+
+        labels = {}
+        counts = {}
+        first_rows = {}
+        for col in self.prefix:
+            codes, col_labels = get_codes(data[col])
+            n_cats = len(col_labels)
+            positions_by_label = {label: i for i, label in enumerate(col_labels)}
+            remap = np.array([positions_by_label[label] for label in self.labels[col]], dtype=np.intp)
+
+            col_counts = np.zeros((n_years, 2, n_cats), dtype=np.int64)
+            kept_counts = np.zeros((len(kept_old), 2, n_cats), dtype=np.int64)
+            kept_counts[:, :, remap] = np.diff(self.prefix[col], axis=0)[kept_old]
+            col_counts[kept_new] = kept_counts
+            codes = codes[positions]
+            valid = codes >= 0
+            flat = (year_idx[valid] * 2 + winner[valid]) * n_cats + codes[valid]
+            col_counts += np.bincount(flat, minlength=n_years * 2 * n_cats).reshape(n_years, 2, n_cats)
+
+            # Premières lignes reprises : décalées du déplacement du début de leur année
+            col_first_rows = np.full((n_years, n_cats + 1), n_rows_total, dtype=np.int64)
+            old_first_rows = self.first_rows[col][kept_old]
+            shifted = old_first_rows - old_offsets[kept_old, None] + offsets[kept_new, None]
+            kept_first_rows = np.full((len(kept_old), n_cats + 1), n_rows_total, dtype=np.int64)
+            kept_first_rows[:, np.append(remap, n_cats)] = np.where(old_first_rows < self.n_rows_total,
+                                                                    shifted, n_rows_total)
+            col_first_rows[kept_new] = kept_first_rows
+            # Premières lignes recalculées : les positions sont croissantes, np.unique garde la première
+            keys = year_idx * (n_cats + 1) + np.where(valid, codes, n_cats)
+            unique_keys, first_positions = np.unique(keys, return_index=True)
+            col_first_rows.ravel()[unique_keys] = positions[first_positions]
+
+            labels[col] = col_labels
+            counts[col] = col_counts
+            first_rows[col] = col_first_rows
+
+        return CountCube.from_counts(min_year, row_counts, labels, counts, first_rows)
+
+
+class YearlyCounts():
+    """
+    Comptes d'une colonne démographique par période, sous forme de tableaux : c'est le résultat
+    retourné par DataLoader et consommé directement par les figures.
+
+    Attributs:
+        periods (np.ndarray): Périodes triées (années ou début de la tranche d'années)
+        labels (list): Catégories, dans l'ordre des colonnes de counts
+        counts (np.ndarray): Comptes entiers de forme (len(periods), len(labels))
+        cumulative (bool): True si counts contient les comptes cumulés période après période
+    """
+
+    __slots__ = ('periods', 'labels', 'counts', 'cumulative')
+
+    def __init__(self, periods, labels, counts, cumulative=False):
+        self.periods = periods
+        self.labels = labels
+        self.counts = counts
+        self.cumulative = cumulative
+
+    def cumsum(self):
+        """Vue cumulée des comptes (retourne self si les comptes sont déjà cumulés)."""
+        if self.cumulative:
+            return self
+        return YearlyCounts(self.periods, self.labels, np.cumsum(self.counts, axis=0), cumulative=True)
+
+    def totals(self):
+        """Total de chaque catégorie sur toutes les périodes : {catégorie: total}."""
+        if not len(self.periods):
+            return {label: 0 for label in self.labels}
+        totals = self.counts[-1] if self.cumulative else self.counts.sum(axis=0)
+        return dict(zip(self.labels, totals.tolist()))
+
+    def column(self, label):
+        """Valeurs d'une catégorie pour chaque période (liste de zéros si la catégorie est absente)."""
+        if label not in self.labels:
+            return [0] * len(self.periods)
+        return self.counts[:, self.labels.index(label)].tolist()
+
+    def to_dict(self):
+        """Ancien format {période: {catégorie: compte}}."""
+        return {period: dict(zip(self.labels, row)) for period, row in zip(self.periods.tolist(), self.counts.tolist())}
+
+
+class YearIndex():
+    """
+    Index des lignes par (gagnant, année). Les données sont rangées une seule fois par (gagnant, année) :
+    les perdants puis les gagnants, chaque groupe trié par année, en gardant l'ordre des données dans
+    chaque (gagnant, année). Filtrer une plage d'années pour les gagnants ou les perdants revient à
+    découper le DataFrame entre deux positions précalculées, sans masque booléen ni copie (les
+    tranches sont des vues).
+
+    Sans filtre de gagnant, les lignes de la plage sont lues dans l'ordre des données (par année)
+    grâce à la table des positions par année : seules les lignes sélectionnées sont copiées.
+    """
+
+    def __init__(self, data, year_positions):
+        """
+        Args:
+            data (pandas.DataFrame): Données rangées par (gagnant, année)
+            year_positions (np.ndarray): Positions dans data des lignes, dans l'ordre des données
+        """
+        years = data['Year_Ceremony'].to_numpy()
+        winner = data['Win_Oscar?'].to_numpy(dtype=bool)
+        n_losers = int(np.count_nonzero(~winner))
+        self.min_year = int(years.min())
+        self.max_year = int(years.max())
+        # Position de la première ligne de chaque année, et fin des données
+        bounds = np.arange(self.min_year, self.max_year + 2)
+        self.data = data
+        self.year_positions = year_positions
+        # winner_offsets[gagnant, année] : positions dans data (perdants, puis gagnants)
+        self.winner_offsets = np.stack([
+            np.searchsorted(years[:n_losers], bounds, side='left'),
+            n_losers + np.searchsorted(years[n_losers:], bounds, side='left'),
+        ])
+        # offsets[année] : position de la première ligne de l'année dans year_positions
+        self.offsets = self.winner_offsets[0] + self.winner_offsets[1] - n_losers
+
+    @classmethod
+    def sort(cls, data):
+        """Index de données triées par année : les lignes sont rangées (copiées) par (gagnant, année)."""
+        winner = data['Win_Oscar?'].to_numpy(dtype=bool)
+        order = np.argsort(winner, kind='stable')
+        year_positions = np.empty(len(order), dtype=np.intp)
+        year_positions[order] = np.arange(len(order))
+        return cls(data.iloc[order], year_positions)
+
+    def _bounds(self, start_year, end_year):
+        n_years = self.max_year - self.min_year + 1
+        start = min(max(int(start_year) - self.min_year, 0), n_years)
+        end = min(max(int(end_year) - self.min_year + 1, 0), n_years)
+        return start, max(start, end)
+
+    def select(self, start_year, end_year, is_winner=None):
+        """Lignes de la plage d'années (bornes incluses), éventuellement restreintes aux gagnants ou aux perdants."""
+        start, end = self._bounds(start_year, end_year)
+        if is_winner is None:
+            return self.data.iloc[self.year_positions[self.offsets[start]:self.offsets[end]]]
+        offsets = self.winner_offsets[int(bool(is_winner))]
+        return self.data.iloc[offsets[start]:offsets[end]]
+
+
+class ChunkAccumulator():
+    """
+    Ingestion d'un CSV bloc par bloc (DataLoader.load_data avec chunksize) : chaque bloc prétraité
+    est ajouté au cube de comptes et à un stockage compact des lignes, puis libéré.
+
+    Les colonnes textuelles sont encodées par dictionnaire au fil des blocs (codes int32 et table des
+    valeurs dans l'ordre d'apparition) : les valeurs répétées ne sont conservées qu'une fois. Les
+    comptes par (année, gagnant, code) et la première ligne de chaque (année, code) sont agrégés bloc
+    par bloc. finish() trie les étiquettes et les lignes et retourne le même DataFrame et le même
+    cube que load_data suivi de preprocess_data sur le fichier entier.
+    """
+
+    def __init__(self, columns=DEMOGRAPHIC_COLUMNS):
+        self.columns = columns
+        self.n_rows = 0
+        self._names = None
+        self._arrays = {}        # colonne -> liste des tableaux de chaque bloc (codes ou valeurs)
+        self._dictionaries = {}  # colonne -> {valeur: code}, dans l'ordre d'apparition
+        self._nullable = {}      # colonne -> type entier nullable (âges avec valeurs manquantes)
+        self._year_rows = {}     # année -> nombre de lignes déjà vues
+        self._counts = {col: {} for col in columns}       # (année, gagnant, code) -> compte
+        self._first_ranks = {col: {} for col in columns}  # (année, code) -> rang de la première ligne dans l'année
+
+    def _encode(self, name, values):
+        """Codes int32 des valeurs dans le dictionnaire de la colonne (-1 : valeur manquante)."""
+        dictionary = self._dictionaries.setdefault(name, {})
+        codes, uniques = pd.factorize(values)
+        mapping = np.array([dictionary.setdefault(value, len(dictionary)) for value in pd.Index(uniques).tolist()],
+                           dtype=np.int32)
+        return np.where(codes >= 0, np.append(mapping, -1)[codes], -1).astype(np.int32)
+
+    def add(self, chunk):
+        """Ajoute un bloc prétraité (colonne Age calculée, colonnes inutiles retirées)."""
+        if self._names is None:
+            self._names = list(chunk.columns)
+        years = chunk['Year_Ceremony'].to_numpy(dtype=np.int64)
+        winner = chunk['Win_Oscar?'].to_numpy(dtype=bool)
+
+        # Rang de chaque ligne parmi les lignes de la même année, blocs précédents compris
+        unique_years, inverse, year_counts = np.unique(years, return_inverse=True, return_counts=True)
+        seen = np.array([self._year_rows.get(year, 0) for year in unique_years.tolist()], dtype=np.int64)
+        ranks = seen[inverse] + pd.Series(years).groupby(years).cumcount().to_numpy()
+        for year, count in zip(unique_years.tolist(), year_counts.tolist()):
+            self._year_rows[year] = self._year_rows.get(year, 0) + count
+
+        for name in self._names:
+            if name == 'Year_Ceremony':
+                self._arrays.setdefault(name, []).append(years.astype(np.int16))
+            elif name == 'Win_Oscar?':
+                self._arrays.setdefault(name, []).append(winner)
+            else:
+                self._arrays.setdefault(name, []).append(self._encode(name, chunk[name]))
+                dtype = chunk[name].dtype
+                if isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in 'iu':
+                    self._nullable[name] = dtype
+
+        for col in self.columns:
+            codes = self._arrays[col][-1].astype(np.int64)
+            # Comptes par (année, gagnant, code) ; les valeurs manquantes sont ignorées, comme dans le cube
+            valid = codes >= 0
+            keys, counts = np.unique(((years[valid] * 2 + winner[valid]) << 32) | codes[valid], return_counts=True)
+            col_counts = self._counts[col]
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                col_counts[key] = col_counts.get(key, 0) + count
+            # Première ligne de chaque (année, code) : les rangs croissent avec les lignes d'une même année,
+            # la première occurrence dans le bloc est donc la plus petite, et un bloc précédent l'emporte
+            keys, first = np.unique((years << 32) | (codes + 1), return_index=True)
+            first_ranks = self._first_ranks[col]
+            for key, rank in zip(keys.tolist(), ranks[first].tolist()):
+                first_ranks.setdefault(key, rank)
+
+        self.n_rows += len(chunk)
+
+    def finish(self):
+        """Retourne (DataFrame trié par année, CountCube)."""
+        years = np.concatenate(self._arrays['Year_Ceremony'])
+        winner = np.concatenate(self._arrays['Win_Oscar?'])
+        min_year = int(years.min())
+        n_years = int(years.max()) - min_year + 1
+
+        # Tri stable par année (inutile si le fichier est déjà trié, l'index reste alors 0..n-1)
+        if np.all(years[1:] >= years[:-1]):
+            order, index = None, pd.RangeIndex(len(years))
+        else:
+            order = np.argsort(years, kind='stable')
+            index = pd.Index(order)
+
+        columns = {}
+        labels = {}
+        remaps = {}
+        for name in self._names:
+            values = np.concatenate(self._arrays.pop(name))
+            if order is not None:
+                values = values[order]
+            if name in ('Year_Ceremony', 'Win_Oscar?'):
+                columns[name] = values
+                continue
+            # Étiquettes triées, comme astype('category')
+            dictionary = list(self._dictionaries[name])
+            sorted_codes = np.argsort(np.array(dictionary, dtype=object), kind='stable')
+            remap = np.empty(len(dictionary) + 1, dtype=np.int32)
+            remap[sorted_codes] = np.arange(len(dictionary), dtype=np.int32)
+            remap[-1] = -1
+            codes = remap[values]
+            sorted_labels = [dictionary[code] for code in sorted_codes.tolist()]
+            if name in CATEGORICAL_COLUMNS:
+                # Même type de catégories que astype('category') sur la colonne entière (Int16 si des âges manquent)
+                categories = pd.Index(sorted_labels, dtype=self._nullable.get(name))
+                columns[name] = pd.Categorical.from_codes(codes, categories=categories)
+            else:
+                # Colonne texte (noms, films) : les valeurs répétées partagent le même objet
+                columns[name] = np.append(np.array(sorted_labels, dtype=object), np.nan)[codes]
+            labels[name] = sorted_labels
+            remaps[name] = remap
+        data = pd.DataFrame(columns, index=index)
+
+        row_counts = np.bincount((years - min_year) * 2 + winner, minlength=n_years * 2).reshape(n_years, 2)
+        # Position de la première ligne de chaque année dans les données triées
+        year_offsets = np.concatenate([[0], np.cumsum(row_counts.sum(axis=1))[:-1]])
+        counts = {}
+        first_rows = {}
+        for col in self.columns:
+            n_cats = len(labels[col])
+            remap = remaps[col]
+            col_counts = np.zeros((n_years, 2, n_cats), dtype=np.int64)
+            keys = np.array(list(self._counts[col]), dtype=np.int64)
+            if len(keys):
+                year_winner = keys >> 32
+                col_counts[year_winner // 2 - min_year, year_winner % 2, remap[keys & 0xFFFFFFFF]] = \
+                    list(self._counts[col].values())
+            counts[col] = col_counts
+
+            col_first_rows = np.full((n_years, n_cats + 1), len(years), dtype=np.int64)
+            keys = np.array(list(self._first_ranks[col]), dtype=np.int64)
+            key_years = (keys >> 32) - min_year
+            # Code + 1 : 0 pour les valeurs manquantes, rangées dans la dernière colonne
+            key_codes = (keys & 0xFFFFFFFF) - 1
+            key_codes = np.where(key_codes >= 0, remap[key_codes], n_cats)
+            col_first_rows[key_years, key_codes] = year_offsets[key_years] + \
+                np.array(list(self._first_ranks[col].values()), dtype=np.int64)
+            first_rows[col] = col_first_rows
+
+        cube = CountCube.from_counts(min_year, row_counts, {col: labels[col] for col in self.columns},
+                                     counts, first_rows)
+        return data, cube
+
+
+class DataState(namedtuple('DataState', ['data', 'cube', 'year_index', 'version'])):
+    """
+    Données prétraitées et index construits sur ces données. L'état est immuable : une mise à
+    jour en construit un nouveau et le remplace en une seule affectation, si bien qu'un callback
+    qui a lu l'état continue de travailler sur des données, un cube et un index cohérents.
+    """
+    __slots__ = ()
+
+
 class DataLoader():
 
     def __init__(self):
-        self.data = None
+        self._state = DataState(None, None, None, 0)
+        self._cache_path = None
+        self._preprocessed = False
+        self._source_path = None
+        self._chunksize = None
+        # Empreinte des lignes de chaque année du fichier source (voir track_source)
+        self._source_digests = None
+        self._source_stat = None
+        self._source_hash = None
+        # Prochain identifiant de ligne : les lignes ajoutées ne réutilisent jamais un identifiant
+        self._next_row_id = None
+        self._update_lock = threading.Lock()
+
+    @property
+    def data(self):
+        return self._state.data
+
+    @data.setter
+    def data(self, data):
+        self._set_state(data=data)
+
+    @property
+    def cube(self):
+        return self._state.cube
+
+    @cube.setter
+    def cube(self, cube):
+        self._set_state(cube=cube)
+
+    @property
+    def year_index(self):
+        return self._state.year_index
+
+    @year_index.setter
+    def year_index(self, year_index):
+        self._set_state(year_index=year_index)
+
+    def _set_state(self, **fields):
+        """Remplace l'état par une nouvelle version (une seule affectation)."""
+        state = self._state
+        self._state = state._replace(version=state.version + 1, **fields)
+
+    def load_data(self, path, use_cache=True, chunksize=None):
+        """
+        Charge le CSV. Si un cache binaire du résultat prétraité existe pour ce contenu
+        (même empreinte SHA-256), il est chargé directement et preprocess_data n'a plus rien à faire.
+
+        Args:
+            path (str): Chemin du fichier CSV
+            use_cache (bool): Si False, ignore le cache binaire et relit toujours le CSV
+            chunksize (int): Si fourni, le CSV est lu et prétraité par blocs de chunksize lignes
+                (voir ChunkAccumulator) : la mémoire de pointe ne dépend plus que des données compactes
+        """
+        self._cache_path = self.get_cache_path(path) if use_cache else None
+        self._preprocessed = False
+        self._source_path = path
+        self._chunksize = chunksize
+        self._source_digests = None
+        self._next_row_id = None
+        self._set_state(cube=None, year_index=None)
 
-    def load_data(self, path):
+        if self._cache_path is not None and os.path.exists(self._cache_path):
+            try:
+                self.data = pd.read_pickle(self._cache_path)
+                self._preprocessed = True
+                return
+            except Exception:
+                # Cache illisible (fichier tronqué, version de pandas différente...) : on le régénère
+                pass
+
+        if chunksize:
+            self._load_chunks(path, chunksize)
+            return
         self.data = pd.read_csv(path)
-    
-    def preprocess_data(self):
-        self.data['Birth_Date'] = pd.to_datetime(self.data['Birth_Date'], format='%Y-%m-%d', errors='coerce')
-        self.data['Ceremony_Date'] = pd.to_datetime(self.data['Year_Ceremony'], format='%Y').apply(lambda x: x.replace(month=3, day=1))
-        self.data['Age'] = ((self.data['Ceremony_Date'] - self.data['Birth_Date']).dt.days / 365.25).apply(math.floor, 0)
+
+    def _load_chunks(self, path, chunksize):
+        """Lit et prétraite le CSV bloc par bloc, puis construit les données compactes et les index."""
+        accumulator = ChunkAccumulator()
+        for chunk in self._read_chunks(path, chunksize):
+            accumulator.add(self._preprocess_rows(chunk))
+        data, cube = accumulator.finish()
+        self._set_state(data=data, cube=cube)
+        self._preprocessed = True
+        if self._cache_path is not None:
+            self._write_cache()
+        year_index = YearIndex.sort(data)
+        self._set_state(data=year_index.data, year_index=year_index)
+
+    @staticmethod
+    def _read_chunks(path, chunksize):
+        """
+        Blocs de lignes du CSV (chemin ou fichier en mémoire). Les colonnes supprimées au prétraitement
+        ne sont même pas lues. Les types ne sont pas déduits bloc par bloc : un titre de film comme
+        « 1917 » doit rester un texte dans tous les blocs
+        """
+        names = pd.read_csv(path, nrows=0).columns
+        if hasattr(path, 'seek'):
+            path.seek(0)
+        text_columns = {name: str for name in names if name not in ('Year_Ceremony', 'Win_Oscar?')}
+        return pd.read_csv(path, chunksize=chunksize, dtype=text_columns,
+                           usecols=lambda name: name not in ('Birth_Place', 'Link'))
+
+    @staticmethod
+    def get_cache_path(path):
+        """
+        Chemin du cache binaire associé au CSV, placé à côté de celui-ci et
+        identifié par l'empreinte du contenu du fichier.
+        """
+        digest = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return f'{os.path.splitext(path)[0]}.{digest.hexdigest()[:16]}.pkl'
+
+    def _write_cache(self):
+        """Écrit le cache binaire de manière atomique et supprime les caches obsolètes du même CSV."""
+        # <csv sans extension>.<empreinte>.pkl
+        prefix = self._cache_path.rsplit('.', 2)[0]
+        tmp_path = f'{self._cache_path}.{os.getpid()}.tmp'
+        try:
+            self.data.to_pickle(tmp_path)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            # Dossier en lecture seule : on continue sans cache
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        for stale in glob.glob(glob.escape(prefix) + '.*.pkl'):
+            if stale != self._cache_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    def write_columnar(self, path):
+        """
+        Écrit les données prétraitées dans un dossier colonnaire lisible par load_columnar :
+        un fichier .npy par colonne et un meta.json qui décrit les colonnes.
+        Les colonnes textuelles sont encodées par dictionnaire (codes entiers + liste des valeurs),
+        les colonnes numériques sont stockées en entiers de largeur fixe. Les lignes sont écrites
+        rangées par (gagnant, année), avec la table des positions par année (voir YearIndex) :
+        load_columnar n'a rien à réordonner.
+
+        Args:
+            path (str): Dossier de destination (remplacé de manière atomique s'il existe)
+        """
+        if not self._preprocessed:
+            raise ValueError("Les données doivent être prétraitées avant d'être converties")
+        self.preprocess_data()
+
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        os.makedirs(tmp_path)
+        columns = []
+        for i, (name, series) in enumerate(self.data.items()):
+            column = {'name': name}
+            if series.dtype == object:
+                series = series.astype('category')
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Les codes gardent le type entier choisi par pandas pour ce nombre de catégories,
+                # ce qui permet de les relire sans copie
+                column.update(kind='category', categories=series.cat.categories.tolist(),
+                              values=f'{i:02d}_codes.npy')
+                np.save(os.path.join(tmp_path, column['values']), series.cat.codes.to_numpy())
+            elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and series.dtype.kind in 'iu':
+                # Entiers nullables (Int16) : valeurs + masque des valeurs manquantes
+                column.update(kind='nullable_int', values=f'{i:02d}_values.npy', mask=f'{i:02d}_mask.npy')
+                np.save(os.path.join(tmp_path, column['values']),
+                        series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0))
+                np.save(os.path.join(tmp_path, column['mask']), series.isna().to_numpy())
+            elif series.dtype.kind in 'biu':
+                column.update(kind='array', values=f'{i:02d}_values.npy')
+                np.save(os.path.join(tmp_path, column['values']), series.to_numpy())
+            else:
+                shutil.rmtree(tmp_path)
+                raise ValueError(f"Type de colonne non supporté pour le format colonnaire : {name} ({series.dtype})")
+            columns.append(column)
+
+        np.save(os.path.join(tmp_path, 'year_positions.npy'), self.year_index.year_positions)
+        meta = {'format_version': COLUMNAR_FORMAT_VERSION, 'n_rows': len(self.data), 'columns': columns,
+                'year_positions': 'year_positions.npy'}
+        with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+
+    def load_columnar(self, path):
+        """
+        Ouvre un dossier écrit par write_columnar. Les colonnes sont projetées en mémoire (mmap,
+        lecture seule) sans copie : plusieurs processus qui ouvrent le même dossier partagent
+        les mêmes pages physiques. Seuls les dictionnaires des colonnes textuelles sont chargés
+        dans chaque processus.
+
+        Args:
+            path (str): Dossier colonnaire
+        """
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Version du format colonnaire non supportée : {meta.get('format_version')}")
+
+        def load(filename):
+            return np.load(os.path.join(path, filename), mmap_mode='r')
+
+        columns = {}
+        for column in meta['columns']:
+            if column['kind'] == 'category':
+                columns[column['name']] = pd.Categorical.from_codes(
+                    load(column['values']), dtype=pd.CategoricalDtype(column['categories']))
+            elif column['kind'] == 'nullable_int':
+                columns[column['name']] = pd.arrays.IntegerArray(load(column['values']), load(column['mask']))
+            else:
+                columns[column['name']] = load(column['values'])
+
+        # copy=False : chaque colonne reste un bloc distinct adossé au fichier projeté
+        data = pd.DataFrame(columns, copy=False)
+        # Lignes déjà rangées par (gagnant, année) : l'index est construit sur les colonnes projetées
+        self._set_state(data=data, cube=None, year_index=YearIndex(data, load(meta['year_positions'])))
+        self._cache_path = None
+        self._source_path = None
+        self._source_digests = None
+        self._next_row_id = None
+        self._preprocessed = True
+
+    def _compact_dtypes(self):
+        """Convertit les colonnes en types compacts : catégories pour le texte et les âges, int16 pour les années."""
+        for col in CATEGORICAL_COLUMNS:
+            self.data[col] = self.data[col].astype('category')
+        self.data['Year_Ceremony'] = self.data['Year_Ceremony'].astype(np.int16)
+
+    @staticmethod
+    def _age_buckets(ceremony_years, birth_dates):
+        """
+        Âge à la cérémonie (1er mars de l'année), regroupé en tranches de 10 ans.
+
+        floor(jours / 365.25) est calculé exactement en entiers : (4 * jours) // 1461.
+        Les dates de naissance manquantes donnent un âge manquant (type Int16 nullable).
+        """
+        # 1er mars de l'année de la cérémonie : janvier de l'année + 2 mois
+        ceremony_dates = (np.asarray(ceremony_years, dtype=np.int64) - 1970).astype('datetime64[Y]')
+        ceremony_dates = (ceremony_dates.astype('datetime64[M]') + 2).astype('datetime64[D]')
+        birth_dates = np.asarray(birth_dates).astype('datetime64[D]')
+
+        missing = np.isnat(birth_dates)
+        days = (ceremony_dates - birth_dates).astype(np.int64)
+        ages = (4 * days) // 1461
         # Regrouper dans des tranches d'âges de 10 ans
-        self.data['Age'] = (self.data['Age'] // 10) * 10
-        self.data = self.data.drop(columns=['Birth_Date', 'Birth_Place', 'Ceremony_Date', 'Link', 'Ceremony_Date'])
+        buckets = ((ages // 10) * 10).astype(np.int16)
+        if missing.any():
+            return pd.arrays.IntegerArray(buckets, missing)
+        return buckets
+
+    def preprocess_data(self):
+        if self._preprocessed:
+            # Données déjà prétraitées (chargées depuis le cache binaire)
+            if self.cube is None or self.year_index is None:
+                self._build_indexes()
+            return self.data
+
+        self.data = self._preprocess_rows(self.data)
+        self._compact_dtypes()
+        self._sort_by_year()
+        self._preprocessed = True
+        if self._cache_path is not None:
+            self._write_cache()
+        self._build_indexes()
         return self.data
+
+    def _preprocess_rows(self, data):
+        """Ajoute la tranche d'âge et retire les colonnes inutilisées (fichier entier ou bloc de lignes)."""
+        # Opérations vectorisées sur des tableaux datetime64, sans boucle Python par ligne
+        birth_dates = pd.to_datetime(data['Birth_Date'], format='%Y-%m-%d', errors='coerce').to_numpy()
+        data['Age'] = self._age_buckets(data['Year_Ceremony'].to_numpy(), birth_dates)
+        return data.drop(columns=['Birth_Date', 'Birth_Place', 'Link'], errors='ignore')
+
+    def _sort_by_year(self):
+        """Trie les lignes par année ; le tri est stable, l'ordre d'origine est conservé dans chaque année."""
+        if not self.data['Year_Ceremony'].is_monotonic_increasing:
+            self.data = self.data.sort_values('Year_Ceremony', kind='stable')
+
+    def _build_indexes(self):
+        # Précalcul des comptes pour répondre aux callbacks sans refaire de groupby, et
+        # positions de chaque (gagnant, année) pour filtrer par découpage
+        state = self._state
+        if state.year_index is not None:
+            # Données déjà rangées par (gagnant, année) (dossier colonnaire) : seul le cube manque
+            self._set_state(cube=CountCube(state.data, order=state.year_index.year_positions))
+            return
+        self._sort_by_year()
+        data = self.data
+        year_index = YearIndex.sort(data)
+        self._set_state(data=year_index.data, cube=CountCube(data), year_index=year_index)
+
+    def get_year_range(self):
+        """Première et dernière année des données : [début, fin]."""
+        state = self._state
+        if state.cube is not None:
+            return [state.cube.min_year, state.cube.max_year]
+        years = state.data['Year_Ceremony']
+        return [int(years.min()), int(years.max())]
+
+    def append_rows(self, rows):
+        """
+        Ajoute des lignes au format du CSV (par exemple les prix d'une nouvelle cérémonie) sans relire
+        ni modifier le fichier source. Dans chaque année, les lignes ajoutées suivent les lignes existantes.
+        Seuls les comptes des années concernées sont recalculés (voir CountCube.updated).
+
+        Args:
+            rows (pandas.DataFrame): Lignes à ajouter, avec les colonnes du CSV
+
+        Returns:
+            list: Années modifiées
+        """
+        rows = self._preprocess_rows(rows.copy())
+        changed = sorted(set(rows['Year_Ceremony'].astype(int).tolist()))
+        with self._update_lock:
+            self._replace_years(rows, changed, keep_existing=True)
+        return changed
+
+    def track_source(self):
+        """
+        Mémorise l'empreinte des lignes de chaque année du fichier source (celui passé à load_data) :
+        refresh ne retraitera ensuite que les années dont les lignes ont changé.
+        """
+        if self._source_path is None:
+            raise ValueError("Aucun fichier source : les données n'ont pas été chargées depuis un CSV")
+        path = self._source_path
+        self._source_stat = self._stat(path)
+        self._source_hash = self._hash_file(path)
+        self._source_digests = self._year_digests(self._read_chunks(path, self._chunksize or REFRESH_CHUNK_SIZE))
+
+    def refresh(self):
+        """
+        Relit le fichier source et applique ses modifications sans redémarrer l'application : seules
+        les lignes des années ajoutées, modifiées ou supprimées sont prétraitées, et seuls leurs comptes
+        sont recalculés. Si le fichier n'a fait que s'allonger (lignes ajoutées à la fin), seule la fin
+        du fichier est lue. Le nouvel état remplace l'ancien en une seule affectation.
+
+        Returns:
+            list: Années modifiées (liste vide si aucune ligne n'a changé)
+        """
+        with self._update_lock:
+            if self._source_digests is None:
+                # Premier appel : l'empreinte du fichier sert de référence
+                self.track_source()
+                return []
+            path = self._source_path
+            chunksize = self._chunksize or REFRESH_CHUNK_SIZE
+            stat = self._stat(path)
+            tail, file_hash = self._read_appended(path)
+            if tail is not None:
+                # Les lignes ajoutées complètent leurs années, les autres lignes n'ont pas changé
+                chunks = list(self._read_chunks(tail, chunksize))
+                digests = self._year_digests(chunks, self._source_digests)
+                changed = sorted(set().union(*(chunk['Year_Ceremony'].astype(int).tolist() for chunk in chunks)))
+                if changed:
+                    self._replace_years(self._preprocess_rows(pd.concat(chunks)), changed, keep_existing=True)
+            else:
+                # Fichier réécrit : comparaison des empreintes de chaque année, puis relecture de leurs lignes
+                file_hash = self._hash_file(path)
+                chunks = self._read_chunks(path, chunksize)
+                if not self._chunksize:
+                    # Sans chunksize, le fichier entier tient en mémoire : il n'est lu qu'une fois
+                    chunks = list(chunks)
+                digests = self._year_digests(chunks)
+                previous = {year: digest.digest() for year, digest in self._source_digests.items()}
+                changed = sorted(year for year in set(digests) | set(previous)
+                                 if year not in digests or digests[year].digest() != previous.get(year))
+                if changed:
+                    if self._chunksize:
+                        chunks = self._read_chunks(path, chunksize)
+                    rows = [chunk[chunk['Year_Ceremony'].isin(changed).to_numpy()].copy() for chunk in chunks]
+                    self._replace_years(self._preprocess_rows(pd.concat(rows)), changed)
+            self._source_stat, self._source_hash, self._source_digests = stat, file_hash, digests
+            return changed
+
+    def watch(self, interval, on_change=None):
+        """
+        Surveille le fichier source dans un thread démon : lorsque sa date de modification ou sa taille
+        change, refresh est appelé, puis on_change(années modifiées) si des lignes ont changé.
+
+        Args:
+            interval (float): Délai entre deux vérifications, en secondes
+            on_change (callable, optional): Appelé après chaque mise à jour des données
+
+        Returns:
+            threading.Thread: Le thread de surveillance
+        """
+        if self._source_digests is None:
+            self.track_source()
+
+        def poll():
+            failed_stat = None
+            while True:
+                time.sleep(interval)
+                stat = self._stat(self._source_path)
+                if stat == self._source_stat or stat == failed_stat:
+                    continue
+                try:
+                    changed = self.refresh()
+                except Exception:
+                    # Fichier en cours d'écriture ou invalide : nouvel essai à sa prochaine modification
+                    failed_stat = stat
+                    traceback.print_exc()
+                    continue
+                if changed and on_change is not None:
+                    on_change(changed)
+
+        thread = threading.Thread(target=poll, name='dataloader-watch', daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _stat(path):
+        """Date de modification et taille du fichier (None s'il n'existe pas, par exemple pendant son remplacement)."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _hash_file(path, size=None):
+        """Empreinte SHA-256 (objet hashlib, prolongeable) des `size` premiers octets du fichier."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            remaining = os.path.getsize(path) if size is None else size
+            while remaining > 0:
+                block = f.read(min(1 << 20, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest
+
+    def _read_appended(self, path):
+        """
+        Si le fichier source n'a fait que s'allonger depuis la dernière lecture (contenu précédent
+        intact et terminé par une fin de ligne), retourne (en-tête + lignes ajoutées sous forme de
+        fichier en mémoire, empreinte du fichier complet). Sinon, retourne (None, None).
+        """
+        size = os.path.getsize(path)
+        previous_size = self._source_stat[1] if self._source_stat else None
+        if previous_size is None or size <= previous_size:
+            return None, None
+        with open(path, 'rb') as f:
+            header = f.readline()
+            f.seek(previous_size - 1)
+            tail = f.read(size - previous_size + 1)
+        if not tail.startswith(b'\n') or self._hash_file(path, previous_size).digest() != self._source_hash.digest():
+            return None, None
+        file_hash = self._source_hash.copy()
+        file_hash.update(tail[1:])
+        return io.BytesIO(header + tail[1:]), file_hash
+
+    @staticmethod
+    def _year_digests(chunks, previous=None):
+        """
+        Empreinte des lignes de chaque année, dans l'ordre du fichier : {année: objet hashlib}.
+        Les empreintes `previous` sont prolongées (copiées) avec les lignes des blocs.
+        """
+        digests = {}
+        for chunk in chunks:
+            years = chunk['Year_Ceremony'].to_numpy(dtype=np.int64)
+            row_hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+            order = np.argsort(years, kind='stable')
+            unique_years, starts = np.unique(years[order], return_index=True)
+            for year, year_hashes in zip(unique_years.tolist(), np.split(row_hashes[order], starts[1:])):
+                if year not in digests:
+                    base = (previous or {}).get(year)
+                    digests[year] = base.copy() if base is not None else hashlib.blake2b(digest_size=16)
+                digests[year].update(year_hashes.tobytes())
+        if previous is None:
+            return digests
+        return {**previous, **digests}
+
+    def _replace_years(self, rows, years, keep_existing=False):
+        """
+        Construit et installe le nouvel état : les lignes des années `years` sont remplacées par `rows`
+        (ou complétées si keep_existing), les autres lignes sont reprises telles quelles. Les lignes
+        reprises gardent leur identifiant (index), les nouvelles en reçoivent un jamais utilisé.
+        """
+        state = self._state
+        if not self._preprocessed or state.cube is None:
+            raise ValueError("Les données doivent être prétraitées avant d'être mises à jour")
+        # Lignes dans l'ordre des données (par année)
+        old = state.data.iloc[state.year_index.year_positions]
+        if self._next_row_id is None:
+            self._next_row_id = int(old.index.max()) + 1 if len(old) else 0
+        kept = old if keep_existing else old[~old['Year_Ceremony'].isin(years).to_numpy()]
+        rows = rows.set_axis(pd.RangeIndex(self._next_row_id, self._next_row_id + len(rows)))
+        rows = rows.astype({'Year_Ceremony': old['Year_Ceremony'].dtype, 'Win_Oscar?': bool})
+
+        columns = {}
+        for name, column in kept.items():
+            new_column = rows[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Étiquettes existantes complétées des nouvelles (les codes des lignes reprises ne sont
+                # renumérotés que si une nouvelle étiquette s'intercale)
+                categories = column.cat.categories
+                new_labels = pd.Index(new_column.dropna().unique())
+                if len(new_labels.difference(categories)):
+                    categories = categories.union(new_labels.astype(categories.dtype))
+                    column = column.cat.set_categories(categories)
+                new_column = pd.Series(pd.Categorical(new_column, categories=categories), index=rows.index)
+            columns[name] = pd.concat([column, new_column])
+        data = pd.DataFrame(columns)
+        # Tri stable : dans chaque année, les lignes reprises précèdent les nouvelles
+        if not data['Year_Ceremony'].is_monotonic_increasing:
+            data = data.iloc[np.argsort(data['Year_Ceremony'].to_numpy(), kind='stable')]
+
+        year_index = YearIndex.sort(data)
+        self._state = DataState(year_index.data, state.cube.updated(data, years), year_index, state.version + 1)
+        self._next_row_id += len(rows)
+
+    def _cube_query(self, data, columns):
+        """
+        Retourne (cube, requête (start_year, end_year, is_winner)) si le cube peut répondre pour
+        `data`, sinon None. La décision repose uniquement sur la requête et la version des données
+        enregistrées par filter_data : seuls les DataFrames issus directement de filter_data
+        (éventuellement restreints à certaines colonnes) et de la version courante des données sont
+        servis par le cube ; un DataFrame filtré avant un rafraîchissement est agrégé à partir de ses lignes.
+        """
+        query = data.attrs.get('filter_query')
+        version = data.attrs.get('data_version')
+        state = self._state
+        if state.cube is None or query is None or version is None or version != state.version:
+            return None
+        if any(col not in state.cube.prefix for col in columns):
+            return None
+        return state.cube, query
     
     def filter_data(self, start_year, end_year, is_winner=None):
         """
@@ -46,20 +1083,37 @@ class DataLoader():
                                       Si None, les gagnants et les nominés sont inclus.
         
         Returns:
-            pandas.DataFrame: Le dataframe filtré
+            pandas.DataFrame: Le dataframe filtré, dans l'ordre des données (une vue des données avec un
+                filtre de gagnant : à copier avant toute modification)
         """
-        filtered_df = self.data[(self.data['Year_Ceremony'] >= start_year) & 
-                              (self.data['Year_Ceremony'] <= end_year)]
-        
-        # Appliquer le filtre de gagnant si spécifié
-        if is_winner is not None:
-            filtered_df = filtered_df[filtered_df['Win_Oscar?'] == is_winner]
+        # Une seule lecture de l'état : les données et l'index proviennent de la même version
+        state = self._state
+        if state.year_index is not None:
+            # Données prétraitées : deux positions précalculées, tranche sans copie
+            filtered_df = state.year_index.select(start_year, end_year, is_winner)
+        else:
+            filtered_df = state.data[(state.data['Year_Ceremony'] >= start_year) & 
+                                   (state.data['Year_Ceremony'] <= end_year)]
             
+            # Appliquer le filtre de gagnant si spécifié
+            if is_winner is not None:
+                filtered_df = filtered_df[filtered_df['Win_Oscar?'] == is_winner]
+
+        # Mémoriser la requête pour que les agrégations puissent utiliser le cube de comptes
+        filtered_df.attrs['filter_query'] = (start_year, end_year, is_winner)
+        filtered_df.attrs['data_version'] = state.version
         return filtered_df
     
-    def get_unique_distribution(self, data):
+    def get_unique_distribution(self, data, columns=None):
         """ 
         Calcule la distribution des valeurs uniques pour chaque colonne.
+        Toutes les colonnes sont calculées en un seul appel (cube de comptes ou codes des catégories),
+        sans copier le DataFrame. Pour une seule colonne, utiliser get_column_distribution.
+
+        Args:
+            data (pandas.DataFrame): Données filtrées
+            columns (list, optional): Colonnes à calculer. Par défaut, toutes sauf
+                                      'Category', 'Name', 'Film', 'Year_Ceremony' et 'Win_Oscar?'
         
         Exemple de résultat attendu:
         (
@@ -71,19 +1125,45 @@ class DataLoader():
         'Lesbian': 2},
         275)
         """
-        df = data.copy()    
-        df.drop(columns=['Category', 'Name', 'Film', 'Year_Ceremony', 'Win_Oscar?'], inplace=True)
-        df = df.reindex(sorted(df.columns), axis=1)
+        if columns is None:
+            columns = [col for col in data.columns
+                       if col not in ['Category', 'Name', 'Film', 'Year_Ceremony', 'Win_Oscar?']]
+        cube_query = self._cube_query(data, columns)
+        result_dict = {col: self._column_distribution(data, col, cube_query) for col in sorted(columns)}
+        return result_dict, len(data)
 
-        result_dict = {}
-        for col in df.columns:
-            result_dict[col] = df.groupby(col).size().to_dict()
-            result_dict[col] = dict(sorted(result_dict[col].items(), key=lambda item: item[1], reverse=True))
-
-        total = len(df)
+    def get_column_distribution(self, data, column):
+        """
+        Distribution des valeurs d'une seule colonne, {valeur: effectif} triée par effectif décroissant.
+        Équivalent de get_unique_distribution(data)[0][column], sans calculer les autres colonnes.
+        """
+        return self._column_distribution(data, column, self._cube_query(data, [column]))
 
-        return result_dict, total
+    def _column_distribution(self, data, column, cube_query):
+        if cube_query is not None:
+            cube, query = cube_query
+            counts, labels = cube.counts(column, *query), cube.labels[column]
+        else:
+            # Comptes sur les codes entiers des catégories (les valeurs manquantes, code -1, sont ignorées)
+            codes, labels = get_codes(data[column])
+            counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        # Effectifs décroissants ; à effectif égal, les étiquettes restent dans l'ordre (tri stable)
+        order = np.argsort(-counts, kind='stable')
+        return {labels[i]: count for i, count in zip(order.tolist(), counts[order].tolist()) if count > 0}
     
+    def get_winner_counts(self, start_year, end_year, column):
+        """
+        Effectifs des nominés et des gagnants par catégorie sur une plage d'années (Sankey), obtenus
+        par différence des sommes cumulatives du cube, sans parcourir les lignes.
+        Même résultat que count_winners(self.filter_data(start_year, end_year), column).
+        """
+        cube = self.cube
+        if cube is None or column not in cube.prefix:
+            return count_winners(self.filter_data(start_year, end_year), column)
+        return (cube.first_appearance(column, start_year, end_year), cube.labels[column],
+                cube.counts(column, start_year, end_year),
+                cube.counts(column, start_year, end_year, is_winner=True))
+
     def get_yearly_distribution(self, data, selected_categories=None, time_granularity=1):
         """
         Fonction qui retourne un dictionnaire contenant la distribution des valeurs uniques pour chaque année ou période.
@@ -103,36 +1183,75 @@ class DataLoader():
         dict
             Dictionnaire de la forme {période: {catégorie1: valeur1, catégorie2: valeur2, ...}}
         """
-        df = data.copy()
-        
-        # Appliquer la granularité temporelle
-        if time_granularity > 1:
-            # Arrondir les années à la granularité spécifiée
-            # Par exemple: pour time_granularity=10, 1928 -> 1920, 1934 -> 1930
-            df['Year_Ceremony'] = (df['Year_Ceremony'] // time_granularity) * time_granularity
-        
-        df = df.groupby(['Year_Ceremony', df.columns[1]]).size().unstack(fill_value=0)
-        df = df.astype(int)
-        df = df.reindex(sorted(df.columns), axis=1)
-        distribution_dict = {year: row.to_dict() for year, row in df.iterrows()}
-        # Trier par année
-        distribution_dict = dict(sorted(distribution_dict.items(), key=lambda item: item[0]))
+        return self._to_distribution_dict(self.get_yearly_counts(data, selected_categories, time_granularity),
+                                          selected_categories)
+
+    def get_yearly_counts(self, data, selected_categories=None, time_granularity=1):
+        """
+        Variante de get_yearly_distribution qui retourne des tableaux au lieu d'un dictionnaire imbriqué.
+
+        Retourne:
+        --------
+        YearlyCounts
+            Périodes triées, catégories et matrice des comptes (période x catégorie)
+        """
+        column = data.columns[1]
+        cube_query = self._cube_query(data, [column])
+        if cube_query is not None:
+            periods, labels, counts = self._yearly_counts_from_cube(*cube_query, column, time_granularity)
+        else:
+            df = data.copy()
+
+            # Appliquer la granularité temporelle
+            if time_granularity > 1:
+                # Arrondir les années à la granularité spécifiée
+                # Par exemple: pour time_granularity=10, 1928 -> 1920, 1934 -> 1930
+                df['Year_Ceremony'] = (df['Year_Ceremony'] // time_granularity) * time_granularity
+
+            df = df.groupby(['Year_Ceremony', column], observed=True).size().unstack(fill_value=0)
+            df = df.reindex(sorted(df.columns), axis=1).sort_index()
+            periods, labels, counts = df.index.to_numpy(), df.columns.tolist(), df.to_numpy(dtype=np.int64)
 
+        if selected_categories is None:
+            return YearlyCounts(periods, labels, counts)
+
+        # Ne garder que les catégories sélectionnées présentes dans les données, dans l'ordre de la sélection.
         # Si nécessaire, on ajoute une catégorie "Autre" qui contient la somme des autres catégories
-        need_other = False
-        if selected_categories is not None:
-            if 'Other' in selected_categories:
-                selected_categories.remove('Other')
-                need_other = True
+        positions = {label: i for i, label in enumerate(labels)}
+        selected = [key for key in selected_categories if key != 'Other' and key in positions]
+        selected_counts = counts[:, [positions[key] for key in selected]]
+        if 'Other' in selected_categories:
+            other = counts.sum(axis=1) - selected_counts.sum(axis=1)
+            return YearlyCounts(periods, selected + ['Other'], np.column_stack([selected_counts, other]))
+        return YearlyCounts(periods, selected, selected_counts)
 
-        if selected_categories is not None:
-            for year, distribution in distribution_dict.items():
-                filtered_distribution = {key: distribution[key] for key in selected_categories if key in distribution}
-                if need_other:
-                    filtered_distribution['Other'] = sum(value for key, value in distribution.items() if key not in selected_categories)
-                distribution_dict[year] = filtered_distribution
+    @staticmethod
+    def _yearly_counts_from_cube(cube, query, column, time_granularity=1):
+        """
+        Équivalent de la table année x catégorie du groupby, calculé à partir du cube.
+        Seules les périodes et catégories présentes dans les données filtrées sont conservées.
+        """
+        years, counts = cube.yearly_counts(column, *query)
+        periods = (years // time_granularity) * time_granularity
+        # Regrouper les années consécutives d'une même période (les années sont triées)
+        unique_periods, starts = np.unique(periods, return_index=True)
+        if len(unique_periods):
+            counts = np.add.reduceat(counts, starts, axis=0)
+        else:
+            counts = counts[:0]
 
-        return distribution_dict
+        kept_periods = counts.sum(axis=1) > 0
+        kept_labels = counts.sum(axis=0) > 0
+        labels = [label for label, kept in zip(cube.labels[column], kept_labels) if kept]
+        return unique_periods[kept_periods], labels, counts[np.ix_(kept_periods, kept_labels)]
+
+    @staticmethod
+    def _to_distribution_dict(yearly_counts, selected_categories=None):
+        """Adaptateur vers l'ancien format {période: {catégorie: compte}}."""
+        # Comme auparavant, 'Other' est retiré de la liste passée par l'appelant
+        if selected_categories is not None and 'Other' in selected_categories:
+            selected_categories.remove('Other')
+        return yearly_counts.to_dict()
 
     def get_cumulative_yearly_distribution(self, data, selected_categories=None, time_granularity=1):
         """
@@ -153,28 +1272,14 @@ class DataLoader():
         dict
             Dictionnaire de la forme {période: {catégorie1: valeur_cumulative1, catégorie2: valeur_cumulative2, ...}}
         """
-        # D'abord, obtenir la distribution non-cumulative année par année
-        yearly_distribution = self.get_yearly_distribution(data, selected_categories, time_granularity)
-        
-        # Convertir en dataframe pour faciliter le calcul cumulatif
-        years = sorted(yearly_distribution.keys())
-        categories = list(set().union(*[d.keys() for d in yearly_distribution.values()]))
-        
-        # Créer un DataFrame vide avec années comme index et catégories comme colonnes
-        cumulative_df = pd.DataFrame(index=years, columns=categories).fillna(0)
-        
-        # Remplir avec les valeurs annuelles
-        for year, dist in yearly_distribution.items():
-            for category, count in dist.items():
-                cumulative_df.loc[year, category] = count
-        
-        # Calculer les valeurs cumulatives
-        cumulative_df = cumulative_df.cumsum()
-        
-        # Convertir le DataFrame en dictionnaire
-        cumulative_dict = {year: row.to_dict() for year, row in cumulative_df.iterrows()}
-        
-        return cumulative_dict
+        return self._to_distribution_dict(self.get_cumulative_yearly_counts(data, selected_categories, time_granularity),
+                                          selected_categories)
+
+    def get_cumulative_yearly_counts(self, data, selected_categories=None, time_granularity=1):
+        """
+        Variante de get_cumulative_yearly_distribution qui retourne un YearlyCounts cumulé.
+        """
+        return self.get_yearly_counts(data, selected_categories, time_granularity).cumsum()
 
 
 # def generate_color_dict():
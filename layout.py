@@ -1,7 +1,11 @@
 from dash import html, dcc
 
+# Granularité temporelle par défaut de la figure 4 (regrouper par 5 ans)
+DEFAULT_GRANULARITY = 5
 
-def create_figure_section(figure_id, title, graph_id, has_checklist=True, intervalle=[1928, 2025], font='Jost'):
+
+def create_figure_section(figure_id, title, graph_id, has_checklist=True, intervalle=[1928, 2025], font='Jost',
+                          figure=None, checklist_options=None, checklist_value=None, counts_data=None):
     """
     Génère un blueprint commun pour toutes les figures
     
@@ -10,6 +14,11 @@ def create_figure_section(figure_id, title, graph_id, has_checklist=True, interv
         title: Titre à afficher pour la figure
         graph_id: ID du graphique Dash
         has_checklist: Si True, inclut une checklist pour les catégories
+        figure: Figure initiale (pré-rendue) du graphique
+        checklist_options: Options initiales de la checklist
+        checklist_value: Valeur initiale de la checklist
+        counts_data: Si fourni, ajoute un dcc.Store (id counts-store_fig_N) initialisé avec ces comptes,
+                     utilisés par le rendu côté navigateur de la figure
         
     Returns:
         Une section de figure complète avec les contrôles
@@ -24,7 +33,7 @@ def create_figure_section(figure_id, title, graph_id, has_checklist=True, interv
                 {'label': 'Par 5 ans', 'value': 5},
                 {'label': 'Par décennie', 'value': 10}
             ],
-            value=5,  # Valeur par défaut: regrouper par 5 ans
+            value=DEFAULT_GRANULARITY,  # Valeur par défaut: regrouper par 5 ans
             inline=True,
             className='radio-filter'
         )
@@ -50,8 +59,8 @@ def create_figure_section(figure_id, title, graph_id, has_checklist=True, interv
         html.P('Filtres:'),
         dcc.Checklist(
             id=f'category-checklist_fig_{figure_id}',
-            options=[],
-            value=[],
+            options=checklist_options or [],
+            value=checklist_value or [],
             inline=True,
             className='dash-checklist'
         )
@@ -62,10 +71,10 @@ def create_figure_section(figure_id, title, graph_id, has_checklist=True, interv
         html.P('Années:'),
         dcc.RangeSlider(
             id=f'year-slider_fig_{figure_id}',
-            min=1928,
-            max=2025,
+            min=intervalle[0],
+            max=intervalle[1],
             step=1,
-            marks={i: '{}'.format(i) for i in range(1928, 2025, 10)},
+            marks={i: '{}'.format(i) for i in range(intervalle[0], intervalle[1], 10)},
             value=intervalle,
             allowCross=False
         )
@@ -125,10 +134,13 @@ def create_figure_section(figure_id, title, graph_id, has_checklist=True, interv
             ),
 
             # Graphique
-            dcc.Graph(id=graph_id, style={'width': '100%', 'margin': '40px 0'}),
+            dcc.Graph(id=graph_id, figure=figure or {}, style={'width': '100%', 'margin': '40px 0'}),
             
             # Controls
             controls,
+
+            # Comptes pour le rendu côté navigateur
+            *([dcc.Store(id=f'counts-store_fig_{figure_id}', data=counts_data)] if counts_data is not None else []),
             
         ], style={'width': '100%', 'margin': '0 auto'}),
     ],
@@ -0,0 +1,319 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import nullcontext
+from functools import wraps
+from itertools import accumulate
+
+from flask import Response, jsonify, request
+
+
+# Clé des requêtes dont la sortie ne correspond à aucun callback enregistré
+UNKNOWN_OUTPUT = 'inconnu'
+
+
+class RequestCounter():
+    """
+    Compte les allers-retours serveur des callbacks Dash (requêtes vers /_dash-update-component),
+    par sortie de callback.
+
+    Args:
+        enabled (bool): Active le comptage (et la route /stats/requests, voir install_request_counter)
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, output):
+        with self._lock:
+            self._counts[output] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {'total': sum(self._counts.values()), 'callbacks': dict(self._counts)}
+
+
+def install_request_counter(server, counter, callback_map):
+    """
+    Enregistre un hook Flask qui compte chaque requête de callback reçue par le serveur, et la route
+    /stats/requests. Rien n'est enregistré si le comptage est désactivé.
+
+    Le corps de la requête n'est pas encore validé par Dash : seules les sorties de `callback_map`
+    (app.callback_map, consulté à chaque requête) sont comptées sous leur nom, les autres sous
+    UNKNOWN_OUTPUT, pour que le nombre de clés reste borné.
+    """
+    if not counter.enabled:
+        return counter
+
+    @server.before_request
+    def count_callback_request():
+        if request.method == 'POST' and request.path.endswith('/_dash-update-component'):
+            payload = request.get_json(silent=True)
+            output = payload.get('output') if isinstance(payload, dict) else None
+            counter.record(output if isinstance(output, str) and output in callback_map else UNKNOWN_OUTPUT)
+
+    @server.route('/stats/requests')
+    def request_stats():
+        return jsonify(counter.snapshot())
+
+    return counter
+
+
+# Bornes des histogrammes (bornes supérieures incluses, comme le label `le` de Prometheus)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BUCKETS = (1_000, 5_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000)
+
+# Étapes mesurées dans un callback. `other` : temps du callback hors étapes (consultation des caches...),
+# `serialization` : de la fin du callback à la réponse prête (encodage JSON par Dash)
+STAGES = ('filter', 'aggregate', 'figure', 'other', 'serialization')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram():
+    """Histogramme à bornes fixes : effectif par intervalle, somme et nombre des observations."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """Effectifs cumulés de chaque borne, puis +Inf (format Prometheus)."""
+        return list(accumulate(self.counts))
+
+
+class _CallbackRecord():
+    """Mesures de la requête de callback en cours dans un thread."""
+
+    __slots__ = ('callback', 'started', 'callback_started', 'callback_ended', 'stages', 'stack')
+
+    def __init__(self, started):
+        self.callback = None
+        self.started = started
+        self.callback_started = None
+        self.callback_ended = None
+        self.stages = {}
+        # Étapes en cours [nom, début] : le temps d'une étape imbriquée n'est compté que pour elle
+        self.stack = []
+
+
+class _Stage():
+
+    __slots__ = ('metrics', 'name')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        record = getattr(self.metrics._local, 'record', None)
+        if record is None:
+            return self
+        now = self.metrics._clock()
+        if record.stack:
+            parent = record.stack[-1]
+            record.stages[parent[0]] = record.stages.get(parent[0], 0.0) + now - parent[1]
+        record.stack.append([self.name, now])
+        return self
+
+    def __exit__(self, *exc):
+        record = getattr(self.metrics._local, 'record', None)
+        if record is None or not record.stack:
+            return False
+        now = self.metrics._clock()
+        name, started = record.stack.pop()
+        record.stages[name] = record.stages.get(name, 0.0) + now - started
+        if record.stack:
+            record.stack[-1][1] = now
+        return False
+
+
+class CallbackMetrics():
+    """
+    Temps des callbacks Dash par étape (filtrage, agrégation, construction de la figure, sérialisation),
+    durée totale des requêtes et taille des réponses, agrégés en histogrammes et exportés au format
+    texte de Prometheus. Les mesures sont propres à chaque processus (un worker gunicorn par scrape).
+
+    Désactivé, instrument retourne la fonction telle quelle et stage un gestionnaire de contexte
+    vide partagé : le coût se limite à un appel de fonction par étape.
+
+    Args:
+        enabled (bool): Active les mesures
+        clock (callable): Horloge en secondes (remplaçable pour des tests hors ligne)
+    """
+
+    def __init__(self, enabled=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._durations = {}  # callback -> Histogram
+        self._stages = {}     # (callback, étape) -> Histogram
+        self._payloads = {}   # callback -> Histogram
+
+    def instrument(self, func):
+        """Décorateur d'un callback : ses étapes et sa durée sont enregistrées sous le nom de la fonction."""
+        if not self.enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            record = getattr(self._local, 'record', None)
+            # Appel hors requête (tests) : mesuré sans sérialisation ni taille de réponse
+            standalone = record is None
+            if standalone:
+                record = self.begin()
+            record.callback = func.__name__
+            record.callback_started = self._clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record.callback_ended = self._clock()
+                if standalone:
+                    self.finish()
+        return wrapper
+
+    def stage(self, name):
+        """Gestionnaire de contexte qui mesure une étape du callback en cours (voir STAGES)."""
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _Stage(self, name)
+
+    def begin(self):
+        """Début d'une requête de callback dans ce thread."""
+        record = _CallbackRecord(self._clock())
+        self._local.record = record
+        return record
+
+    def discard(self):
+        self._local.record = None
+
+    def finish(self, payload_bytes=None):
+        """Fin de la requête en cours : ses mesures sont ajoutées aux histogrammes."""
+        record = getattr(self._local, 'record', None)
+        self._local.record = None
+        if record is None or record.callback is None or record.callback_ended is None:
+            return
+        end = self._clock()
+        stages = dict(record.stages)
+        stages['other'] = max(record.callback_ended - record.callback_started - sum(stages.values()), 0.0)
+        if payload_bytes is not None:
+            stages['serialization'] = end - record.callback_ended
+
+        with self._lock:
+            self._histogram(self._durations, record.callback, LATENCY_BUCKETS).observe(end - record.started)
+            for stage, seconds in stages.items():
+                self._histogram(self._stages, (record.callback, stage), LATENCY_BUCKETS).observe(seconds)
+            if payload_bytes is not None:
+                self._histogram(self._payloads, record.callback, PAYLOAD_BUCKETS).observe(payload_bytes)
+
+    @staticmethod
+    def _histogram(histograms, key, buckets):
+        if key not in histograms:
+            histograms[key] = Histogram(buckets)
+        return histograms[key]
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._stages.clear()
+            self._payloads.clear()
+
+    def snapshot(self):
+        """Moyennes par callback : nombre de requêtes, durée, durée de chaque étape et taille des réponses."""
+        with self._lock:
+            result = {}
+            for callback, histogram in self._durations.items():
+                payload = self._payloads.get(callback)
+                result[callback] = {
+                    'count': histogram.count,
+                    'seconds': histogram.sum / histogram.count,
+                    'stages': {stage: stage_histogram.sum / stage_histogram.count
+                               for (name, stage), stage_histogram in self._stages.items() if name == callback},
+                    'response_bytes': payload.sum / payload.count if payload else None,
+                }
+            return result
+
+    def render(self):
+        """Histogrammes au format texte d'exposition de Prometheus."""
+        families = [
+            ('oscars_callback_duration_seconds', 'Durée des requêtes de callback Dash, sérialisation comprise.',
+             self._durations, ('callback',)),
+            ('oscars_callback_stage_seconds', 'Durée de chaque étape des callbacks Dash.',
+             self._stages, ('callback', 'stage')),
+            ('oscars_callback_response_bytes', 'Taille des réponses des callbacks Dash, en octets.',
+             self._payloads, ('callback',)),
+        ]
+        lines = []
+        with self._lock:
+            for metric, help_text, histograms, label_names in families:
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for key in sorted(histograms):
+                    histogram = histograms[key]
+                    values = key if isinstance(key, tuple) else (key,)
+                    labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(label_names, values))
+                    bounds = [_format_number(bound) for bound in histogram.buckets] + ['+Inf']
+                    for bound, count in zip(bounds, histogram.cumulative_counts()):
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_sum{{{labels}}} {_format_number(histogram.sum)}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+_DISABLED_STAGE = nullcontext()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value):
+    return repr(float(value))
+
+
+def install_callback_metrics(server, metrics):
+    """
+    Enregistre les hooks Flask qui délimitent chaque requête de callback (durée totale, sérialisation,
+    taille de la réponse) et la route /metrics. Rien n'est enregistré si les mesures sont désactivées.
+    """
+    if not metrics.enabled:
+        return metrics
+
+    def is_callback_request():
+        return request.method == 'POST' and request.path.endswith('/_dash-update-component')
+
+    @server.before_request
+    def begin_callback_metrics():
+        if is_callback_request():
+            metrics.begin()
+
+    @server.after_request
+    def finish_callback_metrics(response):
+        if is_callback_request():
+            metrics.finish(payload_bytes=response.calculate_content_length() or 0)
+        return response
+
+    @server.teardown_request
+    def discard_callback_metrics(exc):
+        metrics.discard()
+
+    @server.route('/metrics')
+    def prometheus_metrics():
+        return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    return metrics
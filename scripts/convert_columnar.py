@@ -0,0 +1,37 @@
+"""
+Convertit le CSV des nominations en dossier colonnaire projetable en mémoire (voir
+DataLoader.write_columnar), à servir ensuite avec OSCARS_COLUMNAR_PATH=<dossier>.
+
+    python -m scripts.convert_columnar [csv] [--output dossier]
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from helper import DataLoader  # noqa: E402
+
+CSV_PATH = os.path.join(ROOT, 'assets', 'The_Oscar_Award_Demographics_1928-2025 - The_Oscar_Award_Demographics_1928-2025_v3.csv')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv', nargs='?', default=CSV_PATH, help='CSV source (défaut : jeu de données de l\'application)')
+    parser.add_argument('--output', help='Dossier de sortie (défaut : <csv sans extension>.columns)')
+    args = parser.parse_args()
+
+    output = args.output or f'{os.path.splitext(args.csv)[0]}.columns'
+    dataloader = DataLoader()
+    dataloader.load_data(args.csv, use_cache=False)
+    dataloader.preprocess_data()
+    dataloader.write_columnar(output)
+
+    size = sum(entry.stat().st_size for entry in os.scandir(output))
+    print(f'{len(dataloader.data)} lignes, {len(dataloader.data.columns)} colonnes -> {output} ({size / 1e6:.2f} Mo)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Génère un jeu de données synthétique au format du CSV v3 (mêmes colonnes), de taille et de
+période quelconques, pour tester la montée en charge de DataLoader et des callbacks.
+
+Les profils (démographie, âge à la cérémonie, lieu de naissance) sont tirés dans le CSV livré
+pour la même catégorie et l'année correspondante (la période source est étirée sur la période
+demandée) : les proportions et leur évolution dans le temps sont conservées. Chaque prix réunit
+--nominees nominés dont un gagnant. Les lignes sont écrites par blocs : la mémoire utilisée ne
+dépend pas de la taille du fichier produit.
+
+    python -m scripts.generate_dataset sortie.csv [--rows 1000000] [--start-year 1928] [--end-year 2025]
+        [--categories 5] [--extra-values 0] [--seed 0]
+
+Un nom de fichier se terminant par .gz produit un CSV compressé.
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+CSV_PATH = os.path.join(ROOT, 'assets', 'The_Oscar_Award_Demographics_1928-2025 - The_Oscar_Award_Demographics_1928-2025_v3.csv')
+
+COLUMNS = ['Name', 'Category', 'Film', 'Win_Oscar?', 'Year_Ceremony', 'Birth_Date', 'Birth_Place',
+           'Gender', 'Race or Ethnicity', 'Sexual orientation', 'Religion', 'Link']
+# Colonnes tirées ensemble dans le CSV source, pour conserver leurs corrélations
+PROFILE_COLUMNS = ['Birth_Place', 'Gender', 'Race or Ethnicity', 'Sexual orientation', 'Religion']
+DEMOGRAPHIC_VALUE_COLUMNS = ['Gender', 'Race or Ethnicity', 'Sexual orientation', 'Religion']
+
+
+class DatasetGenerator():
+    """
+    Générateur de lignes synthétiques à partir des distributions du CSV source.
+
+    Attributs:
+        categories (list): Catégories de prix générées (celles de la source, puis 'CATEGORY N')
+        n_people (int): Nombre de personnes distinctes (une personne peut être nommée plusieurs fois)
+        n_films (int): Nombre de films distincts
+    """
+
+    def __init__(self, source, n_rows, start_year, end_year, n_categories=None, nominees=5,
+                 extra_values=0, extra_rate=0.05, seed=0):
+        self.n_rows = n_rows
+        self.start_year = start_year
+        self.end_year = end_year
+        self.nominees = nominees
+        self.extra_values = extra_values
+        self.extra_rate = extra_rate
+        self.rng = np.random.default_rng(seed)
+
+        source_categories = sorted(source['Category'].unique())
+        n_categories = n_categories or len(source_categories)
+        extra_categories = [f'CATEGORY {i + 1}' for i in range(len(source_categories), n_categories)]
+        self.categories = (source_categories + extra_categories)[:n_categories]
+        # Chaque catégorie générée reprend les profils d'une catégorie source
+        self._source_category = np.arange(n_categories) % len(source_categories)
+
+        self._fit_profiles(source, source_categories)
+        self._fit_names(source)
+
+        # Nombre de lignes de chaque cérémonie, réparties uniformément sur la période
+        n_years = end_year - start_year + 1
+        self._year_bounds = np.linspace(0, n_rows, n_years + 1).round().astype(np.int64)
+
+    def _fit_profiles(self, source, source_categories):
+        """Profils du CSV source regroupés par (année, catégorie), pour un tirage par position."""
+        birth_dates = pd.to_datetime(source['Birth_Date'], format='%Y-%m-%d', errors='coerce')
+        ceremony_starts = pd.to_datetime(source['Year_Ceremony'].astype(str) + '-01-01')
+        category_codes = pd.Categorical(source['Category'], categories=source_categories).codes
+
+        self._source_min_year = int(source['Year_Ceremony'].min())
+        self._source_max_year = int(source['Year_Ceremony'].max())
+        year_codes = source['Year_Ceremony'].to_numpy() - self._source_min_year
+        n_years = self._source_max_year - self._source_min_year + 1
+
+        order = np.lexsort((category_codes, year_codes))
+        profiles = source[PROFILE_COLUMNS].iloc[order].reset_index(drop=True)
+        # Âge à la cérémonie, en jours avant le 1er janvier de l'année de la cérémonie
+        profiles['age_days'] = (ceremony_starts - birth_dates).dt.days.to_numpy()[order]
+        self._profiles = profiles
+
+        # Début et taille du groupe de chaque (année, catégorie)
+        cells = year_codes[order] * len(source_categories) + category_codes[order]
+        sizes = np.bincount(cells, minlength=n_years * len(source_categories)).reshape(n_years, -1)
+        starts = (np.cumsum(sizes.ravel()) - sizes.ravel()).reshape(n_years, -1)
+        # Une (année, catégorie) sans ligne reprend le groupe de l'année la plus proche
+        for category in range(len(source_categories)):
+            filled = np.flatnonzero(sizes[:, category])
+            nearest = filled[np.abs(np.arange(n_years)[:, None] - filled[None, :]).argmin(axis=1)]
+            starts[:, category] = starts[nearest, category]
+            sizes[:, category] = sizes[nearest, category]
+        self._group_starts = starts
+        self._group_sizes = sizes
+
+    def _fit_names(self, source):
+        """Prénoms, noms de famille et titres de films de la source, combinés pour de nouveaux noms."""
+        parts = source['Name'].str.split(n=1)
+        self._first_names = np.array(sorted(parts.str[0].dropna().unique()), dtype=object)
+        self._last_names = np.array(sorted(parts.str[1].dropna().unique()), dtype=object)
+        self._films = np.array(sorted(source['Film'].dropna().unique()), dtype=object)
+        # Même proportion de personnes et de films distincts que dans la source
+        self.n_people = max(1, round(self.n_rows * source['Name'].nunique() / len(source)))
+        self.n_films = max(1, round(self.n_rows * source['Film'].nunique() / len(source)))
+
+    def _names(self, ids):
+        """Nom unique pour chaque identifiant : prénom et nom, puis un numéro au-delà des combinaisons."""
+        first_names, last_names = self._first_names, self._last_names
+        n_combinations = len(first_names) * len(last_names)
+        names = (pd.Series(first_names[ids % len(first_names)]) + ' ' +
+                 pd.Series(last_names[(ids // len(first_names)) % len(last_names)]))
+        repeat = ids // n_combinations
+        return names.where(repeat == 0, names + ' ' + pd.Series(repeat + 1).astype(str))
+
+    def _films_for(self, ids):
+        """Titre unique pour chaque identifiant de film."""
+        titles = pd.Series(self._films[ids % len(self._films)])
+        repeat = ids // len(self._films)
+        return titles.where(repeat == 0, titles + ' ' + pd.Series(repeat + 1).astype(str))
+
+    def chunk(self, start, stop):
+        """Lignes [start, stop) du jeu de données, sous forme de DataFrame."""
+        rows = np.arange(start, stop)
+        year_offsets = np.searchsorted(self._year_bounds, rows, side='right') - 1
+        years = self.start_year + year_offsets
+        position = rows - self._year_bounds[year_offsets]
+
+        # Prix : blocs de `nominees` lignes consécutives, catégories en alternance, un gagnant par bloc
+        award = position // self.nominees
+        categories = award % len(self.categories)
+        winners = position % self.nominees == award % self.nominees
+
+        # Année source correspondante (la période source est étirée sur la période générée)
+        span = max(self.end_year - self.start_year, 1)
+        source_years = np.rint((years - self.start_year) / span *
+                               (self._source_max_year - self._source_min_year)).astype(np.int64)
+        source_categories = self._source_category[categories]
+        sizes = self._group_sizes[source_years, source_categories]
+        picks = self._group_starts[source_years, source_categories] + \
+            (self.rng.random(len(rows)) * sizes).astype(np.int64)
+        profiles = self._profiles.iloc[picks].reset_index(drop=True)
+
+        ceremony_starts = pd.to_datetime(pd.Series(years).astype(str) + '-01-01')
+        birth_dates = ceremony_starts - pd.to_timedelta(profiles['age_days'], unit='D')
+
+        people = self.rng.integers(self.n_people, size=len(rows))
+        chunk = pd.DataFrame({
+            'Name': self._names(people),
+            'Category': np.array(self.categories, dtype=object)[categories],
+            'Film': self._films_for(self.rng.integers(self.n_films, size=len(rows))),
+            'Win_Oscar?': np.where(winners, 'TRUE', 'FALSE'),
+            'Year_Ceremony': years,
+            'Birth_Date': birth_dates.dt.strftime('%Y-%m-%d'),
+            'Birth_Place': profiles['Birth_Place'],
+        })
+        for column in DEMOGRAPHIC_VALUE_COLUMNS:
+            values = profiles[column]
+            if self.extra_values:
+                # Valeurs supplémentaires, rares, pour augmenter le nombre de catégories démographiques
+                extra = self.rng.random(len(rows)) < self.extra_rate
+                extra_labels = np.array([f'{column} {i + 1}' for i in range(self.extra_values)], dtype=object)
+                values = values.where(~extra, extra_labels[self.rng.integers(self.extra_values, size=len(rows))])
+            chunk[column] = values
+        chunk['Link'] = '/people/' + pd.Series(people).astype(str) + '/'
+        return chunk[COLUMNS]
+
+    def iter_chunks(self, path, chunk_size=100_000):
+        """
+        Écrit le jeu de données bloc par bloc dans `path` (compressé si le nom se termine par .gz),
+        au fur et à mesure de l'itération : produit le nombre de lignes écrites après chaque bloc.
+        """
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'wt', newline='') as f:
+            for start in range(0, self.n_rows, chunk_size):
+                self.chunk(start, min(start + chunk_size, self.n_rows)).to_csv(f, header=start == 0, index=False)
+                yield min(start + chunk_size, self.n_rows)
+
+    def write(self, path, chunk_size=100_000):
+        """Écrit tout le jeu de données dans `path` (voir iter_chunks) et retourne le nombre de lignes."""
+        for _ in self.iter_chunks(path, chunk_size):
+            pass
+        return self.n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output', help='CSV à produire')
+    parser.add_argument('--source', default=CSV_PATH, help='CSV dont les distributions sont reproduites')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--start-year', type=int, default=1928)
+    parser.add_argument('--end-year', type=int, default=2025)
+    parser.add_argument('--categories', type=int, help='nombre de catégories de prix (défaut : celles de la source)')
+    parser.add_argument('--nominees', type=int, default=5, help='nominés par prix, dont un gagnant')
+    parser.add_argument('--extra-values', type=int, default=0,
+                        help='valeurs synthétiques ajoutées à chaque colonne démographique')
+    parser.add_argument('--extra-rate', type=float, default=0.05,
+                        help='proportion des lignes prenant une valeur synthétique')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.end_year < args.start_year:
+        parser.error('--end-year doit être supérieur ou égal à --start-year')
+
+    generator = DatasetGenerator(pd.read_csv(args.source), args.rows, args.start_year, args.end_year,
+                                 n_categories=args.categories, nominees=args.nominees,
+                                 extra_values=args.extra_values, extra_rate=args.extra_rate, seed=args.seed)
+    started = time.perf_counter()
+    for written in generator.iter_chunks(args.output, chunk_size=args.chunk_size):
+        print(f'\r{written:,} / {args.rows:,} lignes', end='', file=sys.stderr, flush=True)
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    size = os.path.getsize(args.output)
+    print(f'{args.rows:,} lignes -> {args.output} ({size / 1e6:.1f} Mo) en {elapsed:.1f} s '
+          f'({args.rows / elapsed:,.0f} lignes/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+/*
+ * Infobulles chargées à la demande (OSCARS_LAZY_HOVER=1).
+ *
+ * Les traces marquées par meta.lazy_hover ne contiennent pas le texte de leur infobulle :
+ * au survol, le détail est demandé à /api/details/* puis affiché dans une infobulle HTML.
+ * Les réponses sont gardées en mémoire (et en cache HTTP par le navigateur).
+ */
+(function () {
+    var responses = new Map();
+    var tooltip = null;
+    var hoverToken = 0;
+
+    function escapeHtml(value) {
+        return String(value)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;');
+    }
+
+    function fetchJson(url) {
+        if (!responses.has(url)) {
+            responses.set(url, fetch(url).then(function (response) {
+                if (!response.ok) {
+                    responses.delete(url);
+                    throw new Error(response.status);
+                }
+                return response.json();
+            }));
+        }
+        return responses.get(url);
+    }
+
+    function getTooltip() {
+        if (!tooltip) {
+            tooltip = document.createElement('div');
+            tooltip.className = 'lazy-hover-tooltip';
+            document.body.appendChild(tooltip);
+        }
+        return tooltip;
+    }
+
+    function hideTooltip() {
+        hoverToken += 1;
+        if (tooltip) {
+            tooltip.style.display = 'none';
+        }
+    }
+
+    function showTooltip(html, event) {
+        var element = getTooltip();
+        element.innerHTML = html;
+        element.style.left = (event.pageX + 15) + 'px';
+        element.style.top = (event.pageY + 15) + 'px';
+        element.style.display = 'block';
+    }
+
+    // Même texte que les infobulles du waffle chart générées côté serveur ; seules les premières
+    // personnes d'une grande cellule sont listées
+    function peopleHtml(cell) {
+        var people = cell.people;
+        if (cell.count === 1) {
+            var person = people[0];
+            return 'Name: ' + escapeHtml(person.name) + '<br>Category: ' + escapeHtml(person.category) +
+                '<br>Film: ' + escapeHtml(person.film) + '<br>Year: ' + escapeHtml(person.year);
+        }
+        var text = cell.count + ' personnes<br>' + people.map(function (person) {
+            return '• ' + escapeHtml(person.name) + ' (' + escapeHtml(person.category) + ', ' +
+                escapeHtml(person.film) + ', ' + escapeHtml(person.year) + ')';
+        }).join('<br>');
+        if (cell.count > people.length) {
+            text += '<br>...et ' + (cell.count - people.length) + ' autres';
+        }
+        return text;
+    }
+
+    function winnerParam(meta) {
+        return meta.is_winner === null || meta.is_winner === undefined ? '' : String(meta.is_winner);
+    }
+
+    // Même texte que les infobulles du line chart générées côté serveur
+    function cellHtml(meta, point, annualCount, cell) {
+        var text = '<b>' + escapeHtml(meta.value) + '</b><br>Année: ' + escapeHtml(point.x) + '<br>';
+        if (meta.cumulative) {
+            text += 'Total cumulé: ' + escapeHtml(point.y) + '<br>Nouveaux cette année: ' + annualCount + '<br>';
+        } else {
+            text += 'Nombre cette année: ' + annualCount + '<br>';
+        }
+        if (cell && cell.count && annualCount > 0) {
+            text += '<br>Exemples:<br>' + cell.examples.map(function (example) {
+                return '• ' + escapeHtml(example.name) + ' (' + escapeHtml(example.film) + ')<br>';
+            }).join('');
+            if (cell.count > 3) {
+                text += '...et ' + (cell.count - 3) + ' autres';
+            }
+        }
+        return text;
+    }
+
+    function onHover(data) {
+        var point = data.points[0];
+        var meta = point.data.meta;
+        if (!meta || !meta.lazy_hover) {
+            return;
+        }
+        var token = ++hoverToken;
+        var event = data.event;
+        var request;
+        var render;
+
+        if (meta.lazy_hover === 'waffle') {
+            // Le point désigne une cellule de la figure : le serveur retrouve ses membres
+            request = fetchJson('/api/details/waffle?' + new URLSearchParams({
+                start: meta.start,
+                end: meta.end,
+                column: meta.column,
+                value: meta.value,
+                is_winner: winnerParam(meta),
+                cell: point.customdata,
+                cell_size: meta.cell_size
+            }).toString());
+            render = peopleHtml;
+        } else {
+            var annualCount = point.customdata;
+            showTooltip(cellHtml(meta, point, annualCount, null), event);
+            if (annualCount <= 0) {
+                return;
+            }
+            var params = new URLSearchParams({
+                year: point.x,
+                column: meta.column,
+                value: meta.value,
+                is_winner: winnerParam(meta)
+            });
+            request = fetchJson('/api/details/cell?' + params.toString());
+            render = function (response) { return cellHtml(meta, point, annualCount, response); };
+        }
+
+        request.then(function (response) {
+            // Ignorer la réponse si la souris a quitté le point entre-temps
+            if (token === hoverToken) {
+                showTooltip(render(response), event);
+            }
+        }).catch(hideTooltip);
+    }
+
+    function bind(graph) {
+        if (graph.dataset.lazyHover || typeof graph.on !== 'function') {
+            return;
+        }
+        graph.dataset.lazyHover = '1';
+        graph.on('plotly_hover', onHover);
+        graph.on('plotly_unhover', hideTooltip);
+    }
+
+    function bindAll() {
+        document.querySelectorAll('.js-plotly-plot').forEach(bind);
+    }
+
+    new MutationObserver(bindAll).observe(document.documentElement, {childList: true, subtree: true});
+})();
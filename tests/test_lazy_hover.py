@@ -0,0 +1,86 @@
+"""
+Infobulles du waffle chart chargées à la demande (/api/details/waffle), sur un jeu de données
+synthétique assez grand pour que les cellules agrégées dépassent 200 personnes.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from details import register_detail_routes  # noqa: E402
+from figures.figure_1 import MAX_PEOPLE, WaffleChart  # noqa: E402
+from helper import DataLoader  # noqa: E402
+from scripts.generate_dataset import CSV_PATH, DatasetGenerator  # noqa: E402
+
+N_ROWS = 200_000
+COLUMN = 'Gender'
+YEAR_RANGE = (1928, 2025)
+
+
+@pytest.fixture(scope='module')
+def dataloader(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('data') / 'oscars.csv')
+    DatasetGenerator(pd.read_csv(CSV_PATH), N_ROWS, *YEAR_RANGE).write(path)
+    dataloader = DataLoader()
+    dataloader.load_data(path, use_cache=False)
+    dataloader.preprocess_data()
+    return dataloader
+
+
+@pytest.fixture(scope='module')
+def client(dataloader):
+    server = Flask(__name__)
+    register_detail_routes(server, dataloader)
+    return server.test_client()
+
+
+def waffle_figure(dataloader, lazy_hover):
+    df = dataloader.filter_data(*YEAR_RANGE)
+    labels = list(dataloader.get_column_distribution(df, COLUMN))
+    counts = dataloader.get_yearly_counts(df[['Year_Ceremony', COLUMN]], labels)
+    return WaffleChart().plot_scatter_waffle_chart(counts, df, COLUMN, lazy_hover=lazy_hover,
+                                                   year_range=YEAR_RANGE, is_winner=None)
+
+
+def hover(client, trace, point):
+    meta = trace.meta
+    params = {'start': meta['start'], 'end': meta['end'], 'column': meta['column'], 'value': meta['value'],
+              'is_winner': '' if meta['is_winner'] is None else str(meta['is_winner']).lower(),
+              'cell': int(trace.customdata[point]), 'cell_size': meta['cell_size']}
+    return client.get('/api/details/waffle', query_string=params)
+
+
+def test_aggregated_cell_over_200_members(dataloader, client):
+    lazy = waffle_figure(dataloader, lazy_hover=True)
+    full = waffle_figure(dataloader, lazy_hover=False)
+    trace, reference = lazy.data[0], full.data[0]
+    assert trace.meta['cell_size'] > 200
+
+    # La figure ne porte qu'un indice de cellule par point, pas les identifiants des personnes
+    assert len(trace.customdata) == len(trace.x)
+
+    for point in (0, len(trace.x) - 1):
+        response = hover(client, trace, point)
+        assert response.status_code == 200
+        details = response.get_json()
+        # Mêmes personnes, dans le même ordre, que l'infobulle générée côté serveur
+        header, *lines = reference.hovertext[point].split('<br>')
+        assert header == f"{details['count']} personnes"
+        assert len(details['people']) == min(MAX_PEOPLE, details['count'])
+        assert [f"• {person['name']} ({person['category']}, {person['film']}, {person['year']})"
+                for person in details['people']] == lines[:MAX_PEOPLE]
+    assert hover(client, trace, 0).get_json()['count'] == trace.meta['cell_size']
+
+
+def test_invalid_cell_request(client):
+    assert client.get('/api/details/waffle', query_string={'column': COLUMN, 'value': 'Male'}).status_code == 400
+    assert client.get('/api/details/waffle', query_string={
+        'start': 1928, 'end': 2025, 'column': 'Name', 'value': 'x', 'cell': 0, 'cell_size': 1}).status_code == 400
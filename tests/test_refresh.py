@@ -0,0 +1,106 @@
+"""
+Mise à jour incrémentale des données : après append_rows ou refresh, le cube mis à jour par
+CountCube.updated doit être identique à un cube reconstruit à partir de toutes les lignes, et les
+empreintes par année du fichier source identiques à celles d'une relecture complète.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from helper import CountCube, DataLoader  # noqa: E402
+from scripts.generate_dataset import CSV_PATH, DatasetGenerator  # noqa: E402
+
+N_ROWS = 20_000
+YEAR_RANGE = (1928, 2025)
+
+
+@pytest.fixture(scope='module')
+def rows(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('data') / 'oscars.csv')
+    DatasetGenerator(pd.read_csv(CSV_PATH), N_ROWS, *YEAR_RANGE).write(path)
+    return pd.read_csv(path)
+
+
+@pytest.fixture
+def source(rows, tmp_path):
+    path = str(tmp_path / 'oscars.csv')
+    rows.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def dataloader(source):
+    dataloader = DataLoader()
+    dataloader.load_data(source, use_cache=False)
+    dataloader.preprocess_data()
+    dataloader.track_source()
+    return dataloader
+
+
+def assert_cube_rebuilt(dataloader):
+    """Compare le cube du DataLoader à un cube reconstruit à partir de ses données."""
+    cube = dataloader.cube
+    expected = CountCube(dataloader.data, order=dataloader.year_index.year_positions)
+    assert (cube.min_year, cube.max_year) == (expected.min_year, expected.max_year)
+    assert cube.n_rows_total == expected.n_rows_total
+    assert np.array_equal(cube.row_prefix, expected.row_prefix)
+    for column, labels in expected.labels.items():
+        # Le cube mis à jour peut garder des étiquettes qui n'apparaissent plus : comptes nuls
+        positions = [cube.labels[column].index(label) for label in labels]
+        unused = [code for code, label in enumerate(cube.labels[column]) if label not in labels]
+        assert np.array_equal(cube.prefix[column][..., positions], expected.prefix[column]), column
+        assert not cube.prefix[column][..., unused].any(), column
+        first_rows = cube.first_rows[column][:, positions + [len(cube.labels[column])]]
+        assert np.array_equal(first_rows, expected.first_rows[column]), column
+
+
+def assert_digests_reread(dataloader):
+    """Compare les empreintes mémorisées à celles d'une relecture complète du fichier source."""
+    digests = {year: digest.digest() for year, digest in dataloader._source_digests.items()}
+    dataloader.track_source()
+    assert digests == {year: digest.digest() for year, digest in dataloader._source_digests.items()}
+
+
+def test_append_rows(rows, dataloader):
+    added = rows[rows['Year_Ceremony'].isin([1990, 2025])].copy()
+    added.loc[added['Year_Ceremony'] == 2025, 'Year_Ceremony'] = 2026
+    added.loc[added.index[:3], 'Gender'] = 'Nonbinary'
+
+    assert dataloader.append_rows(added) == [1990, 2026]
+    assert len(dataloader.data) == len(rows) + len(added)
+    assert 'Nonbinary' in dataloader.cube.labels['Gender']
+    assert_cube_rebuilt(dataloader)
+
+
+def test_refresh_rewritten_file(rows, source, dataloader):
+    edited = rows[rows['Year_Ceremony'] != 1950].copy()
+    edited.loc[edited['Year_Ceremony'] == 1990, 'Religion'] = 'Pastafarian'
+    edited = pd.concat([edited, rows[rows['Year_Ceremony'] == 2025].assign(Year_Ceremony=2027)])
+    edited.to_csv(source, index=False)
+
+    assert dataloader.refresh() == [1950, 1990, 2027]
+    assert len(dataloader.filter_data(1950, 1950)) == 0
+    assert_cube_rebuilt(dataloader)
+    assert_digests_reread(dataloader)
+    assert dataloader.refresh() == []
+
+
+def test_refresh_appended_lines(rows, source, dataloader):
+    with open(source, 'a', newline='') as f:
+        rows[rows['Year_Ceremony'] == 2000].to_csv(f, header=False, index=False)
+        rows[rows['Year_Ceremony'] == 2025].assign(Year_Ceremony=2028).to_csv(f, header=False, index=False)
+
+    assert dataloader.refresh() == [2000, 2028]
+    assert len(dataloader.filter_data(2000, 2000)) == 2 * (rows['Year_Ceremony'] == 2000).sum()
+    assert_cube_rebuilt(dataloader)
+    assert_digests_reread(dataloader)
+    assert dataloader.refresh() == []
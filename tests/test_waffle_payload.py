@@ -0,0 +1,58 @@
+"""
+Taille du waffle chart (infobulles générées côté serveur) selon le nombre de lignes : au-delà de
+MAX_ROWS lignes de points, les cellules sont agrégées et leur infobulle ne liste que MAX_PEOPLE
+personnes, si bien que la figure ne grossit plus avec les données.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+import plotly.io as pio
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from figures.figure_1 import MAX_PEOPLE, WaffleChart  # noqa: E402
+from helper import DataLoader  # noqa: E402
+from scripts.generate_dataset import CSV_PATH, DatasetGenerator  # noqa: E402
+
+COLUMN = 'Race or Ethnicity'
+YEAR_RANGE = (1928, 2025)
+
+
+def waffle_payload(source, n_rows, path):
+    DatasetGenerator(source, n_rows, *YEAR_RANGE).write(path)
+    dataloader = DataLoader()
+    dataloader.load_data(path, use_cache=False)
+    dataloader.preprocess_data()
+    df = dataloader.filter_data(*YEAR_RANGE)
+    labels = list(dataloader.get_column_distribution(df, COLUMN))[:5]
+    counts = dataloader.get_yearly_counts(df[['Year_Ceremony', COLUMN]], labels)
+    return WaffleChart().plot_scatter_waffle_chart(counts, df, COLUMN)
+
+
+@pytest.fixture(scope='module')
+def figures(tmp_path_factory):
+    source = pd.read_csv(CSV_PATH)
+    folder = tmp_path_factory.mktemp('data')
+    return {n_rows: waffle_payload(source, n_rows, str(folder / f'oscars_{n_rows}.csv'))
+            for n_rows in (20_000, 200_000)}
+
+
+def test_payload_does_not_grow_with_rows(figures):
+    small, large = (len(pio.to_json(figures[n_rows])) for n_rows in (20_000, 200_000))
+    # 10 fois plus de lignes : même nombre de points, infobulles de même longueur
+    assert large < 1.2 * small
+
+
+def test_aggregated_hover_is_capped(figures):
+    trace = figures[200_000].data[0]
+    count = int(trace.hovertext[0].split(' ', 1)[0])
+    lines = trace.hovertext[0].split('<br>')
+    assert count > MAX_PEOPLE
+    assert len(lines) == MAX_PEOPLE + 2
+    assert lines[-1] == f'...et {count - MAX_PEOPLE} autres'
@@ -0,0 +1,22 @@
+"""
+Point d'entrée WSGI de production :
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Avec preload_app (gunicorn.conf.py), ce module est importé une seule fois dans le processus maître :
+le jeu de données, le cube de comptes et la vue par défaut pré-rendue sont chargés avant le fork
+et partagés en copie sur écriture par tous les workers. Le mode debug de Dash n'est jamais activé ici.
+"""
+import gc
+
+# Pas de collecte pendant le chargement des données
+gc.disable()
+
+from app import app  # noqa: E402
+
+server = app.server
+
+# Les objets chargés au démarrage ne seront plus parcourus par le ramasse-miettes : sans cela, chaque
+# collecte dans un worker réécrit leurs en-têtes et duplique les pages mémoire partagées avec le maître
+gc.freeze()
+gc.enable()